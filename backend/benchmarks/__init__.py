@@ -0,0 +1,4 @@
+"""
+Benchmarks package
+Performans ölçüm scriptleri (backend klasöründen `python -m benchmarks.<script>` ile çalıştırılır)
+"""
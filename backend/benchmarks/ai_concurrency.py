@@ -0,0 +1,101 @@
+"""
+AI çağrıları sürerken CRUD endpoint gecikmesini ölçer
+
+Kullanım:
+    python -m benchmarks.ai_concurrency --ai-calls 8 --latency 1.0
+    python -m benchmarks.ai_concurrency --mode inline   # eski (bloklayan) davranış
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+import services.gemini as gemini
+from benchmarks.fake_gemini import FakeModel
+from services.model_registry import model_registry
+from main import app
+
+
+def percentile(values, pct):
+    """Sıralı listeden yüzdelik değeri döndürür"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def inline_call_model(model, prompt: str):
+    """Executor kullanmadan modeli doğrudan çağırır (karşılaştırma için)"""
+    return model.generate_content(prompt)
+
+
+async def run_crud_loop(client, project_id, section_id, stop_event, latencies):
+    """AI çağrıları bitene kadar okuma/yazma isteklerini sırayla gönderir"""
+    counter = 0
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        if counter % 2 == 0:
+            await client.get(f"/api/v1/projects/{project_id}")
+        else:
+            await client.patch(
+                f"/api/v1/sections/{section_id}",
+                json={"draft_content": f"taslak {counter}"}
+            )
+        latencies.append((time.perf_counter() - start) * 1000)
+        counter += 1
+        await asyncio.sleep(0.01)
+
+
+async def main(args):
+    model_registry.set_model(FakeModel(latency=args.latency))
+    if args.mode == "inline":
+        gemini.call_model = inline_call_model
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/v1/projects/",
+            json={"template_id": "tubitak-2209a", "title": "Benchmark Projesi"}
+        )
+        project = response.json()
+        project_id = project["id"]
+        section_id = project["sections"][0]["id"]
+
+        latencies = []
+        stop_event = asyncio.Event()
+        crud_task = asyncio.create_task(
+            run_crud_loop(client, project_id, section_id, stop_event, latencies)
+        )
+
+        ai_start = time.perf_counter()
+        await asyncio.gather(*[
+            client.post("/api/v1/ai/generate", json={"content": f"taslak {i}"})
+            for i in range(args.ai_calls)
+        ])
+        ai_elapsed = time.perf_counter() - ai_start
+
+        stop_event.set()
+        await crud_task
+
+    print(json.dumps({
+        "mode": args.mode,
+        "ai_calls": args.ai_calls,
+        "ai_latency_s": args.latency,
+        "ai_total_s": round(ai_elapsed, 3),
+        "crud_requests": len(latencies),
+        "crud_p50_ms": round(percentile(latencies, 50), 2),
+        "crud_p99_ms": round(percentile(latencies, 99), 2),
+        "crud_max_ms": round(max(latencies, default=0.0), 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ai-calls", type=int, default=8, help="Eşzamanlı AI çağrısı sayısı")
+    parser.add_argument("--latency", type=float, default=0.5, help="Sahte model gecikmesi (saniye)")
+    parser.add_argument("--mode", choices=["executor", "inline"], default="executor")
+    asyncio.run(main(parser.parse_args()))
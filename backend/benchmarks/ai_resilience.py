@@ -0,0 +1,242 @@
+"""
+Hata enjekte eden sahte modelle dayanıklılık katmanını dener
+
+Senaryolar:
+    transient: Birincil modelde rastgele 503'ler (retry ile kurtarılır)
+    outage: Birincil model tamamen çökük, yedek sağlam (fallback + circuit)
+    deadline: Model süre sınırından yavaş (X-Request-Timeout ile 504)
+    check: Retry/backoff, circuit (open, half_open), fallback ve deadline
+        davranışlarını doğrular; beklenen sonuç alınmazsa çalıştırma hata ile biter
+
+Kullanım:
+    python -m benchmarks.ai_resilience --scenario transient --error-rate 0.3
+    python -m benchmarks.ai_resilience --scenario outage --requests 40
+    python -m benchmarks.ai_resilience --scenario transient --retries 1   # retry kapalı
+    python -m benchmarks.ai_resilience --scenario check
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.ai_concurrency import percentile
+from benchmarks.fake_gemini import FakeModel
+from config.settings import settings
+from services import ai_resilience
+from services.ai_cache import ai_cache
+from services.ai_rate_limiter import ai_rate_limiter
+from services.ai_resilience import circuit_status, get_circuit_breaker, reset_circuits
+from services.model_registry import model_registry
+from main import app
+
+
+def build_models(args):
+    """Senaryoya göre birincil ve yedek sahte modeller"""
+    if args.scenario == "transient":
+        primary = FakeModel(latency=args.latency, error_rate=args.error_rate, seed=42)
+        return primary, []
+    if args.scenario == "outage":
+        primary = FakeModel(latency=args.latency, error_rate=1.0, model_name="models/fake-primary")
+        fallback = FakeModel(latency=args.latency, model_name="models/fake-fallback")
+        return primary, [fallback]
+    return FakeModel(latency=args.latency * 10), []
+
+
+async def generate(client, headers=None):
+    return await client.post("/api/v1/ai/generate", json={"content": "taslak"}, headers=headers or {})
+
+
+async def check_retry_backoff(client, args):
+    """İlk iki çağrı 503; üçüncü denemede başarılı, denemeler arası jitter'lı bekleme"""
+    model = FakeModel(latency=args.latency, fail_first=2, model_name="models/check-retry")
+    model_registry.set_model(model)
+    
+    delays = []
+    original = ai_resilience.backoff_delay
+    
+    def recording_backoff(attempt):
+        delay = original(attempt)
+        delays.append((attempt, delay))
+        return delay
+    
+    ai_resilience.backoff_delay = recording_backoff
+    try:
+        start = time.perf_counter()
+        response = await generate(client)
+        elapsed = time.perf_counter() - start
+    finally:
+        ai_resilience.backoff_delay = original
+    
+    assert response.status_code == 200, f"retry: 200 beklendi, {response.status_code} alındı"
+    assert model.calls == 3, f"retry: 3 çağrı beklendi, {model.calls} yapıldı"
+    assert [attempt for attempt, _ in delays] == [0, 1], f"retry: bekleme sırası {delays}"
+    for attempt, delay in delays:
+        ceiling = min(settings.AI_RETRY_MAX_DELAY_SECONDS, settings.AI_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        assert 0 <= delay <= ceiling, f"retry: {attempt}. bekleme {delay:.3f} s, üst sınır {ceiling:.3f} s"
+    assert elapsed >= sum(delay for _, delay in delays), "retry: denemeler arasında beklenmedi"
+    
+    # Denemeler tükenince hata istemciye döner
+    exhausted = FakeModel(latency=args.latency, error_rate=1.0, model_name="models/check-exhausted")
+    model_registry.set_model(exhausted)
+    response = await generate(client)
+    assert response.status_code == 503, f"retry: tükenince 503 beklendi, {response.status_code} alındı"
+    assert exhausted.calls == settings.AI_RETRY_MAX_ATTEMPTS, \
+        f"retry: {settings.AI_RETRY_MAX_ATTEMPTS} deneme beklendi, {exhausted.calls} yapıldı"
+    return {"calls": model.calls, "delays_s": [round(delay, 3) for _, delay in delays]}
+
+
+async def check_circuit(client, args):
+    """Art arda hatalar circuit'i açar; süre dolunca tek deneme (half_open) geçer"""
+    model = FakeModel(latency=args.latency, error_rate=1.0, model_name="models/check-circuit")
+    model_registry.set_model(model)
+    breaker = get_circuit_breaker(model.model_name)
+    
+    for _ in range(settings.AI_CIRCUIT_FAILURE_THRESHOLD):
+        await generate(client)
+    assert breaker.state == "open", f"circuit: open beklendi, {breaker.state}"
+    
+    calls = model.calls
+    response = await generate(client)
+    assert response.status_code == 503, f"circuit: açıkken 503 beklendi, {response.status_code} alındı"
+    assert "retry-after" in response.headers, "circuit: açıkken Retry-After header'ı yok"
+    assert model.calls == calls, "circuit: açıkken modele çağrı yapıldı"
+    
+    # Süre dolunca tek deneme; başarısızsa circuit yeniden açılır
+    await asyncio.sleep(settings.AI_CIRCUIT_RESET_SECONDS)
+    assert breaker.state == "half_open", f"circuit: half_open beklendi, {breaker.state}"
+    await generate(client)
+    assert model.calls == calls + 1, f"circuit: half_open'da tek deneme beklendi, {model.calls - calls} yapıldı"
+    assert breaker.state == "open", f"circuit: başarısız denemeden sonra open beklendi, {breaker.state}"
+    
+    # Başarılı deneme circuit'i kapatır
+    await asyncio.sleep(settings.AI_CIRCUIT_RESET_SECONDS)
+    model.error_rate = 0.0
+    response = await generate(client)
+    assert response.status_code == 200, f"circuit: half_open denemesinde 200 beklendi, {response.status_code} alındı"
+    assert breaker.state == "closed", f"circuit: başarılı denemeden sonra closed beklendi, {breaker.state}"
+    return {"calls": model.calls, "state": breaker.state}
+
+
+async def check_fallback(client, args):
+    """Birincil model çökükken istek yedek modelden yanıtlanır"""
+    primary = FakeModel(latency=args.latency, error_rate=1.0, model_name="models/check-fallback-primary")
+    fallback = FakeModel(latency=args.latency, model_name="models/check-fallback")
+    model_registry.set_model(primary, fallback_models=[fallback])
+    
+    response = await generate(client)
+    assert response.status_code == 200, f"fallback: 200 beklendi, {response.status_code} alındı"
+    assert primary.calls == settings.AI_RETRY_MAX_ATTEMPTS, \
+        f"fallback: birincil modelde {settings.AI_RETRY_MAX_ATTEMPTS} deneme beklendi, {primary.calls} yapıldı"
+    assert fallback.calls == 1, f"fallback: yedek modelde 1 çağrı beklendi, {fallback.calls} yapıldı"
+    return {"primary_calls": primary.calls, "fallback_calls": fallback.calls}
+
+
+async def check_deadline(client, args):
+    """Model X-Request-Timeout'tan yavaşsa istek 504 ile süre sınırında biter"""
+    model = FakeModel(latency=args.latency * 10, model_name="models/check-deadline")
+    model_registry.set_model(model)
+    timeout = args.latency * 2
+    
+    start = time.perf_counter()
+    response = await generate(client, headers={"X-Request-Timeout": str(timeout)})
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 504, f"deadline: 504 beklendi, {response.status_code} alındı"
+    assert elapsed < args.latency * 10, f"deadline: yanıt {elapsed:.3f} s sürdü, model beklendi"
+    return {"elapsed_s": round(elapsed, 3)}
+
+
+CHECKS = {
+    "retry_backoff": check_retry_backoff,
+    "circuit": check_circuit,
+    "fallback": check_fallback,
+    "deadline": check_deadline,
+}
+
+
+async def run_checks(args):
+    """Dayanıklılık davranışlarını sırayla doğrular; ilk sapmada AssertionError"""
+    settings.AI_RETRY_MAX_ATTEMPTS = 3
+    settings.AI_RETRY_BASE_DELAY_SECONDS = args.base_delay
+    # Tek isteğin denemeleri circuit'i açmasın (retry kontrolü)
+    settings.AI_CIRCUIT_FAILURE_THRESHOLD = settings.AI_RETRY_MAX_ATTEMPTS + 1
+    settings.AI_CIRCUIT_RESET_SECONDS = 0.3
+    settings.AI_CACHE_ENABLED = False
+    ai_rate_limiter.enabled = False
+    ai_cache.clear()
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, check in CHECKS.items():
+            results[name] = await check(client, args)
+    print(json.dumps({"scenario": "check", "passed": list(results), "results": results}, indent=2))
+
+
+async def main(args):
+    if args.scenario == "check":
+        await run_checks(args)
+        return
+    
+    settings.AI_RETRY_MAX_ATTEMPTS = args.retries
+    settings.AI_RETRY_BASE_DELAY_SECONDS = args.base_delay
+    settings.AI_CACHE_ENABLED = False
+    ai_cache.clear()
+    reset_circuits()
+    
+    primary, fallbacks = build_models(args)
+    model_registry.set_model(primary, fallback_models=fallbacks)
+    
+    headers = {}
+    if args.scenario == "deadline":
+        headers["X-Request-Timeout"] = str(args.latency * 2)
+    
+    statuses = Counter()
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+    
+    async def one_request(client, i):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/v1/ai/generate",
+                json={"content": f"taslak {i}"},
+                headers=headers
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] += 1
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        total_start = time.perf_counter()
+        await asyncio.gather(*[one_request(client, i) for i in range(args.requests)])
+        total_elapsed = time.perf_counter() - total_start
+    
+    print(json.dumps({
+        "scenario": args.scenario,
+        "requests": args.requests,
+        "retries": args.retries,
+        "status_counts": dict(statuses),
+        "success_rate": round(statuses[200] / args.requests, 3),
+        "primary_calls": primary.calls,
+        "fallback_calls": sum(model.calls for model in fallbacks),
+        "total_s": round(total_elapsed, 3),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "circuits": circuit_status(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["transient", "outage", "deadline", "check"], default="transient")
+    parser.add_argument("--requests", type=int, default=40, help="Toplam istek sayısı")
+    parser.add_argument("--concurrency", type=int, default=4, help="Eşzamanlı istek sayısı")
+    parser.add_argument("--latency", type=float, default=0.05, help="Sahte model gecikmesi (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="transient: hata oranı")
+    parser.add_argument("--retries", type=int, default=3, help="AI_RETRY_MAX_ATTEMPTS")
+    parser.add_argument("--base-delay", type=float, default=0.05, help="AI_RETRY_BASE_DELAY_SECONDS")
+    asyncio.run(main(parser.parse_args()))
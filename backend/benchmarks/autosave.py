@@ -0,0 +1,114 @@
+"""
+Otomatik kayıt yazma birleştirme ölçümü
+
+Birden fazla bölümde eşzamanlı "yazan" kullanıcıları taklit eder: her tuş
+vuruşu bir taslak PATCH'idir. Birleştirici (debounce) ile her isteğin
+doğrudan yazıldığı durum store yazma sayısı ve istek boyutu açısından
+karşılaştırılır. Süreler gerçek yazma hızının ölçeklenmiş halidir
+(varsayılan: 10 ms'de bir tuş, 100 ms debounce ≈ 100 ms'de bir tuş, 1 sn debounce).
+
+Kullanım:
+    python -m benchmarks.autosave --sections 20 --keystrokes 300
+    python -m benchmarks.autosave --backend sqlite --payload edits
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+WORDS = ["proje", "araştırma", "yöntem", "veri", "analiz", "hedef", "çıktı", "literatür", "deney", "model"]
+
+
+async def type_section(coalescer, section_id: str, user_id: str, args, rng: random.Random) -> int:
+    """Bir bölüme tuş tuş yazar; gönderilen istek gövdelerinin toplam boyutunu döndürür"""
+    text = ""
+    payload_bytes = 0
+    typed = ""
+    for n in range(args.keystrokes):
+        if not typed:
+            typed = rng.choice(WORDS) + " "
+        char, typed = typed[0], typed[1:]
+        
+        if args.payload == "edits":
+            edits = [{"start": len(text), "end": len(text), "text": char}]
+            payload_bytes += len(json.dumps({"edits": edits}, ensure_ascii=False).encode("utf-8"))
+            await coalescer.submit(section_id, user_id, edits=edits)
+        else:
+            payload_bytes += len(json.dumps({"draft_content": text + char}, ensure_ascii=False).encode("utf-8"))
+            await coalescer.submit(section_id, user_id, content=text + char)
+        text += char
+        
+        # Ara sıra düşünme molası (debounce'tan uzun)
+        pause = args.pause_every and n % args.pause_every == args.pause_every - 1
+        await asyncio.sleep(args.interval * (args.pause_factor if pause else 1))
+    return payload_bytes
+
+
+async def run(coalescer, section_ids, user_id, args) -> dict:
+    rng = random.Random(42)
+    start = time.perf_counter()
+    payloads = await asyncio.gather(*[
+        type_section(coalescer, section_id, user_id, args, random.Random(rng.random()))
+        for section_id in section_ids
+    ])
+    await coalescer.flush_all()
+    wall_s = time.perf_counter() - start
+    stats = coalescer.stats()
+    return {
+        "submitted": stats["submitted"],
+        "store_writes": stats["written"],
+        "payload_kb": round(sum(payloads) / 1024, 1),
+        "wall_s": round(wall_s, 2),
+    }
+
+
+def main(args):
+    if args.backend == "sqlite":
+        directory = tempfile.mkdtemp(prefix="akademikform-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    else:
+        os.environ["DATABASE_URL"] = "memory://"
+    
+    # DATABASE_URL'e göre store'u açmak için geç import
+    from data.mock_projects import create_project, get_mock_user_id
+    from services.autosave import DraftCoalescer
+    
+    user_id = get_mock_user_id()
+    results = {}
+    for mode, debounce in (("write_through", 0.0), ("coalesced", args.debounce)):
+        section_ids = []
+        while len(section_ids) < args.sections:
+            project = create_project("tubitak-2209a", "TÜBİTAK 2209-A", f"Bench {mode}", user_id)
+            section_ids.extend(section["id"] for section in project["sections"])
+        coalescer = DraftCoalescer(debounce=debounce, max_delay=args.max_delay)
+        results[mode] = asyncio.run(run(coalescer, section_ids[:args.sections], user_id, args))
+    
+    print(json.dumps({
+        "backend": args.backend,
+        "payload": args.payload,
+        "sections": args.sections,
+        "keystrokes_per_section": args.keystrokes,
+        "debounce_s": args.debounce,
+        **results,
+        "write_reduction": round(
+            results["write_through"]["store_writes"] / max(results["coalesced"]["store_writes"], 1), 1
+        ),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--payload", choices=["full", "edits"], default="full", help="Tam metin veya değişiklik listesi")
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--keystrokes", type=int, default=300, help="Bölüm başına tuş vuruşu")
+    parser.add_argument("--interval", type=float, default=0.01, help="Tuş vuruşları arası süre (saniye)")
+    parser.add_argument("--pause-every", type=int, default=60, help="Kaç tuşta bir mola verilir (0: mola yok)")
+    parser.add_argument("--pause-factor", type=float, default=20, help="Molanın tuş aralığına oranı")
+    parser.add_argument("--debounce", type=float, default=0.1)
+    parser.add_argument("--max-delay", type=float, default=0.5)
+    main(parser.parse_args())
@@ -0,0 +1,293 @@
+"""
+Uçtan uca yük testi: karışık iş yükü altında endpoint başına verim ve gecikme
+
+main:app süreç içinde başlatılır (startup/shutdown dahil), Gemini yerine
+deterministik sahte model kullanılır. Sanal kullanıcılar ağırlıklı iş
+yükünden rastgele işlem seçer (proje CRUD, otomatik kayıt, generate/revise,
+şablon okuma). AI kotası varsayılan olarak kapalıdır; sahte modelin süresi
+ölçülür, kota beklemesi değil.
+
+Kullanım:
+    python -m benchmarks.e2e --concurrency 32 --duration 20
+    python -m benchmarks.e2e --backend sqlite --mix autosave=60,get_project=40
+    python -m benchmarks.e2e --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.ai_concurrency import percentile
+
+# İşlem adı -> (varsayılan ağırlık, endpoint etiketi)
+OPERATIONS = {
+    "list_templates": (5, "GET /api/v1/templates/"),
+    "get_template": (5, "GET /api/v1/templates/{template_id}"),
+    "list_projects": (5, "GET /api/v1/projects/"),
+    "get_project": (20, "GET /api/v1/projects/{project_id}"),
+    "create_project": (3, "POST /api/v1/projects/"),
+    "update_title": (5, "PATCH /api/v1/projects/{project_id}"),
+    "autosave": (40, "PATCH /api/v1/sections/{section_id}"),
+    "generate": (10, "POST /api/v1/sections/{section_id}/generate"),
+    "revise": (5, "POST /api/v1/sections/{section_id}/revise"),
+}
+TEMPLATE_IDS = ["tubitak-2209a", "tubitak-1001", "tubitak-1003"]
+WORDS = ["proje", "araştırma", "yöntem", "veri", "analiz", "hedef", "çıktı", "literatür", "deney", "model"]
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, int]:
+    """"autosave=60,get_project=40" -> ağırlıklar (verilmeyen işlemler 0)"""
+    if not value:
+        return {name: weight for name, (weight, _) in OPERATIONS.items()}
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Bilinmeyen işlem: {name} (seçenekler: {', '.join(OPERATIONS)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+class Workload:
+    """Sanal kullanıcıların paylaştığı proje/bölüm havuzu ve ölçümler"""
+    
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.projects: List[dict] = []
+        self.latencies: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        self.statuses: Dict[str, Counter] = {name: Counter() for name in OPERATIONS}
+    
+    async def create_project(self, rng: random.Random) -> httpx.Response:
+        response = await self.client.post(
+            "/api/v1/projects/",
+            json={"template_id": rng.choice(TEMPLATE_IDS), "title": f"Yük testi {len(self.projects)}"}
+        )
+        if response.status_code == 201:
+            project = response.json()
+            self.projects.append({
+                "id": project["id"],
+                "sections": [section["id"] for section in project["sections"]],
+                "draft": {},
+            })
+        return response
+    
+    def text(self, rng: random.Random, words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+    
+    async def run_operation(self, name: str, rng: random.Random) -> httpx.Response:
+        client = self.client
+        if name == "create_project":
+            return await self.create_project(rng)
+        if name == "list_templates":
+            return await client.get("/api/v1/templates/")
+        if name == "get_template":
+            return await client.get(f"/api/v1/templates/{rng.choice(TEMPLATE_IDS)}")
+        if name == "list_projects":
+            return await client.get("/api/v1/projects/", params={"limit": 20})
+        
+        project = rng.choice(self.projects)
+        if name == "get_project":
+            return await client.get(f"/api/v1/projects/{project['id']}")
+        if name == "update_title":
+            return await client.patch(f"/api/v1/projects/{project['id']}", json={"title": self.text(rng, 4)})
+        
+        section_id = rng.choice(project["sections"])
+        if name == "autosave":
+            # Kullanıcı yazmaya devam eder: taslak her seferinde biraz uzar
+            draft = project["draft"].get(section_id, "") + " " + self.text(rng, self.args.autosave_words)
+            project["draft"][section_id] = draft[-self.args.max_draft_chars:]
+            return await client.patch(f"/api/v1/sections/{section_id}", json={"draft_content": project["draft"][section_id]})
+        if name == "generate":
+            return await client.post(
+                f"/api/v1/sections/{section_id}/generate",
+                json={"draft_content": self.text(rng, self.args.prompt_words), "use_cache": self.args.ai_cache}
+            )
+        if name == "revise":
+            return await client.post(
+                f"/api/v1/sections/{section_id}/revise",
+                json={
+                    "current_content": self.text(rng, self.args.prompt_words),
+                    "revision_prompt": "Daha akademik yaz",
+                    "use_cache": self.args.ai_cache
+                }
+            )
+        raise ValueError(name)
+    
+    async def virtual_user(self, user: int, mix: Dict[str, int], deadline: float, budget: List[int]):
+        rng = random.Random(self.args.seed * 1000 + user)
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                status = (await self.run_operation(name, rng)).status_code
+            except Exception as e:
+                status = type(e).__name__
+            self.latencies[name].append((time.perf_counter() - start) * 1000)
+            self.statuses[name][str(status)] += 1
+            if self.args.think_time:
+                await asyncio.sleep(rng.uniform(0, self.args.think_time))
+    
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for name, latencies in self.latencies.items():
+            if not latencies:
+                continue
+            statuses = self.statuses[name]
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+            endpoints[name] = {
+                "endpoint": OPERATIONS[name][1],
+                "requests": len(latencies),
+                "errors": errors,
+                "rps": round(len(latencies) / elapsed, 1),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "max_ms": round(max(latencies), 2),
+                "statuses": dict(statuses),
+            }
+        total = sum(len(latencies) for latencies in self.latencies.values())
+        return {
+            "requests": total,
+            "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+            "elapsed_s": round(elapsed, 2),
+            "rps": round(total / elapsed, 1),
+            "endpoints": endpoints,
+        }
+
+
+def compare(result: dict, baseline_path: str, tolerance: float) -> List[dict]:
+    """
+    p95 değeri baseline'dan `tolerance` oranından fazla kötüleşen endpoint'ler
+    
+    Çok kısa süren endpoint'lerde ölçüm gürültüsü büyük olduğu için 1 ms'nin
+    altındaki farklar gerileme sayılmaz.
+    """
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = []
+    for name, current in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        delta = current["p95_ms"] - before["p95_ms"]
+        if delta > 1.0 and current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append({"operation": name, "p95_before_ms": before["p95_ms"], "p95_after_ms": current["p95_ms"]})
+    return regressions
+
+
+async def run(args) -> dict:
+    # DATABASE_URL ve ayarlara göre açılması için geç import
+    from benchmarks.fake_gemini import FakeModel
+    from config.settings import settings
+    from services.ai_rate_limiter import ai_rate_limiter
+    from services.export_jobs import get_export_pool
+    from services.model_registry import model_registry
+    from main import app
+    
+    model_registry.set_model(FakeModel(
+        latency=args.ai_latency,
+        latency_jitter=args.ai_jitter,
+        output_words=args.ai_output_words,
+        error_rate=args.ai_error_rate,
+        seed=args.seed
+    ))
+    ai_rate_limiter.enabled = args.rate_limit
+    settings.AI_CACHE_ENABLED = args.ai_cache
+    
+    await app.router.startup()
+    try:
+        # Export process'leri spawn edilirken CPU'yu paylaşmasın; açılışları beklenir
+        pool = get_export_pool()
+        if pool is not None:
+            await asyncio.gather(*[
+                asyncio.wrap_future(pool.submit(os.getpid)) for _ in range(settings.EXPORT_PROCESS_WORKERS)
+            ])
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            workload = Workload(client, args)
+            rng = random.Random(args.seed)
+            for _ in range(args.projects):
+                await workload.create_project(rng)
+            
+            mix = parse_mix(args.mix)
+            start = time.perf_counter()
+            budget = [args.requests or sys.maxsize]
+            await asyncio.gather(*[
+                workload.virtual_user(user, mix, start + args.duration, budget)
+                for user in range(args.concurrency)
+            ])
+            result = workload.report(time.perf_counter() - start)
+    finally:
+        await app.router.shutdown()
+    
+    return {
+        "backend": args.backend,
+        "concurrency": args.concurrency,
+        "mix": parse_mix(args.mix),
+        "ai_latency_s": args.ai_latency,
+        "autosave_debounce_ms": settings.AUTOSAVE_DEBOUNCE_MS,
+        **result,
+    }
+
+
+def main(args):
+    if args.backend == "sqlite":
+        directory = tempfile.mkdtemp(prefix="akademikform-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    else:
+        os.environ["DATABASE_URL"] = "memory://"
+    # Model sahte; açılışta gerçek modeli aramaya gerek yok
+    os.environ.setdefault("GEMINI_WARMUP_ON_STARTUP", "false")
+    
+    result = asyncio.run(run(args))
+    if args.compare:
+        result["regressions"] = compare(result, args.compare, args.tolerance)
+    
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(output)
+    print(output)
+    
+    if result.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--concurrency", type=int, default=16, help="Sanal kullanıcı sayısı")
+    parser.add_argument("--duration", type=float, default=10.0, help="Ölçüm süresi (saniye)")
+    parser.add_argument("--requests", type=int, default=0, help="Toplam istek sınırı (0: yalnızca süre)")
+    parser.add_argument("--mix", help=f"İşlem ağırlıkları, ör. autosave=60,get_project=40 ({', '.join(OPERATIONS)})")
+    parser.add_argument("--projects", type=int, default=20, help="Ölçümden önce oluşturulan proje sayısı")
+    parser.add_argument("--think-time", type=float, default=0.0, help="İşlemler arası en fazla bekleme (saniye)")
+    parser.add_argument("--autosave-words", type=int, default=5, help="Her otomatik kayıtta eklenen kelime")
+    parser.add_argument("--max-draft-chars", type=int, default=20000)
+    parser.add_argument("--prompt-words", type=int, default=300, help="generate/revise gövdesindeki kelime")
+    parser.add_argument("--ai-latency", type=float, default=0.2, help="Sahte model gecikmesi (saniye)")
+    parser.add_argument("--ai-jitter", type=float, default=0.05)
+    parser.add_argument("--ai-output-words", type=int, default=300)
+    parser.add_argument("--ai-error-rate", type=float, default=0.0)
+    parser.add_argument("--ai-cache", action="store_true", help="AI yanıt cache'ini açık bırak")
+    parser.add_argument("--rate-limit", action="store_true", help="AI kotasını açık bırak")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Sonucu dosyaya da yaz")
+    parser.add_argument("--compare", help="Önceki sonuç dosyası; p95 gerilemesi varsa çıkış kodu 1")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="İzin verilen p95 artışı (oran)")
+    main(parser.parse_args())
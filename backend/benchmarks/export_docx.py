@@ -0,0 +1,87 @@
+"""
+DOCX export hızı: derlenmiş şablon ile her export'ta şablonu yeniden işleme karşılaştırması
+
+Kullanım:
+    python -m benchmarks.export_docx --template tubitak-2209a --exports 500
+"""
+
+import argparse
+import json
+import time
+
+from data.mock_projects import create_empty_project
+from services.docx_export import build_export_context, get_export_template, load_export_template
+
+
+def sample_project(template_id: str, paragraphs: int) -> dict:
+    """Tüm alanları dolu, gerçekçi uzunlukta bir proje"""
+    project = create_empty_project(template_id, template_id, "Benchmark Projesi")
+    text = "\n".join(
+        f"{i + 1}. paragraf: Bu çalışmada önerilen yöntemin <literatürdeki> benzerlerine göre & avantajları tartışılmaktadır. " * 4
+        for i in range(paragraphs)
+    )
+    project["general_info"] = {
+        "applicant_name": "Ayşe Yılmaz",
+        "research_title": "Derin Öğrenme ile Tarımsal Verim Tahmini",
+        "advisor_name": "Prof. Dr. Mehmet Demir",
+        "institution": "Örnek Üniversitesi"
+    }
+    project["keywords"] = "derin öğrenme, verim tahmini, uzaktan algılama"
+    project["scientific_merit"] = {"importance_and_quality": text, "aims_and_objectives": text}
+    project["project_management"]["work_schedule"] = [
+        {"date_range": f"{i * 2 + 1}-{i * 2 + 2}. ay", "activities": "Veri toplama ve analiz",
+         "responsible": "Ayşe Yılmaz", "success_criteria_contribution": "%10"}
+        for i in range(6)
+    ]
+    for row in project["wide_impact"]:
+        row["outputs"] = "Uluslararası bir makale, bir ulusal bildiri"
+    for section in project["sections"]:
+        section["final_content"] = text
+    return project
+
+
+def measure(render, context, exports: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(exports):
+        size = len(render(context))
+    elapsed = time.perf_counter() - start
+    return {
+        "exports_per_s": round(exports / elapsed, 1),
+        "ms_per_export": round(elapsed / exports * 1000, 3),
+        "size_bytes": size,
+    }
+
+
+def main(args):
+    project = sample_project(args.template, args.paragraphs)
+    context = build_export_context(project)
+    
+    start = time.perf_counter()
+    compiled = get_export_template(args.template).compiled
+    compile_ms = (time.perf_counter() - start) * 1000
+    
+    result = {
+        "template": args.template,
+        "paragraphs_per_section": args.paragraphs,
+        "compile_ms": round(compile_ms, 1),
+        "compiled": measure(compiled.render, context, args.exports),
+    }
+    if args.mode == "both":
+        # Derleme olmadan: her export'ta .docx okunur, ayrıştırılır ve tüm parçalar sıkıştırılır
+        naive_exports = max(1, args.exports // 10)
+        result["naive"] = measure(
+            lambda context: load_export_template(args.template).compiled.render(context),
+            context,
+            naive_exports
+        )
+        result["speedup"] = round(result["compiled"]["exports_per_s"] / result["naive"]["exports_per_s"], 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--template", default="tubitak-2209a")
+    parser.add_argument("--exports", type=int, default=500)
+    parser.add_argument("--paragraphs", type=int, default=5, help="Bölüm başına paragraf sayısı")
+    parser.add_argument("--mode", choices=["compiled", "both"], default="both")
+    main(parser.parse_args())
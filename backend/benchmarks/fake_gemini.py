@@ -0,0 +1,91 @@
+"""
+Fake Gemini modeli
+Benchmark'larda gerçek API yerine kullanılan deterministik model
+"""
+
+import random
+import threading
+import time
+from typing import Optional, Sequence
+from google.api_core import exceptions as google_exceptions
+
+
+class FakeResponse:
+    """`GenerateContentResponse` yerine geçen basit yanıt"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Gemini SDK'sı gibi senkron (bloklayan) çalışan sahte model
+
+    Hata ve gecikme enjeksiyonu ile dayanıklılık katmanını denemek için de
+    kullanılır.
+
+    Args:
+        latency: Her çağrıda beklenecek süre (saniye)
+        output_words: Üretilecek metnin kelime sayısı
+        model_name: Model adı (circuit breaker ve cache anahtarında kullanılır)
+        error_rate: Çağrıların hata ile biteceği oran (0-1)
+        fail_first: İlk kaç çağrının hata ile biteceği
+        error_factory: Hata nesnesi üreten fonksiyon (varsayılan: 503)
+        latency_jitter: Gecikmeye eklenecek rastgele süre üst sınırı (saniye)
+        seed: Rastgelelik için tohum (tekrarlanabilir senaryolar)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        output_words: int = 200,
+        model_name: str = "models/fake-gemini",
+        error_rate: float = 0.0,
+        fail_first: int = 0,
+        error_factory=None,
+        latency_jitter: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.model_name = model_name
+        self.latency = latency
+        self.output_words = output_words
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_factory = error_factory or (
+            lambda: google_exceptions.ServiceUnavailable("fake: servis geçici olarak kullanılamıyor")
+        )
+        self.latency_jitter = latency_jitter
+        self.calls = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        with self._lock:
+            self.calls += 1
+            should_fail = (
+                self.calls <= self.fail_first
+                or (self.error_rate > 0 and self._random.random() < self.error_rate)
+            )
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+
+        words = [f"**kelime{i}**" if i % 10 == 0 else f"kelime{i}" for i in range(self.output_words)]
+        if should_fail:
+            # Hatalı yanıt da biraz bekletir (ağ gidiş-dönüşü)
+            time.sleep(min(delay, 0.05))
+            with self._lock:
+                self.failures += 1
+            raise self.error_factory()
+        if stream:
+            return self._stream(words, delay)
+        time.sleep(delay)
+        return FakeResponse(" ".join(words))
+
+    def _stream(self, words: Sequence[str], delay: float):
+        # Toplam gecikme parçalara bölünür; işaretler parça sınırına denk gelebilir
+        text = " ".join(words)
+        chunk_size = 37
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        for chunk in chunks:
+            time.sleep(delay / len(chunks))
+            yield FakeResponse(chunk)
@@ -0,0 +1,80 @@
+"""
+Revizyon geçmişi: delta + snapshot saklama ile her revizyonu tam kopya saklamanın karşılaştırması
+
+Kullanım:
+    python -m benchmarks.revision_history --revisions 2000 --words 1500
+"""
+
+import argparse
+import json
+import random
+import time
+
+from data.revision_store import create_revision_store
+
+WORDS = (
+    "bu çalışmada önerilen yöntem veri analiz sonuç model literatür deney "
+    "katkı amaç hedef bulgu yaklaşım sistem tasarım performans ölçüm"
+).split()
+
+
+def edit(text: str, rng: random.Random) -> str:
+    """Kullanıcının bir kabulde yaptığı tipik düzenleme: birkaç kelimelik değişiklik"""
+    words = text.split(" ")
+    for _ in range(rng.randint(1, 3)):
+        position = rng.randrange(len(words))
+        words[position:position + rng.randint(0, 3)] = rng.choices(WORDS, k=rng.randint(1, 6))
+    return " ".join(words)
+
+
+def main(args):
+    rng = random.Random(42)
+    store = create_revision_store(args.database_url, args.snapshot_interval)
+    text = " ".join(rng.choices(WORDS, k=args.words))
+    
+    full_copy_bytes = 0
+    start = time.perf_counter()
+    for _ in range(args.revisions):
+        text = edit(text, rng)
+        store.append("bench-section", "bench-project", text)
+        full_copy_bytes += len(text.encode("utf-8"))
+    append_ms = (time.perf_counter() - start) / args.revisions * 1000
+    
+    stored_bytes = None
+    if hasattr(store, "_sections"):
+        stored_bytes = sum(len(record["payload"]) for record in store._sections["bench-section"])
+    
+    lookups = [rng.randint(1, args.revisions) for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for number in lookups:
+        assert store.get("bench-section", number)["revision_number"] == number
+    get_ms = (time.perf_counter() - start) / args.lookups * 1000
+    
+    start = time.perf_counter()
+    pages = 0
+    for offset in range(0, min(args.revisions, 2000), 20):
+        store.list("bench-section", offset=offset, limit=20)
+        pages += 1
+    page_ms = (time.perf_counter() - start) / pages * 1000
+    
+    print(json.dumps({
+        "revisions": args.revisions,
+        "words": args.words,
+        "snapshot_interval": args.snapshot_interval,
+        "full_copy_bytes": full_copy_bytes,
+        "stored_bytes": stored_bytes,
+        "compression_ratio": round(full_copy_bytes / stored_bytes, 1) if stored_bytes else None,
+        "append_ms": round(append_ms, 3),
+        "get_ms": round(get_ms, 3),
+        "list_page_ms": round(page_ms, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revisions", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=1500, help="Bölüm metninin kelime sayısı")
+    parser.add_argument("--snapshot-interval", type=int, default=16)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--database-url", default=None, help="Ör. sqlite:///./bench_revisions.db (varsayılan: bellek)")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+"""
+Section araması: index'li store ile eski lineer tarama karşılaştırması
+
+Kullanım:
+    python -m benchmarks.section_lookup --projects 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from data.mock_projects import create_project, get_section_by_id, MOCK_PROJECTS
+
+
+def linear_find_section(section_id: str, user_id: str):
+    """Index'ten önceki router davranışı: tüm projeler ve bölümler taranır"""
+    for project in MOCK_PROJECTS.values():
+        if project["user_id"] != user_id:
+            continue
+        for section in project.get("sections", []):
+            if section["id"] == section_id:
+                return project, section
+    return None, None
+
+
+def time_lookups(find, section_ids, user_id):
+    """Ortalama arama süresini mikrosaniye cinsinden döndürür"""
+    start = time.perf_counter()
+    for section_id in section_ids:
+        project, section = find(section_id, user_id)
+        assert section is not None
+    return (time.perf_counter() - start) / len(section_ids) * 1_000_000
+
+
+def main(args):
+    random.seed(42)
+    user_ids = [f"user-{i}" for i in range(args.users)]
+    
+    start = time.perf_counter()
+    section_ids = []
+    for i in range(args.projects):
+        project = create_project("tubitak-2209a", "TÜBİTAK 2209-A", f"Proje {i}", random.choice(user_ids))
+        section_ids.append((project["user_id"], project["sections"][-1]["id"]))
+    populate_s = time.perf_counter() - start
+    
+    user_id, _ = section_ids[0]
+    own_sections = [sid for uid, sid in section_ids if uid == user_id]
+    indexed_sample = random.choices(own_sections, k=args.indexed_lookups)
+    linear_sample = random.choices(own_sections, k=args.linear_lookups)
+    
+    print(json.dumps({
+        "projects": args.projects,
+        "users": args.users,
+        "populate_s": round(populate_s, 2),
+        "indexed_lookup_us": round(time_lookups(get_section_by_id, indexed_sample, user_id), 3),
+        "linear_lookup_us": round(time_lookups(linear_find_section, linear_sample, user_id), 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--indexed-lookups", type=int, default=100_000)
+    parser.add_argument("--linear-lookups", type=int, default=50)
+    main(parser.parse_args())
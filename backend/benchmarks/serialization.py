@@ -0,0 +1,132 @@
+"""
+Okuma endpoint'lerinde serileştirme: hızlı JSON yolu ile eski response_model yolu
+
+Eski davranış aynı uygulamaya referans route'lar olarak eklenir
+(response_model=Project / List[Dict] ile dict döndürme: model doğrulaması,
+jsonable_encoder ve json.dumps). İki yol aynı middleware'lerden geçer;
+fark yalnızca yanıtın serileştirilmesidir.
+
+Kullanım:
+    python -m benchmarks.serialization --words 1500 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import HTTPException, Response
+
+from data.mock_projects import (
+    create_project, get_mock_user_id, get_project_by_id, update_section_draft, update_section_final
+)
+from data.mock_templates import MOCK_TEMPLATES
+from main import app
+from models.project import Project
+from utils.etag import project_etag
+from utils.responses import dumps, orjson
+
+WORDS = ["proje", "araştırma", "yöntem", "veri", "analiz", "hedef", "çıktı", "literatür", "deney", "model"]
+
+
+async def baseline_get_project(project_id: str, response: Response):
+    """Hızlı yoldan önceki GET /projects/{id}: dict döner, response_model doğrular"""
+    project = get_project_by_id(project_id, get_mock_user_id())
+    if not project:
+        raise HTTPException(status_code=404)
+    response.headers["ETag"] = project_etag(project)
+    return project
+
+
+async def baseline_list_templates():
+    """Hazır gövdeden önceki GET /templates"""
+    return MOCK_TEMPLATES
+
+
+def add_baseline_routes():
+    app.add_api_route("/bench/baseline/projects/{project_id}", baseline_get_project, response_model=Project)
+    app.add_api_route("/bench/baseline/templates", baseline_list_templates, response_model=List[Dict[str, Any]])
+
+
+def build_project(words: int) -> str:
+    """Tüm bölümleri `words` kelimelik taslak ve kabul edilmiş metinle dolu bir proje"""
+    rng = random.Random(42)
+    user_id = get_mock_user_id()
+    project = create_project("tubitak-2209a", "TÜBİTAK 2209-A", "Serileştirme ölçümü", user_id)
+    for section in project["sections"]:
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        update_section_draft(section["id"], text, user_id)
+        update_section_final(section["id"], text, user_id)
+    return project["id"]
+
+
+async def requests_per_second(client: httpx.AsyncClient, path: str, count: int) -> dict:
+    response = await client.get(path)
+    assert response.status_code == 200, (path, response.status_code)
+    start = time.perf_counter()
+    for _ in range(count):
+        await client.get(path)
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": round(count / elapsed, 1),
+        "mean_ms": round(elapsed / count * 1000, 3),
+        "body_kb": round(len(response.content) / 1024, 1),
+    }
+
+
+def time_serialization(project: dict, count: int) -> dict:
+    """Yalnızca serileştirme: doğrulama + dump ile doğrudan dumps (mikrosaniye)"""
+    start = time.perf_counter()
+    for _ in range(count):
+        Project.model_validate(project).model_dump_json()
+    validated_us = (time.perf_counter() - start) / count * 1_000_000
+    
+    start = time.perf_counter()
+    for _ in range(count):
+        dumps(project)
+    fast_us = (time.perf_counter() - start) / count * 1_000_000
+    return {"validate_dump_us": round(validated_us, 1), "fast_dumps_us": round(fast_us, 1)}
+
+
+async def run(args) -> dict:
+    project_id = build_project(args.words)
+    add_baseline_routes()
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, fast_path, baseline_path in (
+            ("get_project", f"/api/v1/projects/{project_id}", f"/bench/baseline/projects/{project_id}"),
+            ("list_templates", "/api/v1/templates/", "/bench/baseline/templates"),
+        ):
+            baseline = await requests_per_second(client, baseline_path, args.requests)
+            fast = await requests_per_second(client, fast_path, args.requests)
+            results[name] = {
+                "baseline": baseline,
+                "fast": fast,
+                "speedup": round(fast["rps"] / baseline["rps"], 2),
+            }
+    
+    project = get_project_by_id(project_id, get_mock_user_id())
+    results["serialization_only"] = time_serialization(project, args.serializations)
+    return results
+
+
+def main(args):
+    print(json.dumps({
+        "encoder": "orjson" if orjson is not None else "json",
+        "words_per_section": args.words,
+        "requests": args.requests,
+        **asyncio.run(run(args)),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=1500, help="Bölüm başına kelime (taslak ve kabul edilen metin)")
+    parser.add_argument("--requests", type=int, default=2000, help="Endpoint başına istek sayısı")
+    parser.add_argument("--serializations", type=int, default=500)
+    main(parser.parse_args())
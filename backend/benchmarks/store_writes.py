@@ -0,0 +1,84 @@
+"""
+Project repository yazma hızı ölçümü (bellek vs. SQLite)
+
+Her process kendi repository örneğini açar; SQLite'ta hepsi aynı dosyayı
+paylaşır (birden fazla uvicorn worker senaryosu).
+
+Kullanım:
+    python -m benchmarks.store_writes --backend sqlite --processes 4
+    python -m benchmarks.store_writes --backend memory
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from data.mock_projects import create_empty_project
+from data.project_repository import create_project_repository
+
+
+def run_worker(args_tuple):
+    """Tek bir worker'da proje oluşturma ve section güncelleme yapar"""
+    database_url, worker_index, projects, updates_per_project = args_tuple
+    store = create_project_repository(database_url)
+    user_id = f"bench-user-{worker_index}"
+    
+    start = time.perf_counter()
+    section_ids = []
+    for i in range(projects):
+        project = create_empty_project("tubitak-2209a", "TÜBİTAK 2209-A", f"Proje {i}")
+        project["user_id"] = user_id
+        store.add(project)
+        section_ids.append(project["sections"][0]["id"])
+    create_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for n in range(updates_per_project):
+        for section_id in section_ids:
+            store.update_section(section_id, user_id, {"draft_content": f"taslak {n}", "updated_at": "bench"})
+    update_s = time.perf_counter() - start
+    
+    store.close()
+    return create_s, update_s
+
+
+def main(args):
+    if args.backend == "sqlite":
+        directory = tempfile.mkdtemp(prefix="akademikform-bench-")
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    else:
+        database_url = "memory://"
+        args.processes = 1
+    
+    jobs = [(database_url, i, args.projects, args.updates) for i in range(args.processes)]
+    wall_start = time.perf_counter()
+    if args.processes == 1:
+        results = [run_worker(jobs[0])]
+    else:
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(run_worker, jobs)
+    wall_s = time.perf_counter() - wall_start
+    
+    total_creates = args.projects * args.processes
+    total_updates = args.projects * args.updates * args.processes
+    print(json.dumps({
+        "backend": args.backend,
+        "processes": args.processes,
+        "project_creates": total_creates,
+        "section_updates": total_updates,
+        "creates_per_s": round(total_creates / max(r[0] for r in results), 1),
+        "updates_per_s": round(total_updates / max(r[1] for r in results), 1),
+        "wall_s": round(wall_s, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="sqlite")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--projects", type=int, default=500, help="Worker başına proje sayısı")
+    parser.add_argument("--updates", type=int, default=10, help="Proje başına section güncellemesi")
+    main(parser.parse_args())
@@ -18,6 +18,69 @@ class Settings(BaseSettings):
     
     # Google AI (Gemini)
     GOOGLE_API_KEY: str = ""
+    GEMINI_MODEL_NAME: Optional[str] = None  # Ayarlanırsa model listesi çekilmez
+    GEMINI_MODEL_LIST_TTL_SECONDS: int = 3600
+    GEMINI_WARMUP_ON_STARTUP: bool = True  # Modeli açılışta arka planda çözümle
+    
+    # AI çağrıları için thread havuzu (SDK senkron çalışır)
+    AI_EXECUTOR_MAX_WORKERS: int = 8
+    
+    # Gemini çağrılarında yeniden deneme, circuit breaker ve süre sınırı
+    AI_RETRY_MAX_ATTEMPTS: int = 3  # Model başına toplam deneme
+    AI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    AI_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    AI_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Art arda bu kadar hatada circuit açılır
+    AI_CIRCUIT_RESET_SECONDS: float = 30.0
+    AI_REQUEST_TIMEOUT_SECONDS: float = 60.0  # X-Request-Timeout header'ı ile kısaltılabilir
+    AI_FALLBACK_MODELS_MAX: int = 2  # Birincil model başarısız olursa denenecek yedek sayısı
+    
+    # Gemini kotası (token bucket); aşılırsa istekler kullanıcı bazında sıraya girer
+    AI_RATE_LIMIT_ENABLED: bool = True
+    AI_RATE_LIMIT_RPM: int = 60  # Dakikadaki istek
+    AI_RATE_LIMIT_TPM: int = 250000  # Dakikadaki token (prompt + çıktı, tahmini)
+    AI_RATE_LIMIT_STORE_URL: Optional[str] = None  # "sqlite:///./ratelimit.db": worker'lar arası ortak kota
+    
+    # Toplu üretimde (generate-all) eşzamanlı Gemini çağrısı üst sınırı
+    AI_GENERATE_ALL_CONCURRENCY: int = 4
+    
+    # AI yanıt cache'i (aynı prompt tekrar Gemini'ye gönderilmez)
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_MAX_ENTRIES: int = 1024
+    AI_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    AI_CACHE_TTL_SECONDS: int = 3600
+    
+    # Export: 2209-A formunun yolu (boşsa repo kökündeki docs/ klasörü)
+    EXPORT_2209A_TEMPLATE_PATH: Optional[str] = None
+    # Export işlerini render eden process sayısı (0: process açılmaz, thread'de render edilir)
+    EXPORT_PROCESS_WORKERS: int = 2
+    # Export cache klasörü (boşsa geçici klasör, kapanışta silinir; verilirse restart'ta korunur)
+    EXPORT_DIR: Optional[str] = None
+    # Export cache'inin diskteki toplam boyut sınırı (aşılırsa en az kullanılan dosyalar silinir)
+    EXPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    
+    # İstek/AI metrikleri (GET /api/v1/metrics, Prometheus formatı)
+    METRICS_ENABLED: bool = True
+    
+    # Readiness: bağımlılıklar arka planda yoklanır, /ready son sonucu döner
+    READINESS_REFRESH_SECONDS: float = 5.0
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0  # Kontrol başına süre sınırı
+    READINESS_MAX_LOOP_LAG_MS: float = 500.0  # Aşılırsa not_ready (event loop bloklanıyor)
+    READINESS_MAX_AI_QUEUE: int = 32  # AI thread havuzunda bekleyen çağrı üst sınırı
+    
+    # Event loop bekçisi: eşiği aşan bloklamaların yığını route bazında kaydedilir
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_THRESHOLD_MS: float = 100.0
+    LOOP_WATCHDOG_MAX_EVENTS: int = 50  # Saklanan son bloklama sayısı
+    
+    # Yavaş istek profili (projects/sections): isteklerin bu oranı örneklenir (0: kapalı),
+    # bütçeyi aşanların profili saklanır (GET /api/v1/debug/profiles)
+    PROFILER_SAMPLE_RATE: float = 0.05
+    PROFILER_LATENCY_BUDGET_MS: float = 500.0
+    PROFILER_INTERVAL_MS: float = 5.0  # Örnekleme aralığı
+    PROFILER_MAX_PROFILES: int = 20  # Saklanan son profil sayısı
+    
+    # Şablon yanıtlarının tarayıcı/proxy cache süresi (Cache-Control max-age, saniye)
+    TEMPLATES_CACHE_MAX_AGE_SECONDS: int = 3600
     
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
@@ -32,8 +95,19 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 30
     
-    # Database (Arkadaşınız ekleyecek)
+    # Database
+    # Boş veya "memory://": bellek içi store (restart'ta veri kaybolur)
+    # "sqlite:///data/akademikform.db": kalıcı SQLite store (worker'lar arası paylaşılır)
     DATABASE_URL: Optional[str] = None
+    DATABASE_POOL_SIZE: int = 5
+    # Revizyon geçmişi: her N revizyonda bir tam kopya, arada yalnızca farklar saklanır
+    REVISION_SNAPSHOT_INTERVAL: int = 16
+    # Otomatik kayıt: bölüm taslakları son yazmadan bu kadar sonra store'a yazılır (0: her istek yazılır)
+    # Bekleyen taslak worker belleğindedir; birden fazla worker ortak SQLite ile çalışırken
+    # başka worker'daki okuma taslağı AUTOSAVE_MAX_DELAY_MS'e kadar eski görebilir
+    AUTOSAVE_DEBOUNCE_MS: int = 1000
+    # Sürekli yazılırken bile taslak en geç bu sürede store'a yazılır
+    AUTOSAVE_MAX_DELAY_MS: int = 5000
     
     class Config:
         env_file = ".env"
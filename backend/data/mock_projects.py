@@ -4,12 +4,24 @@ Bu dosya API_Contract.md'deki project yapısına göre hazırlanmıştır.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, List, Optional
+import base64
 import uuid
+from config.settings import settings
+from data.project_repository import create_project_repository
+from data.revision_store import create_revision_store
+from data.template_registry import template_registry
 
-# In-memory mock database
+# In-memory mock database (DATABASE_URL ayarlanmamışsa kullanılır)
 MOCK_PROJECTS = {}
 
+# Repository katmanı (DATABASE_URL'e göre bellek veya SQLite)
+# Projelere doğrudan MOCK_PROJECTS üzerinden yazılmamalı
+project_store = create_project_repository(settings.DATABASE_URL, memory_projects=MOCK_PROJECTS)
+
+# Kabul edilen bölüm içeriklerinin geçmişi (delta + snapshot)
+revision_store = create_revision_store(settings.DATABASE_URL, settings.REVISION_SNAPSHOT_INTERVAL)
+
 
 def get_mock_user_id():
     """Mock user ID - Auth eklendiğinde gerçek user ID'den gelecek"""
@@ -74,9 +86,8 @@ def create_empty_project(template_id: str, template_name: str, title: str):
         }
     ]
     
-    # Template'e göre sections oluştur (mock templates'den alınacak)
+    # Template'e göre sections oluştur
     sections = []
-    # Bu kısmı basit tutalım, gerçekte template'e göre dinamik olacak
     template_sections = get_template_sections(template_id)
     for i, section_title in enumerate(template_sections):
         sections.append({
@@ -86,6 +97,7 @@ def create_empty_project(template_id: str, template_name: str, title: str):
             "order": i,
             "draft_content": "",
             "final_content": None,
+            "version": 1,
             "created_at": now.isoformat() + "Z",
             "updated_at": now.isoformat() + "Z"
         })
@@ -96,6 +108,7 @@ def create_empty_project(template_id: str, template_name: str, title: str):
         "template_id": template_id,
         "template_name": template_name,
         "title": title,
+        "version": 1,
         "created_at": now.isoformat() + "Z",
         "updated_at": now.isoformat() + "Z",
         "general_info": {
@@ -121,71 +134,118 @@ def create_empty_project(template_id: str, template_name: str, title: str):
 
 def get_template_sections(template_id: str) -> List[str]:
     """Template'e göre section başlıklarını döndürür"""
-    templates_map = {
-        "tubitak-2209a": [
-            "Projenin Özeti",
-            "Araştırma Önerisinin Bilimsel Niteliği",
-            "Yöntem",
-            "Proje Yönetimi",
-            "Araştırma Önerisinin Yaygın Etkisi",
-            "Belirtmek İstediğiniz Diğer Konular",
-            "Kaynakça"
-        ],
-        "tubitak-1001": [
-            "Projenin Özeti",
-            "Giriş ve Amaç",
-            "Literatür Özeti",
-            "Materyal ve Yöntem",
-            "Bulgular ve Tartışma",
-            "Kaynaklar"
-        ],
-        "tubitak-1003": [
-            "Yönetici Özeti",
-            "Proje Tanımı",
-            "Teknoloji ve Yenilik",
-            "İş Planı ve Zaman Çizelgesi",
-            "Proje Ekibi ve Organizasyon",
-            "Ticari Potansiyel ve Yaygın Etki"
-        ]
-    }
-    return templates_map.get(template_id, ["Projenin Özeti"])
+    return template_registry.section_titles(template_id) or ["Projenin Özeti"]
+
+
+# --- Silme Bildirimleri ---
+
+# Proje silindiğinde çağrılan fonksiyonlar (ör. export cache'i)
+_delete_listeners: List[Callable[[str], None]] = []
+
+
+def add_project_delete_listener(listener: Callable[[str], None]):
+    """
+    Proje silinmelerini dinleyecek fonksiyon ekler
+    
+    Güncellemeler bildirilmez: içeriğe bağlı cache'ler (ör. export) değişen
+    projeyi yeni anahtarla bulur, eski kayıtlar boyut sınırıyla atılır.
+    
+    Args:
+        listener: Silinen projenin ID'si ile çağrılır
+    """
+    if listener not in _delete_listeners:
+        _delete_listeners.append(listener)
+
+
+def remove_project_delete_listener(listener: Callable[[str], None]):
+    """Dinleyiciyi kaldırır"""
+    if listener in _delete_listeners:
+        _delete_listeners.remove(listener)
+
+
+def notify_project_deleted(project_id: str):
+    """Dinleyicilere haber verir; bir dinleyicinin hatası silmeyi bozmaz"""
+    for listener in list(_delete_listeners):
+        try:
+            listener(project_id)
+        except Exception as e:
+            print(f"⚠️ Proje silme dinleyicisi hata verdi ({project_id}): {e}")
 
 
 # --- CRUD İşlemleri ---
 
-def get_all_projects(user_id: str, page: int = 1, limit: int = 20):
-    """Kullanıcının tüm projelerini listeler"""
-    user_projects = [p for p in MOCK_PROJECTS.values() if p["user_id"] == user_id]
-    
-    # Pagination
-    start = (page - 1) * limit
-    end = start + limit
-    paginated = user_projects[start:end]
-    
-    # Basitleştirilmiş liste için gereksiz alanları kaldır
-    simplified = []
-    for p in paginated:
-        simplified.append({
-            "id": p["id"],
-            "user_id": p["user_id"],
-            "template_id": p["template_id"],
-            "template_name": p["template_name"],
-            "title": p["title"],
-            "created_at": p["created_at"],
-            "updated_at": p["updated_at"]
-        })
+def encode_cursor(project: dict) -> str:
+    """Projenin sıralama anahtarından opak bir cursor üretir"""
+    created_at, project_id = project_store.project_key(project)
+    raw = f"{created_at}|{project_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str):
+    """
+    Cursor'ı (created_at, project_id) anahtarına çevirir
+    
+    Raises:
+        ValueError: Cursor geçersizse
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except Exception:
+        raise ValueError("Geçersiz cursor")
+    
+    created_at, separator, project_id = raw.partition("|")
+    if not separator or not created_at or not project_id:
+        raise ValueError("Geçersiz cursor")
+    return created_at, project_id
+
+
+def get_all_projects(
+    user_id: str,
+    page: int = 1,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    order: str = "asc"
+):
+    """
+    Kullanıcının tüm projelerini created_at sırasıyla listeler
+    
+    cursor verilirse sayfa numarası yerine cursor'dan sonraki kayıtlar
+    döner (keyset pagination); yanıttaki next_cursor bir sonraki sayfa içindir.
+    
+    Raises:
+        ValueError: Cursor geçersizse
+    """
+    after = decode_cursor(cursor) if cursor else None
+    offset = 0 if after else (page - 1) * limit
+    
+    # Bir fazla kayıt istenir; varsa sonraki sayfa olduğu anlaşılır
+    # (Repository basitleştirilmiş liste kayıtlarını döndürür)
+    simplified = project_store.list_user_projects(
+        user_id,
+        limit=limit + 1,
+        offset=offset,
+        after=after,
+        descending=(order == "desc")
+    )
+    has_more = len(simplified) > limit
+    simplified = simplified[:limit]
+    
+    next_cursor = None
+    if has_more and simplified:
+        next_cursor = encode_cursor(simplified[-1])
     
     return {
         "projects": simplified,
-        "total": len(user_projects),
+        "total": project_store.count_user_projects(user_id),
         "page": page,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor
     }
 
 
 def get_project_by_id(project_id: str, user_id: str):
     """Belirli bir projeyi getirir"""
-    project = MOCK_PROJECTS.get(project_id)
+    project = project_store.get(project_id)
     
     if not project:
         return None
@@ -201,108 +261,262 @@ def create_project(template_id: str, template_name: str, title: str, user_id: st
     """Yeni proje oluşturur"""
     project = create_empty_project(template_id, template_name, title)
     project["user_id"] = user_id
-    MOCK_PROJECTS[project["id"]] = project
+    project_store.add(project)
     return project
 
 
-def update_project_title(project_id: str, title: str, user_id: str):
-    """Proje başlığını günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+def get_section_by_id(section_id: str, user_id: str):
+    """
+    Section'ı ve ait olduğu projeyi getirir
     
+    Returns:
+        tuple: (project, section) veya (None, None) if not found
+    """
+    project, section = project_store.find_section(section_id)
+    
+    # Kullanıcının kendi projesi mi kontrol et
     if not project or project["user_id"] != user_id:
+        return None, None
+    
+    return project, section
+
+
+def update_project_title(project_id: str, title: str, user_id: str, expected_version: Optional[int] = None):
+    """Proje başlığını günceller"""
+    updated_at = datetime.utcnow().isoformat() + "Z"
+    
+    result = project_store.update_project(
+        project_id, user_id, {"title": title, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["title"] = title
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "id": project["id"],
-        "title": project["title"],
-        "updated_at": project["updated_at"]
+        "id": project_id,
+        "title": title,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def update_general_info(project_id: str, general_info: dict, user_id: str):
+def update_general_info(project_id: str, general_info: dict, user_id: str, expected_version: Optional[int] = None):
     """Genel bilgileri günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+    updated_at = datetime.utcnow().isoformat() + "Z"
     
-    if not project or project["user_id"] != user_id:
+    result = project_store.update_project(
+        project_id, user_id, {"general_info": general_info, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["general_info"] = general_info
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "general_info": project["general_info"],
-        "updated_at": project["updated_at"]
+        "general_info": general_info,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def update_keywords(project_id: str, keywords: str, user_id: str):
+def update_keywords(project_id: str, keywords: str, user_id: str, expected_version: Optional[int] = None):
     """Anahtar kelimeleri günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+    updated_at = datetime.utcnow().isoformat() + "Z"
     
-    if not project or project["user_id"] != user_id:
+    result = project_store.update_project(
+        project_id, user_id, {"keywords": keywords, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["keywords"] = keywords
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "keywords": project["keywords"],
-        "updated_at": project["updated_at"]
+        "keywords": keywords,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def update_scientific_merit(project_id: str, scientific_merit: dict, user_id: str):
+def update_scientific_merit(project_id: str, scientific_merit: dict, user_id: str, expected_version: Optional[int] = None):
     """Bilimsel niteliği günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+    updated_at = datetime.utcnow().isoformat() + "Z"
     
-    if not project or project["user_id"] != user_id:
+    result = project_store.update_project(
+        project_id, user_id, {"scientific_merit": scientific_merit, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["scientific_merit"] = scientific_merit
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "scientific_merit": project["scientific_merit"],
-        "updated_at": project["updated_at"]
+        "scientific_merit": scientific_merit,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def update_project_management(project_id: str, project_management: dict, user_id: str):
+def update_project_management(project_id: str, project_management: dict, user_id: str, expected_version: Optional[int] = None):
     """Proje yönetimini günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+    updated_at = datetime.utcnow().isoformat() + "Z"
     
-    if not project or project["user_id"] != user_id:
+    result = project_store.update_project(
+        project_id, user_id, {"project_management": project_management, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["project_management"] = project_management
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "project_management": project["project_management"],
-        "updated_at": project["updated_at"]
+        "project_management": project_management,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def update_wide_impact(project_id: str, wide_impact: list, user_id: str):
+def update_wide_impact(project_id: str, wide_impact: list, user_id: str, expected_version: Optional[int] = None):
     """Geniş etkiyi günceller"""
-    project = MOCK_PROJECTS.get(project_id)
+    updated_at = datetime.utcnow().isoformat() + "Z"
     
-    if not project or project["user_id"] != user_id:
+    result = project_store.update_project(
+        project_id, user_id, {"wide_impact": wide_impact, "updated_at": updated_at}, expected_version
+    )
+    if result is None:
         return None
     
-    project["wide_impact"] = wide_impact
-    project["updated_at"] = datetime.utcnow().isoformat() + "Z"
     return {
-        "wide_impact": project["wide_impact"],
-        "updated_at": project["updated_at"]
+        "wide_impact": wide_impact,
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
     }
 
 
-def delete_project(project_id: str, user_id: str):
-    """Projeyi siler"""
-    project = MOCK_PROJECTS.get(project_id)
+def patch_project_tables(project_id: str, operations: List[dict], user_id: str, expected_version: Optional[int] = None):
+    """
+    Proje tablolarına satır id'li patch işlemlerini uygular
     
-    if not project or project["user_id"] != user_id:
-        return False
+    Returns:
+        dict: Değişen tablolar, timestamp ve proje sürümü veya None if not found
+    
+    Raises:
+        VersionConflict: expected_version projenin güncel sürümü değilse
+        TablePatchConflict: İşlemler tabloların güncel haline uygulanamazsa
+    """
+    updated_at = datetime.utcnow().isoformat() + "Z"
+    
+    result = project_store.patch_tables(project_id, user_id, operations, updated_at, expected_version)
+    if result is None:
+        return None
+    
+    return {
+        "id": project_id,
+        "tables": result["tables"],
+        "updated_at": updated_at,
+        "version": result["version"],
+        "sections_version": result["sections_version"]
+    }
+
+
+def update_section_draft(section_id: str, draft_content: str, user_id: str, expected_version: Optional[int] = None):
+    """
+    Section taslağını (draft_content) günceller
+    
+    Returns:
+        dict: Güncellenmiş section veya None if not found
+    
+    Raises:
+        VersionConflict: expected_version section'ın güncel sürümü değilse
+    """
+    updated_at = datetime.utcnow().isoformat() + "Z"
+    section = project_store.update_section(section_id, user_id, {
+        "draft_content": draft_content,
+        "updated_at": updated_at
+    }, expected_version)
+    
+    return section
+
+
+def update_section_final(section_id: str, final_content: str, user_id: str, expected_version: Optional[int] = None):
+    """
+    Kabul edilen içeriği final_content olarak kaydeder ve revizyon geçmişine ekler
+    
+    Returns:
+        dict: Güncellenmiş section ("revision" alanıyla) veya None if not found
+    
+    Raises:
+        VersionConflict: expected_version section'ın güncel sürümü değilse
+    """
+    updated_at = datetime.utcnow().isoformat() + "Z"
+    section = project_store.update_section(section_id, user_id, {
+        "final_content": final_content,
+        "updated_at": updated_at
+    }, expected_version)
     
-    del MOCK_PROJECTS[project_id]
-    return True
+    if not section:
+        return None
+    
+    revision = revision_store.append(section_id, section["project_id"], final_content, created_at=updated_at)
+    return {**section, "revision": revision}
+
+
+def get_section_revisions(
+    section_id: str,
+    user_id: str,
+    page: int = 1,
+    limit: int = 20,
+    order: str = "asc",
+    include_content: bool = True
+):
+    """
+    Bölümün revizyon geçmişini sayfa sayfa getirir
+    
+    Returns:
+        dict: {"revisions": [...], "total", "page", "limit"} veya None if not found
+    """
+    project, section = get_section_by_id(section_id, user_id)
+    if not section:
+        return None
+    
+    return {
+        "revisions": revision_store.list(
+            section_id,
+            offset=(page - 1) * limit,
+            limit=limit,
+            descending=(order == "desc"),
+            include_content=include_content
+        ),
+        "total": revision_store.count(section_id),
+        "page": page,
+        "limit": limit
+    }
+
 
+def get_section_revision(section_id: str, revision_number: int, user_id: str):
+    """
+    Bölümün belirli bir revizyonunu içeriğiyle getirir
+    
+    Returns:
+        dict: Revizyon veya None if not found
+    """
+    project, section = get_section_by_id(section_id, user_id)
+    if not section:
+        return None
+    return revision_store.get(section_id, revision_number)
+
+
+def delete_project(project_id: str, user_id: str):
+    """Projeyi siler"""
+    deleted = project_store.delete(project_id, user_id)
+    if deleted:
+        revision_store.delete_project(project_id)
+        notify_project_deleted(project_id)
+    return deleted
+
+
+def ping_store():
+    """
+    Proje store'unu yoklar (readiness probe)
+    
+    Raises:
+        Exception: Store kullanılamıyorsa
+    """
+    project_store.ping()
@@ -1,6 +1,7 @@
 """
 Mock template data for development and testing.
 Bu dosya API_Contract.md'deki template yapısına göre hazırlanmıştır.
+Şablonlara data.template_registry üzerinden erişilir.
 """
 
 MOCK_TEMPLATES = [
@@ -160,16 +161,3 @@ MOCK_TEMPLATES = [
     }
 ]
 
-
-def get_all_templates():
-    """Tüm şablonları döndürür"""
-    return MOCK_TEMPLATES
-
-
-def get_template_by_id(template_id: str):
-    """Belirli bir şablonu ID'ye göre döndürür"""
-    for template in MOCK_TEMPLATES:
-        if template["id"] == template_id:
-            return template
-    return None
-
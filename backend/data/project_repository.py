@@ -0,0 +1,260 @@
+"""
+Project repository arayüzü
+Proje verisinin nerede saklandığından (bellek, SQLite, ...) bağımsız erişim katmanı
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, List, Tuple
+
+# Kullanıcı proje listesindeki sıralama anahtarı: (created_at, project_id)
+ProjectKey = Tuple[str, str]
+
+
+class VersionConflict(Exception):
+    """
+    Beklenen sürüm (If-Match) kayıttaki sürümle uyuşmadığında fırlatılır
+    
+    Attributes:
+        current_version: Kayıttaki güncel sürüm
+        sections_version: Proje yazımlarında bölüm sürümleri toplamı (proje ETag'i için),
+            bölüm yazımlarında None
+    """
+    
+    def __init__(self, current_version: int, sections_version: Optional[int] = None):
+        super().__init__(f"Sürüm uyuşmazlığı (güncel sürüm: {current_version})")
+        self.current_version = current_version
+        self.sections_version = sections_version
+
+
+class ProjectRepository(ABC):
+    """
+    Proje saklama katmanının ortak arayüzü
+    
+    Projeler API_Contract.md'deki yapıda dict olarak alınır ve döndürülür.
+    Güncellemeler yalnızca bu metodlar üzerinden yapılmalıdır; dönen
+    dict'leri yerinde değiştirmek kalıcı depolamaya yansımaz.
+    """
+    
+    @abstractmethod
+    def add(self, project: dict):
+        """Yeni projeyi (bölümleri ve tablolarıyla) kaydeder"""
+    
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[dict]:
+        """Projeyi ID ile getirir"""
+    
+    @abstractmethod
+    def update_project(
+        self,
+        project_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Projenin üst seviye alanlarını günceller ve sürümünü bir artırır
+        
+        Sürüm kontrolü ve yazma aynı kilit/transaction içinde yapılır
+        (compare-and-set); iki sekmeden gelen yazmalardan biri kaybolmaz.
+        Bölüm sürümleri toplamı da aynı adımda okunur (proje ETag'i için).
+        
+        Args:
+            project_id: Proje ID'si
+            user_id: Projenin sahibi olması beklenen kullanıcı
+            fields: title, general_info, keywords, scientific_merit,
+                project_management, wide_impact, updated_at alanlarından herhangileri
+            expected_version: Verilirse projenin güncel sürümü bu olmalı
+        
+        Returns:
+            dict: {"version": yeni sürüm, "sections_version": bölüm sürümleri toplamı}
+                veya None if not found
+        
+        Raises:
+            VersionConflict: expected_version güncel sürümle uyuşmazsa
+        """
+    
+    @abstractmethod
+    def update_section(
+        self,
+        section_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Section alanlarını (draft_content, final_content, updated_at) günceller
+        ve section sürümünü bir artırır
+        
+        Args:
+            expected_version: Verilirse section'ın güncel sürümü bu olmalı
+        
+        Returns:
+            dict: Güncellenmiş section veya None if not found
+        
+        Raises:
+            VersionConflict: expected_version güncel sürümle uyuşmazsa
+        """
+    
+    @abstractmethod
+    def patch_tables(
+        self,
+        project_id: str,
+        user_id: str,
+        operations: List[dict],
+        updated_at: str,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Proje tablolarına satır id'li patch işlemlerini uygular
+        
+        Yalnızca işlemlerin değindiği tablolar okunur ve yalnızca değişen
+        satırlar yazılır. İşlemlerin hepsi tek adımda uygulanır, proje
+        sürümü bir artar.
+        
+        Args:
+            project_id: Proje ID'si
+            user_id: Projenin sahibi olması beklenen kullanıcı
+            operations: TablePatchOperation.to_operation() çıktıları
+            updated_at: Projenin yeni updated_at değeri
+            expected_version: Verilirse projenin güncel sürümü bu olmalı
+        
+        Returns:
+            dict: {"version": yeni sürüm, "sections_version": bölüm sürümleri toplamı,
+                "tables": değişen tabloların satırları} veya None if not found
+        
+        Raises:
+            VersionConflict: expected_version güncel sürümle uyuşmazsa
+            TablePatchConflict: İşlemler tablonun güncel haline uygulanamazsa
+        """
+    
+    @abstractmethod
+    def delete(self, project_id: str, user_id: str) -> bool:
+        """Projeyi ve bağlı tüm kayıtları siler"""
+    
+    @abstractmethod
+    def find_section(self, section_id: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """
+        Section'ı ve ait olduğu projeyi bulur
+        
+        Returns:
+            tuple: (project, section) veya (None, None) if not found
+        """
+    
+    @abstractmethod
+    def list_user_projects(
+        self,
+        user_id: str,
+        limit: int,
+        offset: int = 0,
+        after: Optional[ProjectKey] = None,
+        descending: bool = False
+    ) -> List[dict]:
+        """
+        Kullanıcının projelerini (created_at, id) sırasıyla özet olarak döndürür
+        
+        Args:
+            user_id: Kullanıcı ID'si
+            limit: En fazla kaç proje döneceği
+            offset: Atlanacak kayıt sayısı (sayfa tabanlı erişim için)
+            after: Bu anahtardan sonraki kayıtlar (cursor tabanlı erişim için)
+            descending: True ise en yeni proje önce gelir
+        
+        Returns:
+            List[dict]: id, user_id, template_id, template_name, title,
+                created_at, updated_at alanlarını içeren özetler
+        """
+    
+    @abstractmethod
+    def count_user_projects(self, user_id: str) -> int:
+        """Kullanıcının proje sayısını döndürür"""
+    
+    def close(self):
+        """Açık bağlantıları kapatır (gerekiyorsa)"""
+    
+    def ping(self):
+        """
+        Store'un okuma ve yazma yapabildiğini doğrular (readiness probe)
+        
+        Raises:
+            Exception: Store kullanılamıyorsa
+        """
+        self.count_user_projects("")
+    
+    @staticmethod
+    def project_key(project: dict) -> ProjectKey:
+        """Projenin kullanıcı listesindeki sıralama anahtarı"""
+        return project["created_at"], project["id"]
+
+
+def project_summary(project: dict) -> dict:
+    """Proje listesi için basitleştirilmiş kayıt"""
+    return {
+        "id": project["id"],
+        "user_id": project["user_id"],
+        "template_id": project["template_id"],
+        "template_name": project["template_name"],
+        "title": project["title"],
+        "created_at": project["created_at"],
+        "updated_at": project["updated_at"]
+    }
+
+
+def section_summary(section: dict) -> dict:
+    """
+    Bölümün metinsiz özeti (gezinme paneli ve dashboard için)
+    
+    Returns:
+        dict: Bölüm alanları (draft_content/final_content hariç), kelime
+            sayıları ve durum (empty / draft / accepted)
+    """
+    draft = section.get("draft_content") or ""
+    final = section.get("final_content") or ""
+    if final:
+        status = "accepted"
+    elif draft.strip():
+        status = "draft"
+    else:
+        status = "empty"
+    
+    return {
+        "id": section["id"],
+        "project_id": section["project_id"],
+        "title": section["title"],
+        "order": section["order"],
+        "version": section.get("version", 1),
+        "created_at": section["created_at"],
+        "updated_at": section["updated_at"],
+        "draft_word_count": len(draft.split()),
+        "final_word_count": len(final.split()),
+        "status": status
+    }
+
+
+def create_project_repository(database_url: Optional[str], memory_projects: Optional[dict] = None) -> ProjectRepository:
+    """
+    DATABASE_URL'e göre uygun repository'i oluşturur
+    
+    Desteklenen URL'ler:
+        - boş / "memory://" -> InMemoryProjectStore (varsayılan, restart'ta veri kaybolur)
+        - "sqlite:///relative/path.db" veya "sqlite:////absolute/path.db" -> SQLiteProjectStore
+    
+    Args:
+        database_url: settings.DATABASE_URL
+        memory_projects: In-memory modda kullanılacak sözlük
+    
+    Raises:
+        ValueError: URL şeması desteklenmiyorsa
+    """
+    if not database_url or database_url == "memory://":
+        from data.project_store import InMemoryProjectStore
+        return InMemoryProjectStore(memory_projects if memory_projects is not None else {})
+    
+    if database_url.startswith("sqlite:///"):
+        from data.sqlite_project_store import SQLiteProjectStore
+        from config.settings import settings
+        return SQLiteProjectStore(
+            path=database_url[len("sqlite:///"):],
+            pool_size=settings.DATABASE_POOL_SIZE
+        )
+    
+    raise ValueError(f"Desteklenmeyen DATABASE_URL: {database_url}")
@@ -0,0 +1,205 @@
+"""
+In-memory project store
+MOCK_PROJECTS sözlüğü etrafında ikincil index'ler tutan repository katmanı
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Tuple, Optional, List
+from data.project_repository import ProjectRepository, ProjectKey, VersionConflict, project_summary
+from data.table_patch import PROJECT_MANAGEMENT_TABLES, apply_table_patch, get_table, touched_tables
+
+
+class InMemoryProjectStore(ProjectRepository):
+    """
+    Projeleri ID'ye göre saklar ve ikincil index'leri tutarlı tutar
+    
+    Index'ler:
+        - section_id -> (project_id, sections listesindeki index)
+        - user_id -> (created_at, project_id) anahtarlarının sıralı listesi
+    
+    Böylece section araması ve kullanıcı proje listesi, store'daki
+    toplam proje sayısından bağımsız çalışır. created_at değişmediği için
+    sıralama yeni eklemeler olsa da sabit kalır (keyset pagination).
+    """
+    
+    def __init__(self, projects: Dict[str, dict]):
+        self.projects = projects
+        self._section_index: Dict[str, Tuple[str, int]] = {}
+        self._user_index: Dict[str, List[ProjectKey]] = {}
+        self._lock = threading.Lock()
+        
+        for project in projects.values():
+            self._index_project(project)
+    
+    def add(self, project: dict):
+        """Projeyi store'a ekler ve index'ler"""
+        with self._lock:
+            self.projects[project["id"]] = project
+            self._index_project(project)
+    
+    def get(self, project_id: str) -> Optional[dict]:
+        """Projeyi ID ile getirir"""
+        return self.projects.get(project_id)
+    
+    def update_project(
+        self,
+        project_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Projenin üst seviye alanlarını günceller, sürümü artırır"""
+        project = self.projects.get(project_id)
+        
+        if not project or project["user_id"] != user_id:
+            return None
+        
+        with self._lock:
+            version = project.get("version", 1)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version, self._sections_version(project))
+            project.update(fields)
+            project["version"] = version + 1
+            return {"version": version + 1, "sections_version": self._sections_version(project)}
+    
+    def update_section(
+        self,
+        section_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Section alanlarını günceller, section sürümünü artırır"""
+        project, section = self.find_section(section_id)
+        
+        if not section or project["user_id"] != user_id:
+            return None
+        
+        with self._lock:
+            version = section.get("version", 1)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version)
+            section.update(fields)
+            section["version"] = version + 1
+            return section
+    
+    def patch_tables(
+        self,
+        project_id: str,
+        user_id: str,
+        operations: List[dict],
+        updated_at: str,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Tablo patch'ini uygular; değişen tablolar yeni listelerle değiştirilir"""
+        project = self.projects.get(project_id)
+        
+        if not project or project["user_id"] != user_id:
+            return None
+        
+        with self._lock:
+            version = project.get("version", 1)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflict(version, self._sections_version(project))
+            
+            tables = apply_table_patch(
+                {table: get_table(project, table) for table in touched_tables(operations)},
+                operations
+            )
+            
+            # Okuyucular eski listeleri görmeye devam eder; yarım patch görünmez
+            project_management = dict(project.get("project_management", {}))
+            for table, rows in tables.items():
+                if table in PROJECT_MANAGEMENT_TABLES:
+                    project_management[table] = rows
+                else:
+                    project[table] = rows
+            project["project_management"] = project_management
+            project["updated_at"] = updated_at
+            project["version"] = version + 1
+            return {"version": version + 1, "sections_version": self._sections_version(project), "tables": tables}
+    
+    def delete(self, project_id: str, user_id: str) -> bool:
+        """Projeyi ve index kayıtlarını siler"""
+        with self._lock:
+            project = self.projects.get(project_id)
+            if project is None or project["user_id"] != user_id:
+                return False
+            del self.projects[project_id]
+            
+            for section in project.get("sections", []):
+                self._section_index.pop(section["id"], None)
+            
+            user_keys = self._user_index.get(project["user_id"])
+            if user_keys is not None:
+                key = self.project_key(project)
+                position = bisect_left(user_keys, key)
+                if position < len(user_keys) and user_keys[position] == key:
+                    del user_keys[position]
+                if not user_keys:
+                    del self._user_index[project["user_id"]]
+            return True
+    
+    def find_section(self, section_id: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """
+        Section'ı ve ait olduğu projeyi O(1) bulur
+        
+        Returns:
+            tuple: (project, section) veya (None, None) if not found
+        """
+        location = self._section_index.get(section_id)
+        if location is None:
+            return None, None
+        
+        project_id, index = location
+        project = self.projects.get(project_id)
+        if project is None:
+            return None, None
+        
+        sections = project.get("sections", [])
+        if index >= len(sections) or sections[index]["id"] != section_id:
+            return None, None
+        return project, sections[index]
+    
+    def list_user_projects(
+        self,
+        user_id: str,
+        limit: int,
+        offset: int = 0,
+        after: Optional[ProjectKey] = None,
+        descending: bool = False
+    ) -> List[dict]:
+        """Kullanıcının projelerini created_at sırasıyla özet olarak döndürür"""
+        user_keys = self._user_index.get(user_id, [])
+        
+        if descending:
+            end = bisect_left(user_keys, after) if after else len(user_keys)
+            end = max(end - offset, 0)
+            start = max(end - limit, 0)
+            keys = reversed(user_keys[start:end])
+        else:
+            start = bisect_right(user_keys, after) if after else 0
+            start += offset
+            keys = user_keys[start:start + limit]
+        
+        return [project_summary(self.projects[project_id]) for _, project_id in keys]
+    
+    def count_user_projects(self, user_id: str) -> int:
+        """Kullanıcının proje sayısını döndürür"""
+        return len(self._user_index.get(user_id, []))
+    
+    def ping(self):
+        """Yazma kilidi alınabiliyor mu (kilit takılı kalırsa probe süre aşımına düşer)"""
+        with self._lock:
+            pass
+    
+    @staticmethod
+    def _sections_version(project: dict) -> int:
+        return sum(section.get("version", 1) for section in project.get("sections", []))
+    
+    def _index_project(self, project: dict):
+        for index, section in enumerate(project.get("sections", [])):
+            self._section_index[section["id"]] = (project["id"], index)
+        # Yeni projeler genelde en sona eklenir; insort bu durumda ucuzdur
+        insort(self._user_index.setdefault(project["user_id"], []), self.project_key(project))
@@ -0,0 +1,370 @@
+"""
+Section revision store
+Kabul edilen her bölüm içeriğini, bir önceki sürüme göre fark (delta) olarak
+ve aralıklı tam kopyalarla (snapshot) saklar
+"""
+
+import json
+import re
+import threading
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple, Union
+
+# Delta işlemleri: pozitif int -> eski metinden o kadar karakter kopyala,
+# negatif int -> eski metinde o kadar karakter atla, str -> metni ekle
+DeltaOp = Union[int, str]
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+# Kelime + ardındaki boşluk bir token; fark kelime düzeyinde bulunur
+# (boşluğu ayrı token yapmak her yerde geçen tek bir token üretir ve eşleşmeyi yavaşlatır)
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+def common_affixes(old: str, new: str) -> Tuple[int, int]:
+    """İki metnin ortak baş ve son uzunlukları (çakışmadan)"""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+
+def encode_delta(old: str, new: str) -> List[DeltaOp]:
+    """
+    old'dan new'i üreten işlem listesi
+    
+    Ortak baş ve son karakter düzeyinde ayrılır (düzenlemelerin çoğu
+    metnin küçük bir bölümüne dokunur), kalan orta kısım kelime
+    düzeyinde karşılaştırılır.
+    """
+    prefix, suffix = common_affixes(old, new)
+    
+    ops: List[DeltaOp] = []
+    
+    def emit(op: DeltaOp):
+        if not op:
+            return
+        if ops and isinstance(op, str) and isinstance(ops[-1], str):
+            ops[-1] += op
+        elif ops and isinstance(op, int) and isinstance(ops[-1], int) and (op > 0) == (ops[-1] > 0):
+            ops[-1] += op
+        else:
+            ops.append(op)
+    
+    emit(prefix)
+    old_tokens = _TOKEN_RE.findall(old[prefix:len(old) - suffix])
+    new_tokens = _TOKEN_RE.findall(new[prefix:len(new) - suffix])
+    matcher = SequenceMatcher(None, old_tokens, new_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        old_length = sum(len(token) for token in old_tokens[i1:i2])
+        if tag == "equal":
+            emit(old_length)
+            continue
+        if old_length:
+            emit(-old_length)
+        if j2 > j1:
+            emit("".join(new_tokens[j1:j2]))
+    emit(suffix)
+    return ops
+
+
+def apply_delta(old: str, ops: List[DeltaOp]) -> str:
+    """encode_delta'nın ürettiği işlemleri old metnine uygular"""
+    parts = []
+    cursor = 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.append(old[cursor:cursor + op])
+            cursor += op
+        else:
+            cursor -= op
+    return "".join(parts)
+
+
+def pack_snapshot(content: str) -> bytes:
+    return zlib.compress(content.encode("utf-8"))
+
+
+def unpack_snapshot(payload: bytes) -> str:
+    return zlib.decompress(payload).decode("utf-8")
+
+
+def pack_delta(ops: List[DeltaOp]) -> bytes:
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack_delta(payload: bytes) -> List[DeltaOp]:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+class RevisionStore(ABC):
+    """
+    Revizyon saklama katmanının ortak arayüzü
+    
+    Revizyon n, en yakın snapshot'tan (n'den küçük veya eşit) başlanıp
+    sonraki delta'lar uygulanarak elde edilir. Snapshot'lar en fazla
+    snapshot_interval revizyonda bir alındığından bir revizyonu okumak
+    snapshot araması (O(log n)) + en fazla snapshot_interval delta demektir;
+    saklanan veri revizyon sayısı x metin boyutuyla değil, değişikliklerle büyür.
+    
+    Alt sınıflar yalnızca kayıt okuma/yazma primitive'lerini uygular.
+    """
+    
+    def __init__(self, snapshot_interval: int = 16):
+        self.snapshot_interval = max(1, snapshot_interval)
+    
+    # --- Arayüz ---
+    
+    def append(
+        self,
+        section_id: str,
+        project_id: str,
+        content: str,
+        created_at: Optional[str] = None
+    ) -> dict:
+        """
+        Bölüme yeni revizyon ekler
+        
+        Args:
+            section_id: Section ID'si
+            project_id: Bölümün projesi (proje silinince revizyonları da silinir)
+            content: Kabul edilen içerik
+            created_at: Zaman damgası (varsayılan: şimdi)
+        
+        Returns:
+            dict: id, section_id, content, revision_number, created_at
+        """
+        created_at = created_at or datetime.utcnow().isoformat() + "Z"
+        revision_id = f"rev-{uuid.uuid4()}"
+        
+        with self._append_lock(section_id) as previous_number:
+            number = previous_number + 1
+            record = {
+                "id": revision_id,
+                "section_id": section_id,
+                "project_id": project_id,
+                "revision_number": number,
+                "created_at": created_at,
+            }
+            
+            if previous_number == 0:
+                record.update(kind=SNAPSHOT, payload=pack_snapshot(content))
+            else:
+                last_snapshot = self._snapshot_at_or_before(section_id, previous_number)
+                ops = None
+                if number - last_snapshot < self.snapshot_interval:
+                    previous = self._content_at(section_id, previous_number, last_snapshot)
+                    prefix, suffix = common_affixes(previous, content)
+                    # Metnin çoğu değiştiyse (ör. yeni AI önerisi) fark aranmaz
+                    if (len(content) - prefix - suffix) * 2 <= len(content):
+                        ops = encode_delta(previous, content)
+                
+                # Zincir uzadıysa veya metnin çoğu değiştiyse tam kopya daha ucuz
+                if ops is None or sum(len(op) for op in ops if isinstance(op, str)) * 2 > len(content):
+                    record.update(kind=SNAPSHOT, payload=pack_snapshot(content))
+                else:
+                    record.update(kind=DELTA, payload=pack_delta(ops))
+            
+            self._insert(record)
+        
+        return self._public(record, content)
+    
+    def get(self, section_id: str, revision_number: int) -> Optional[dict]:
+        """
+        Belirli bir revizyonu içeriğiyle getirir
+        
+        Returns:
+            dict: Revizyon veya None if not found
+        """
+        if revision_number < 1 or revision_number > self.count(section_id):
+            return None
+        snapshot_number = self._snapshot_at_or_before(section_id, revision_number)
+        records = self._records(section_id, snapshot_number, revision_number)
+        content = self._replay(records)
+        return self._public(records[-1], content)
+    
+    def list(
+        self,
+        section_id: str,
+        offset: int = 0,
+        limit: int = 20,
+        descending: bool = False,
+        include_content: bool = True
+    ) -> List[dict]:
+        """
+        Revizyonları sayfa sayfa listeler
+        
+        İçerik istenirse sayfa tek geçişte üretilir: ilk revizyonun
+        snapshot'ından başlanıp delta'lar sırayla uygulanır.
+        
+        Args:
+            section_id: Section ID'si
+            offset: Atlanacak revizyon sayısı
+            limit: Sayfa boyutu
+            descending: True ise en yeni revizyon önce gelir
+            include_content: False ise yalnızca metadata döner (daha hızlı)
+        """
+        total = self.count(section_id)
+        if descending:
+            last = total - offset
+            first = max(1, last - limit + 1)
+        else:
+            first = offset + 1
+            last = min(total, offset + limit)
+        if first > last:
+            return []
+        
+        if not include_content:
+            revisions = [self._public(record) for record in self._records(section_id, first, last)]
+        else:
+            snapshot_number = self._snapshot_at_or_before(section_id, first)
+            revisions = []
+            content = ""
+            for record in self._records(section_id, snapshot_number, last):
+                content = self._apply(content, record)
+                if record["revision_number"] >= first:
+                    revisions.append(self._public(record, content))
+        
+        if descending:
+            revisions.reverse()
+        return revisions
+    
+    @abstractmethod
+    def count(self, section_id: str) -> int:
+        """Bölümün revizyon sayısı (son revizyon numarası)"""
+    
+    @abstractmethod
+    def delete_project(self, project_id: str):
+        """Projenin tüm bölümlerinin revizyonlarını siler"""
+    
+    def close(self):
+        """Açık bağlantıları kapatır (gerekiyorsa)"""
+    
+    # --- Alt sınıfların uyguladığı primitive'ler ---
+    
+    @abstractmethod
+    def _append_lock(self, section_id: str):
+        """Bölüme yazma kilidi; context manager son revizyon numarasını verir"""
+    
+    @abstractmethod
+    def _snapshot_at_or_before(self, section_id: str, revision_number: int) -> int:
+        """revision_number'dan küçük veya eşit en büyük snapshot numarası"""
+    
+    @abstractmethod
+    def _records(self, section_id: str, first: int, last: int) -> List[dict]:
+        """first..last aralığındaki kayıtlar (numara sırasıyla)"""
+    
+    @abstractmethod
+    def _insert(self, record: dict):
+        """Kaydı ekler (_append_lock içinde çağrılır)"""
+    
+    # --- Yardımcılar ---
+    
+    def _content_at(self, section_id: str, revision_number: int, snapshot_number: int) -> str:
+        return self._replay(self._records(section_id, snapshot_number, revision_number))
+    
+    @staticmethod
+    def _apply(content: str, record: dict) -> str:
+        if record["kind"] == SNAPSHOT:
+            return unpack_snapshot(record["payload"])
+        return apply_delta(content, unpack_delta(record["payload"]))
+    
+    def _replay(self, records: List[dict]) -> str:
+        content = ""
+        for record in records:
+            content = self._apply(content, record)
+        return content
+    
+    @staticmethod
+    def _public(record: dict, content: Optional[str] = None) -> dict:
+        revision = {
+            "id": record["id"],
+            "section_id": record["section_id"],
+            "revision_number": record["revision_number"],
+            "created_at": record["created_at"],
+        }
+        if content is not None:
+            revision["content"] = content
+        return revision
+
+
+class InMemoryRevisionStore(RevisionStore):
+    """
+    Revizyonları bellekte tutar
+    
+    Her bölüm için kayıtlar numara sırasıyla bir listede (revizyon n ->
+    index n-1), snapshot numaraları ayrı sıralı bir listede tutulur.
+    """
+    
+    def __init__(self, snapshot_interval: int = 16):
+        super().__init__(snapshot_interval)
+        self._sections: Dict[str, List[dict]] = {}
+        self._snapshots: Dict[str, List[int]] = {}
+        self._project_sections: Dict[str, set] = {}
+        self._lock = threading.Lock()
+    
+    def count(self, section_id: str) -> int:
+        return len(self._sections.get(section_id, []))
+    
+    def delete_project(self, project_id: str):
+        with self._lock:
+            for section_id in self._project_sections.pop(project_id, set()):
+                self._sections.pop(section_id, None)
+                self._snapshots.pop(section_id, None)
+    
+    @contextmanager
+    def _append_lock(self, section_id: str):
+        with self._lock:
+            yield self.count(section_id)
+    
+    def _snapshot_at_or_before(self, section_id: str, revision_number: int) -> int:
+        snapshots = self._snapshots.get(section_id, [])
+        return snapshots[bisect_right(snapshots, revision_number) - 1]
+    
+    def _records(self, section_id: str, first: int, last: int) -> List[dict]:
+        return self._sections.get(section_id, [])[first - 1:last]
+    
+    def _insert(self, record: dict):
+        section_id = record["section_id"]
+        self._sections.setdefault(section_id, []).append(record)
+        if record["kind"] == SNAPSHOT:
+            self._snapshots.setdefault(section_id, []).append(record["revision_number"])
+        self._project_sections.setdefault(record["project_id"], set()).add(section_id)
+
+
+def create_revision_store(database_url: Optional[str], snapshot_interval: int = 16) -> RevisionStore:
+    """
+    DATABASE_URL'e göre uygun revizyon store'unu oluşturur
+    
+    Project repository ile aynı URL'ler desteklenir; SQLite'ta revizyonlar
+    projelerle aynı dosyada tutulur.
+    
+    Raises:
+        ValueError: URL şeması desteklenmiyorsa
+    """
+    if not database_url or database_url == "memory://":
+        return InMemoryRevisionStore(snapshot_interval)
+    
+    if database_url.startswith("sqlite:///"):
+        from data.sqlite_revision_store import SQLiteRevisionStore
+        from config.settings import settings
+        return SQLiteRevisionStore(
+            path=database_url[len("sqlite:///"):],
+            pool_size=settings.DATABASE_POOL_SIZE,
+            snapshot_interval=snapshot_interval
+        )
+    
+    raise ValueError(f"Desteklenmeyen DATABASE_URL: {database_url}")
@@ -0,0 +1,565 @@
+"""
+SQLite project store
+docs/DB_Schema.md'deki tabloları izleyen kalıcı repository (WAL modu, bağlantı havuzu)
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Optional, List, Tuple
+from data.project_repository import ProjectRepository, ProjectKey, VersionConflict
+from data.table_patch import apply_table_patch, touched_tables
+
+
+SCHEMA = """
+create table if not exists projects (
+  id text primary key,
+  user_id text not null,
+  template_id text not null,
+  template_name text not null,
+  title text not null,
+  applicant_name text default '',
+  research_title text default '',
+  advisor_name text default '',
+  institution text default '',
+  keywords text default '',
+  importance_and_quality text default '',
+  aims_and_objectives text default '',
+  version int not null default 1,
+  created_at text not null,
+  updated_at text not null
+);
+create index if not exists projects_user_created_idx on projects(user_id, created_at, id);
+
+create table if not exists project_work_schedule (
+  id text not null,
+  project_id text not null references projects(id) on delete cascade,
+  date_range text,
+  activities text,
+  responsible text,
+  success_criteria_contribution text,
+  order_index int default 0
+);
+create index if not exists project_work_schedule_project_idx on project_work_schedule(project_id, order_index);
+
+create table if not exists project_risk_management (
+  id text not null,
+  project_id text not null references projects(id) on delete cascade,
+  risk text,
+  countermeasure text,
+  order_index int default 0
+);
+create index if not exists project_risk_management_project_idx on project_risk_management(project_id, order_index);
+
+create table if not exists project_research_facilities (
+  id text not null,
+  project_id text not null references projects(id) on delete cascade,
+  equipment_type_model text,
+  project_usage text,
+  order_index int default 0
+);
+create index if not exists project_research_facilities_project_idx on project_research_facilities(project_id, order_index);
+
+create table if not exists project_wide_impact (
+  id text not null,
+  project_id text not null references projects(id) on delete cascade,
+  category text not null,
+  category_description text,
+  outputs text,
+  order_index int default 0
+);
+create index if not exists project_wide_impact_project_idx on project_wide_impact(project_id, order_index);
+
+create table if not exists sections (
+  id text primary key,
+  project_id text not null references projects(id) on delete cascade,
+  title text not null,
+  order_index int not null,
+  draft_content text default '',
+  final_content text,
+  version int not null default 1,
+  created_at text not null,
+  updated_at text not null,
+  unique(project_id, order_index)
+);
+
+-- Readiness probe'unun yazıp geri okuduğu tek satır
+create table if not exists store_probe (
+  id int primary key,
+  token text not null
+);
+"""
+
+# Sorgular sabit string olarak tutulur; sqlite3 her bağlantıda prepared
+# statement cache'i kullandığı için tekrar derlenmezler
+SELECT_PROJECT = "select * from projects where id = ?"
+SELECT_PROJECT_OWNER = "select user_id, version from projects where id = ?"
+SELECT_SECTIONS = "select * from sections where project_id = ? order by order_index"
+SELECT_SECTION = "select * from sections where id = ?"
+SELECT_SECTION_PROJECT_ID = "select project_id from sections where id = ?"
+SELECT_SECTION_VERSION = "select project_id, version from sections where id = ?"
+SUM_SECTION_VERSIONS = "select coalesce(sum(version), 0) from sections where project_id = ?"
+COUNT_USER_PROJECTS = "select count(*) from projects where user_id = ?"
+DELETE_PROJECT = "delete from projects where id = ? and user_id = ?"
+TOUCH_PROJECT = "update projects set version = version + 1, updated_at = ? where id = ?"
+WRITE_PROBE = "insert or replace into store_probe (id, token) values (1, ?)"
+READ_PROBE = "select token from store_probe where id = 1"
+
+SUMMARY_COLUMNS = "id, user_id, template_id, template_name, title, created_at, updated_at"
+LIST_USER_PROJECTS_ASC = (
+    f"select {SUMMARY_COLUMNS} from projects where user_id = ? "
+    "order by created_at, id limit ? offset ?"
+)
+LIST_USER_PROJECTS_ASC_AFTER = (
+    f"select {SUMMARY_COLUMNS} from projects where user_id = ? and (created_at, id) > (?, ?) "
+    "order by created_at, id limit ? offset ?"
+)
+LIST_USER_PROJECTS_DESC = (
+    f"select {SUMMARY_COLUMNS} from projects where user_id = ? "
+    "order by created_at desc, id desc limit ? offset ?"
+)
+LIST_USER_PROJECTS_DESC_AFTER = (
+    f"select {SUMMARY_COLUMNS} from projects where user_id = ? and (created_at, id) < (?, ?) "
+    "order by created_at desc, id desc limit ? offset ?"
+)
+
+INSERT_PROJECT = """
+insert into projects (
+  id, user_id, template_id, template_name, title,
+  applicant_name, research_title, advisor_name, institution, keywords,
+  importance_and_quality, aims_and_objectives, version, created_at, updated_at
+) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_SECTION = """
+insert into sections (id, project_id, title, order_index, draft_content, final_content, version, created_at, updated_at)
+values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# version sütunu sonradan eklendi; eski veritabanları açılışta güncellenir
+VERSION_COLUMN_TABLES = ("projects", "sections")
+
+# Proje tabloları: (tablo, sütunlar)
+TABLE_COLUMNS = {
+    "work_schedule": ("project_work_schedule", ("id", "date_range", "activities", "responsible", "success_criteria_contribution")),
+    "risk_management": ("project_risk_management", ("id", "risk", "countermeasure")),
+    "research_facilities": ("project_research_facilities", ("id", "equipment_type_model", "project_usage")),
+    "wide_impact": ("project_wide_impact", ("id", "category", "category_description", "outputs")),
+}
+
+
+def _table_queries(table: str, columns: tuple) -> dict:
+    column_list = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+    assignments = ", ".join(f"{column} = ?" for column in columns if column != "id")
+    return {
+        "select": f"select {column_list} from {table} where project_id = ? order by order_index",
+        "delete": f"delete from {table} where project_id = ?",
+        "insert": f"insert into {table} (project_id, order_index, {column_list}) values ({placeholders})",
+        "update_row": f"update {table} set order_index = ?, {assignments} where project_id = ? and id = ?",
+        "delete_row": f"delete from {table} where project_id = ? and id = ?",
+    }
+
+
+TABLE_QUERIES = {name: _table_queries(table, columns) for name, (table, columns) in TABLE_COLUMNS.items()}
+
+# Üst seviye alanların projects tablosundaki karşılıkları
+SCALAR_FIELDS = {
+    "title": ("title",),
+    "keywords": ("keywords",),
+    "updated_at": ("updated_at",),
+}
+NESTED_FIELDS = {
+    "general_info": ("applicant_name", "research_title", "advisor_name", "institution"),
+    "scientific_merit": ("importance_and_quality", "aims_and_objectives"),
+}
+SECTION_FIELDS = ("draft_content", "final_content", "updated_at")
+
+
+class SQLiteProjectStore(ProjectRepository):
+    """
+    Projeleri SQLite veritabanında saklar
+    
+    - WAL modu: okuyucular yazıcıyı beklemez, birden fazla uvicorn worker
+      aynı dosyayı paylaşabilir
+    - Bağlantı havuzu: her istek hazır bir bağlantı alır, prepared statement
+      cache'i bağlantıyla birlikte yeniden kullanılır
+    - Yazmalar `BEGIN IMMEDIATE` ile başlar; worker'lar arası yazma kilidi
+      işlem başında alınır
+    """
+    
+    def __init__(self, path: str, pool_size: int = 5):
+        self.path = path
+        # ":memory:" her bağlantıda ayrı veritabanı demektir, tek bağlantı kullanılmalı
+        self.pool_size = 1 if path == ":memory:" else max(1, pool_size)
+        
+        directory = os.path.dirname(os.path.abspath(path)) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+    
+    # --- Okuma ---
+    
+    def get(self, project_id: str) -> Optional[dict]:
+        """Projeyi tüm bölüm ve tablolarıyla getirir"""
+        with self._snapshot() as conn:
+            return self._load_project(conn, project_id)
+    
+    def find_section(self, section_id: str) -> Tuple[Optional[dict], Optional[dict]]:
+        """Section'ı ve ait olduğu projeyi bulur"""
+        with self._snapshot() as conn:
+            row = conn.execute(SELECT_SECTION_PROJECT_ID, (section_id,)).fetchone()
+            if row is None:
+                return None, None
+            
+            project = self._load_project(conn, row["project_id"])
+        
+        if project is None:
+            return None, None
+        for section in project["sections"]:
+            if section["id"] == section_id:
+                return project, section
+        return None, None
+    
+    def list_user_projects(
+        self,
+        user_id: str,
+        limit: int,
+        offset: int = 0,
+        after: Optional[ProjectKey] = None,
+        descending: bool = False
+    ) -> List[dict]:
+        """Kullanıcının projelerini (created_at, id) sırasıyla özet olarak döndürür"""
+        if after:
+            query = LIST_USER_PROJECTS_DESC_AFTER if descending else LIST_USER_PROJECTS_ASC_AFTER
+            params = (user_id, after[0], after[1], limit, offset)
+        else:
+            query = LIST_USER_PROJECTS_DESC if descending else LIST_USER_PROJECTS_ASC
+            params = (user_id, limit, offset)
+        
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+    
+    def count_user_projects(self, user_id: str) -> int:
+        """Kullanıcının proje sayısını döndürür"""
+        with self._connection() as conn:
+            return conn.execute(COUNT_USER_PROJECTS, (user_id,)).fetchone()[0]
+    
+    # --- Yazma ---
+    
+    def add(self, project: dict):
+        """Yeni projeyi bölümleri ve tablolarıyla tek transaction'da kaydeder"""
+        general_info = project.get("general_info", {})
+        scientific_merit = project.get("scientific_merit", {})
+        
+        with self._transaction() as conn:
+            conn.execute(INSERT_PROJECT, (
+                project["id"],
+                project["user_id"],
+                project["template_id"],
+                project["template_name"],
+                project["title"],
+                general_info.get("applicant_name", ""),
+                general_info.get("research_title", ""),
+                general_info.get("advisor_name", ""),
+                general_info.get("institution", ""),
+                project.get("keywords", ""),
+                scientific_merit.get("importance_and_quality", ""),
+                scientific_merit.get("aims_and_objectives", ""),
+                project.get("version", 1),
+                project["created_at"],
+                project["updated_at"],
+            ))
+            
+            conn.executemany(INSERT_SECTION, [
+                (
+                    section["id"],
+                    project["id"],
+                    section["title"],
+                    section["order"],
+                    section.get("draft_content", ""),
+                    section.get("final_content"),
+                    section.get("version", 1),
+                    section["created_at"],
+                    section["updated_at"],
+                )
+                for section in project.get("sections", [])
+            ])
+            
+            project_management = project.get("project_management", {})
+            for name in ("work_schedule", "risk_management", "research_facilities"):
+                self._replace_table_rows(conn, project["id"], name, project_management.get(name, []))
+            self._replace_table_rows(conn, project["id"], "wide_impact", project.get("wide_impact", []))
+    
+    def update_project(
+        self,
+        project_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Projenin üst seviye alanlarını günceller, sürümü artırır"""
+        assignments = ["version = version + 1"]
+        values = []
+        for field, value in fields.items():
+            if field in SCALAR_FIELDS:
+                assignments.append(f"{field} = ?")
+                values.append(value)
+            elif field in NESTED_FIELDS:
+                for column in NESTED_FIELDS[field]:
+                    assignments.append(f"{column} = ?")
+                    values.append(value.get(column, ""))
+        
+        with self._transaction() as conn:
+            owner = conn.execute(SELECT_PROJECT_OWNER, (project_id,)).fetchone()
+            if owner is None or owner["user_id"] != user_id:
+                return None
+            if expected_version is not None and expected_version != owner["version"]:
+                raise VersionConflict(
+                    owner["version"], conn.execute(SUM_SECTION_VERSIONS, (project_id,)).fetchone()[0]
+                )
+            
+            conn.execute(
+                f"update projects set {', '.join(assignments)} where id = ?",
+                (*values, project_id)
+            )
+            
+            if "project_management" in fields:
+                for name in ("work_schedule", "risk_management", "research_facilities"):
+                    self._replace_table_rows(conn, project_id, name, fields["project_management"].get(name, []))
+            if "wide_impact" in fields:
+                self._replace_table_rows(conn, project_id, "wide_impact", fields["wide_impact"])
+            sections_version = conn.execute(SUM_SECTION_VERSIONS, (project_id,)).fetchone()[0]
+        return {"version": owner["version"] + 1, "sections_version": sections_version}
+    
+    def update_section(
+        self,
+        section_id: str,
+        user_id: str,
+        fields: dict,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Section alanlarını günceller, section sürümünü artırır"""
+        columns = [field for field in SECTION_FIELDS if field in fields]
+        assignments = ["version = version + 1", *(f"{c} = ?" for c in columns)]
+        
+        with self._transaction() as conn:
+            row = conn.execute(SELECT_SECTION_VERSION, (section_id,)).fetchone()
+            if row is None:
+                return None
+            owner = conn.execute(SELECT_PROJECT_OWNER, (row["project_id"],)).fetchone()
+            if owner is None or owner["user_id"] != user_id:
+                return None
+            if expected_version is not None and expected_version != row["version"]:
+                raise VersionConflict(row["version"])
+            
+            conn.execute(
+                f"update sections set {', '.join(assignments)} where id = ?",
+                (*[fields[c] for c in columns], section_id)
+            )
+            section_row = conn.execute(SELECT_SECTION, (section_id,)).fetchone()
+        return self._section_from_row(section_row)
+    
+    def patch_tables(
+        self,
+        project_id: str,
+        user_id: str,
+        operations: List[dict],
+        updated_at: str,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """Tablo patch'ini uygular; yalnızca değişen satırlar yazılır"""
+        with self._transaction() as conn:
+            owner = conn.execute(SELECT_PROJECT_OWNER, (project_id,)).fetchone()
+            if owner is None or owner["user_id"] != user_id:
+                return None
+            if expected_version is not None and expected_version != owner["version"]:
+                raise VersionConflict(
+                    owner["version"], conn.execute(SUM_SECTION_VERSIONS, (project_id,)).fetchone()[0]
+                )
+            
+            current = {table: self._load_table_rows(conn, project_id, table) for table in touched_tables(operations)}
+            tables = apply_table_patch(current, operations)
+            for table, rows in tables.items():
+                self._sync_table_rows(conn, project_id, table, current[table], rows)
+            conn.execute(TOUCH_PROJECT, (updated_at, project_id))
+            sections_version = conn.execute(SUM_SECTION_VERSIONS, (project_id,)).fetchone()[0]
+        return {"version": owner["version"] + 1, "sections_version": sections_version, "tables": tables}
+    
+    def delete(self, project_id: str, user_id: str) -> bool:
+        """Projeyi siler (bağlı kayıtlar cascade ile silinir)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(DELETE_PROJECT, (project_id, user_id))
+            return cursor.rowcount > 0
+    
+    def ping(self):
+        """Probe satırını yazar ve geri okur (yazma kilidi ve disk erişimi birlikte denenir)"""
+        token = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(WRITE_PROBE, (token,))
+            row = conn.execute(READ_PROBE).fetchone()
+        if row is None or row["token"] != token:
+            raise RuntimeError("Store probe satırı geri okunamadı")
+    
+    def close(self):
+        """Havuzdaki tüm bağlantıları kapatır"""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._pool = queue.Queue()
+    
+    # --- Yardımcılar ---
+    
+    def _new_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # Transaction'ları biz yönetiyoruz
+            check_same_thread=False,
+            cached_statements=256,
+            timeout=30,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("pragma journal_mode = wal")
+        conn.execute("pragma synchronous = normal")
+        conn.execute("pragma foreign_keys = on")
+        conn.execute("pragma busy_timeout = 30000")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = len(self._connections) < self.pool_size
+                if can_open:
+                    conn = self._new_connection()
+                    self._connections.append(conn)
+            if not can_open:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    @contextmanager
+    def _transaction(self):
+        with self._connection() as conn:
+            conn.execute("begin immediate")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("rollback")
+                raise
+            conn.execute("commit")
+    
+    @contextmanager
+    def _snapshot(self):
+        # Proje, tablolar ve bölümler ayrı sorgularla okunur; deferred
+        # transaction hepsinin aynı WAL anlık görüntüsünden gelmesini sağlar
+        # ve yazma kilidi almaz
+        with self._connection() as conn:
+            conn.execute("begin")
+            try:
+                yield conn
+            finally:
+                conn.execute("commit")
+    
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        for table in VERSION_COLUMN_TABLES:
+            columns = {row["name"] for row in conn.execute(f"pragma table_info({table})")}
+            if "version" not in columns:
+                conn.execute(f"alter table {table} add column version int not null default 1")
+    
+    def _replace_table_rows(self, conn: sqlite3.Connection, project_id: str, name: str, rows: list):
+        _, columns = TABLE_COLUMNS[name]
+        queries = TABLE_QUERIES[name]
+        conn.execute(queries["delete"], (project_id,))
+        conn.executemany(queries["insert"], [
+            (project_id, index, *[row.get(column, "") for column in columns])
+            for index, row in enumerate(rows)
+        ])
+    
+    def _load_table_rows(self, conn: sqlite3.Connection, project_id: str, name: str) -> List[dict]:
+        _, columns = TABLE_COLUMNS[name]
+        return [dict(zip(columns, row)) for row in conn.execute(TABLE_QUERIES[name]["select"], (project_id,))]
+    
+    def _sync_table_rows(self, conn: sqlite3.Connection, project_id: str, name: str, old_rows: list, new_rows: list):
+        old_positions = {row["id"]: (index, row) for index, row in enumerate(old_rows)}
+        if len(old_positions) != len(old_rows):
+            # Eski tam-liste PATCH'lerinden kalma tekrarlı id'ler: satır bazlı yazılamaz
+            self._replace_table_rows(conn, project_id, name, new_rows)
+            return
+        
+        _, columns = TABLE_COLUMNS[name]
+        value_columns = [column for column in columns if column != "id"]
+        queries = TABLE_QUERIES[name]
+        new_ids = {row["id"] for row in new_rows}
+        
+        conn.executemany(queries["delete_row"], [
+            (project_id, row_id) for row_id in old_positions if row_id not in new_ids
+        ])
+        for index, row in enumerate(new_rows):
+            previous = old_positions.get(row["id"])
+            if previous is None:
+                conn.execute(queries["insert"], (project_id, index, *[row.get(column, "") for column in columns]))
+            elif previous != (index, row):
+                conn.execute(queries["update_row"], (
+                    index, *[row.get(column, "") for column in value_columns], project_id, row["id"]
+                ))
+    
+    def _load_project(self, conn: sqlite3.Connection, project_id: str) -> Optional[dict]:
+        row = conn.execute(SELECT_PROJECT, (project_id,)).fetchone()
+        if row is None:
+            return None
+        
+        tables = {name: self._load_table_rows(conn, project_id, name) for name in TABLE_COLUMNS}
+        
+        return {
+            "id": row["id"],
+            "user_id": row["user_id"],
+            "template_id": row["template_id"],
+            "template_name": row["template_name"],
+            "title": row["title"],
+            "version": row["version"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "general_info": {column: row[column] for column in NESTED_FIELDS["general_info"]},
+            "keywords": row["keywords"],
+            "scientific_merit": {column: row[column] for column in NESTED_FIELDS["scientific_merit"]},
+            "project_management": {
+                "work_schedule": tables["work_schedule"],
+                "risk_management": tables["risk_management"],
+                "research_facilities": tables["research_facilities"],
+            },
+            "wide_impact": tables["wide_impact"],
+            "sections": [
+                self._section_from_row(section_row)
+                for section_row in conn.execute(SELECT_SECTIONS, (project_id,))
+            ],
+        }
+    
+    @staticmethod
+    def _section_from_row(row: sqlite3.Row) -> dict:
+        return {
+            "id": row["id"],
+            "project_id": row["project_id"],
+            "title": row["title"],
+            "order": row["order_index"],
+            "draft_content": row["draft_content"],
+            "final_content": row["final_content"],
+            "version": row["version"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
@@ -0,0 +1,167 @@
+"""
+SQLite revision store
+docs/DB_Schema.md'deki section_revisions tablosunu delta/snapshot kayıtlarıyla tutar
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List
+from data.revision_store import RevisionStore
+
+
+SCHEMA = """
+create table if not exists section_revisions (
+  id text primary key,
+  section_id text not null,
+  project_id text not null,
+  revision_number int not null,
+  kind text not null,
+  payload blob not null,
+  created_at text not null,
+  unique(section_id, revision_number)
+);
+create index if not exists section_revisions_snapshot_idx
+  on section_revisions(section_id, revision_number) where kind = 'snapshot';
+create index if not exists section_revisions_project_idx on section_revisions(project_id);
+"""
+
+COUNT_REVISIONS = "select coalesce(max(revision_number), 0) from section_revisions where section_id = ?"
+SELECT_SNAPSHOT_AT_OR_BEFORE = (
+    "select max(revision_number) from section_revisions "
+    "where section_id = ? and kind = 'snapshot' and revision_number <= ?"
+)
+SELECT_RECORDS = (
+    "select id, section_id, project_id, revision_number, kind, payload, created_at "
+    "from section_revisions where section_id = ? and revision_number between ? and ? "
+    "order by revision_number"
+)
+INSERT_RECORD = """
+insert into section_revisions (id, section_id, project_id, revision_number, kind, payload, created_at)
+values (?, ?, ?, ?, ?, ?, ?)
+"""
+DELETE_PROJECT_REVISIONS = "delete from section_revisions where project_id = ?"
+
+
+class SQLiteRevisionStore(RevisionStore):
+    """
+    Revizyonları SQLite'ta saklar (SQLiteProjectStore ile aynı dosya olabilir)
+    
+    Snapshot araması kısmi index üzerinde tek bir seek'tir. Yazmalar
+    `BEGIN IMMEDIATE` ile başlar; aynı bölüme iki worker'ın aynı numarayı
+    vermesi engellenir. Ekleme sırasında okumalar aynı transaction
+    bağlantısından yapılır.
+    """
+    
+    def __init__(self, path: str, pool_size: int = 5, snapshot_interval: int = 16):
+        super().__init__(snapshot_interval)
+        self.path = path
+        self.pool_size = 1 if path == ":memory:" else max(1, pool_size)
+        
+        directory = os.path.dirname(os.path.abspath(path)) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        # append sırasında transaction bağlantısı (thread başına)
+        self._local = threading.local()
+        
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+    
+    def count(self, section_id: str) -> int:
+        with self._connection() as conn:
+            return conn.execute(COUNT_REVISIONS, (section_id,)).fetchone()[0]
+    
+    def delete_project(self, project_id: str):
+        with self._connection() as conn:
+            conn.execute("begin immediate")
+            conn.execute(DELETE_PROJECT_REVISIONS, (project_id,))
+            conn.execute("commit")
+    
+    def close(self):
+        """Havuzdaki tüm bağlantıları kapatır"""
+        with self._pool_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._pool = queue.Queue()
+    
+    # --- Primitive'ler ---
+    
+    @contextmanager
+    def _append_lock(self, section_id: str):
+        with self._connection() as conn:
+            conn.execute("begin immediate")
+            self._local.conn = conn
+            try:
+                yield conn.execute(COUNT_REVISIONS, (section_id,)).fetchone()[0]
+            except Exception:
+                conn.execute("rollback")
+                raise
+            finally:
+                self._local.conn = None
+            conn.execute("commit")
+    
+    def _snapshot_at_or_before(self, section_id: str, revision_number: int) -> int:
+        with self._connection() as conn:
+            return conn.execute(SELECT_SNAPSHOT_AT_OR_BEFORE, (section_id, revision_number)).fetchone()[0]
+    
+    def _records(self, section_id: str, first: int, last: int) -> List[dict]:
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(SELECT_RECORDS, (section_id, first, last))]
+    
+    def _insert(self, record: dict):
+        with self._connection() as conn:
+            conn.execute(INSERT_RECORD, (
+                record["id"],
+                record["section_id"],
+                record["project_id"],
+                record["revision_number"],
+                record["kind"],
+                record["payload"],
+                record["created_at"],
+            ))
+    
+    # --- Yardımcılar ---
+    
+    def _new_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # Transaction'ları biz yönetiyoruz
+            check_same_thread=False,
+            cached_statements=256,
+            timeout=30,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("pragma journal_mode = wal")
+        conn.execute("pragma synchronous = normal")
+        conn.execute("pragma busy_timeout = 30000")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        # append içindeyken aynı transaction bağlantısı kullanılır
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = len(self._connections) < self.pool_size
+                if can_open:
+                    conn = self._new_connection()
+                    self._connections.append(conn)
+            if not can_open:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
@@ -0,0 +1,103 @@
+"""
+Proje tablosu patch'i
+Satır id'siyle adreslenen add/remove/replace/move/test işlemlerini tablolara uygular
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+# Proje yönetimi altındaki tablolar (wide_impact üst seviyededir)
+PROJECT_MANAGEMENT_TABLES = ("work_schedule", "risk_management", "research_facilities")
+
+
+class TablePatchConflict(Exception):
+    """Patch tablonun güncel haline uygulanamıyorsa (satır yok, id çakışması, test başarısız)"""
+
+
+def get_table(project: dict, table: str) -> List[dict]:
+    """Projedeki tablonun satırları"""
+    if table in PROJECT_MANAGEMENT_TABLES:
+        return project.get("project_management", {}).get(table, [])
+    return project.get(table, [])
+
+
+def touched_tables(operations: Iterable[dict]) -> List[str]:
+    """İşlemlerin değiştirdiği tablolar (ilk geçiş sırasıyla)"""
+    return list(dict.fromkeys(operation["table"] for operation in operations))
+
+
+def _find_row(rows: List[dict], row_id: str) -> Optional[int]:
+    # Tablolar birkaç düzine satırdır; doğrusal arama index tutmaktan ucuz
+    for index, row in enumerate(rows):
+        if row.get("id") == row_id:
+            return index
+    return None
+
+
+def _require_row(rows: List[dict], table: str, row_id: str) -> int:
+    index = _find_row(rows, row_id)
+    if index is None:
+        raise TablePatchConflict(f"'{table}' tablosunda '{row_id}' satırı yok")
+    return index
+
+
+def _insert_position(rows: List[dict], table: str, before: str) -> int:
+    return len(rows) if before == "-" else _require_row(rows, table, before)
+
+
+def apply_table_patch(tables: Dict[str, List[dict]], operations: List[dict]) -> Dict[str, List[dict]]:
+    """
+    İşlemleri sırayla uygular; ya hepsi uygulanır ya hiçbiri
+    
+    Girdi listeleri ve satırlar değiştirilmez: değişen tablo kopyalanır,
+    değişen satır yeni dict olarak yazılır (copy-on-write). Böylece
+    hata durumunda geri alınacak bir şey kalmaz.
+    
+    Args:
+        tables: Tablo adı -> güncel satırlar (touched_tables'daki tablolar)
+        operations: TablePatchOperation.to_operation() çıktıları
+    
+    Returns:
+        Dict[str, List[dict]]: Değişen tabloların yeni satırları
+    
+    Raises:
+        TablePatchConflict: İşlem tablonun güncel haline uygulanamazsa
+    """
+    result: Dict[str, List[dict]] = {}
+    
+    for operation in operations:
+        table = operation["table"]
+        if table not in result:
+            result[table] = list(tables.get(table, []))
+        rows = result[table]
+        op, row_id, field = operation["op"], operation["row_id"], operation["field"]
+        
+        if op == "add":
+            row = operation["value"]
+            if _find_row(rows, row["id"]) is not None:
+                raise TablePatchConflict(f"'{table}' tablosunda '{row['id']}' satırı zaten var")
+            rows.insert(_insert_position(rows, table, operation["before"]), dict(row))
+        
+        elif op == "remove":
+            del rows[_require_row(rows, table, row_id)]
+        
+        elif op == "replace":
+            index = _require_row(rows, table, row_id)
+            if field is None:
+                rows[index] = dict(operation["value"])
+            else:
+                rows[index] = {**rows[index], field: operation["value"]}
+        
+        elif op == "move":
+            row = rows.pop(_require_row(rows, table, row_id))
+            if operation["before"] == row_id:
+                raise TablePatchConflict(f"'{row_id}' satırı kendi önüne taşınamaz")
+            rows.insert(_insert_position(rows, table, operation["before"]), row)
+        
+        elif op == "test":
+            row = rows[_require_row(rows, table, row_id)]
+            actual = row.get(field) if field is not None else row
+            if actual != operation["value"]:
+                target = f"{row_id}/{field}" if field is not None else row_id
+                raise TablePatchConflict(f"test başarısız: '{table}/{target}' beklenen değerde değil")
+    
+    return result
@@ -0,0 +1,119 @@
+"""
+Şablon kayıt defteri
+Şablonlar uygulama açılışında bir kez dondurulur ve indekslenir; şablon
+okuyan her yer (router'lar, AI üretimi, export) aynı kayıtları kullanır
+"""
+
+import hashlib
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from data.mock_templates import MOCK_TEMPLATES
+from utils.responses import dumps
+
+NO_LIMITS: Mapping[str, int] = MappingProxyType({"min": 0, "max": 0})
+
+
+def _freeze(value: Any) -> Any:
+    # dict -> salt okunur mapping, list -> tuple (iç içe)
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+class TemplateRegistry:
+    """
+    Dondurulmuş ve indekslenmiş şablonlar
+    
+    Şablonlar salt okunurdur (MappingProxyType / tuple); yanlışlıkla
+    değiştirilmeleri TypeError verir. Liste ve tekil şablon yanıtlarının
+    JSON gövdeleri ve ETag'leri kurulurken bir kez hesaplanır.
+    
+    Attributes:
+        body: GET /templates yanıt gövdesi
+        etag: body'nin güçlü ETag'i
+    """
+    
+    def __init__(self, templates: List[dict]):
+        self._templates: Tuple[Mapping[str, Any], ...] = tuple(_freeze(template) for template in templates)
+        self._by_id: Dict[str, Mapping[str, Any]] = {}
+        self._sections: Dict[Tuple[str, str], Mapping[str, Any]] = {}
+        self._sections_by_order: Dict[Tuple[str, int], Mapping[str, Any]] = {}
+        self._limits: Dict[Tuple[str, str], Mapping[str, int]] = {}
+        self._bodies: Dict[str, Tuple[bytes, str]] = {}
+        
+        for source, template in zip(templates, self._templates):
+            template_id = template["id"]
+            if template_id in self._by_id:
+                raise ValueError(f"'{template_id}' ID'li şablon birden fazla tanımlı")
+            self._by_id[template_id] = template
+            for section in template["sections"]:
+                self._sections[(template_id, section["title"])] = section
+                self._sections_by_order[(template_id, section["order"])] = section
+                self._limits[(template_id, section["title"])] = MappingProxyType(
+                    {"min": section["min_words"], "max": section["max_words"]}
+                )
+            body = dumps(source)
+            self._bodies[template_id] = (body, _strong_etag(body))
+        
+        self.body = dumps(templates)
+        self.etag = _strong_etag(self.body)
+    
+    def all(self) -> Tuple[Mapping[str, Any], ...]:
+        """Tüm şablonlar (tanım sırasıyla)"""
+        return self._templates
+    
+    def get(self, template_id: str) -> Optional[Mapping[str, Any]]:
+        """Şablonu ID ile döndürür veya None if not found"""
+        return self._by_id.get(template_id)
+    
+    def template_body(self, template_id: str) -> Optional[Tuple[bytes, str]]:
+        """Tekil şablonun (JSON gövdesi, ETag) çifti veya None if not found"""
+        return self._bodies.get(template_id)
+    
+    def section(self, template_id: str, title: str) -> Optional[Mapping[str, Any]]:
+        """Şablondaki bölüm tanımı (başlığa göre)"""
+        return self._sections.get((template_id, title))
+    
+    def section_at(self, template_id: str, order: int) -> Optional[Mapping[str, Any]]:
+        """Şablondaki bölüm tanımı (sıraya göre)"""
+        return self._sections_by_order.get((template_id, order))
+    
+    def section_titles(self, template_id: str) -> List[str]:
+        """Şablonun bölüm başlıkları (sırayla); şablon yoksa boş liste"""
+        template = self._by_id.get(template_id)
+        if template is None:
+            return []
+        return [section["title"] for section in template["sections"]]
+    
+    def section_limits(self, template_id: str, title: str) -> Mapping[str, int]:
+        """
+        Bölümün min/max kelime limitleri
+        
+        Returns:
+            Mapping: {"min": int, "max": int}; bölüm şablonda yoksa ikisi de 0 (limitsiz)
+        """
+        return self._limits.get((template_id, title), NO_LIMITS)
+
+
+template_registry = TemplateRegistry(MOCK_TEMPLATES)
+
+
+def get_all_templates() -> Tuple[Mapping[str, Any], ...]:
+    """Tüm şablonları döndürür"""
+    return template_registry.all()
+
+
+def get_template_by_id(template_id: str) -> Optional[Mapping[str, Any]]:
+    """Belirli bir şablonu ID'ye göre döndürür"""
+    return template_registry.get(template_id)
+
+
+def get_section_limits(template_id: str, section_title: str) -> Mapping[str, int]:
+    """Şablondaki bölüm tanımından min/max kelime limitlerini döndürür"""
+    return template_registry.section_limits(template_id, section_title)
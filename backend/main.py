@@ -3,12 +3,25 @@ AkademikForm API - FastAPI Backend
 AI Destekli Akademik Doküman Editörü
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 # Routers
-from routers import health, templates, projects, sections, debug, ai
+from routers import health, templates, projects, sections, debug, ai, export
+from services.gemini import shutdown_executor, start_model_warmup
+from services.generation_jobs import cancel_all_jobs
+from services.docx_export import compile_export_templates
+from services.export_jobs import start_export_pool, shutdown_exports
+from services.autosave import draft_coalescer
+from services.ai_resilience import set_request_deadline
+from services.ai_rate_limiter import set_current_user
+from services.metrics import MetricsMiddleware
+from services.readiness import readiness_monitor
+from services.loop_watchdog import loop_watchdog
+from data.mock_projects import get_mock_user_id
+from config.settings import settings
 
 app = FastAPI(
     title="AkademikForm API",
@@ -53,9 +66,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # GET, POST, PUT, DELETE, PATCH, vb.
     allow_headers=["*"],  # Content-Type, Authorization, vb.
+    expose_headers=["ETag", "X-Draft-Not-Saved"],  # Tarayıcıdaki istemci okuyabilsin
 )
 
 
+@app.middleware("http")
+async def ai_request_context_middleware(request: Request, call_next):
+    """
+    İsteğin AI çağrıları için süre sınırını ve kota sahibini belirler
+    
+    İstemci `X-Request-Timeout` (saniye) header'ı ile daha kısa bir süre
+    isteyebilir; üst sınır AI_REQUEST_TIMEOUT_SECONDS'tır. Süre dolarsa
+    Gemini beklenmeden 504 döner. Kota kuyruğu kullanıcı bazında adil
+    dağıtıldığı için isteğin kullanıcısı da burada atanır.
+    """
+    timeout = settings.AI_REQUEST_TIMEOUT_SECONDS
+    header_value = request.headers.get("x-request-timeout")
+    if header_value:
+        try:
+            timeout = min(max(float(header_value), 0.0), timeout)
+        except ValueError:
+            pass
+    set_request_deadline(timeout)
+    # Auth eklendiğinde token'daki kullanıcı ID'si kullanılacak
+    set_current_user(get_mock_user_id())
+    return await call_next(request)
+
+
+# En dışta: diğer middleware'ler dahil isteğin tüm süresini ölçer
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -83,6 +125,40 @@ async def health_check():
     }
 
 
+# Startup
+@app.on_event("startup")
+async def startup_event():
+    """
+    Uygulama açılışında arka plan işlerini başlatır.
+    Gemini modeli ağ gecikmesi startup'ı bekletmesin diye arka planda çözümlenir.
+    Export şablonları bir kez derlenir; export'lar yalnızca doldurma yapar.
+    Render process'leri de arka planda başlatılır.
+    Açıksa event loop bekçisi route'ları tanıyarak başlar.
+    """
+    if settings.GEMINI_WARMUP_ON_STARTUP:
+        start_model_warmup()
+    await run_in_threadpool(compile_export_templates)
+    start_export_pool()
+    readiness_monitor.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start(app.routes)
+
+
+# Shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Uygulama kapanırken arka plan kaynaklarını serbest bırakır.
+    Bekleyen taslaklar önce store'a yazılır.
+    """
+    await loop_watchdog.stop()
+    await readiness_monitor.stop()
+    await draft_coalescer.flush_all()
+    await cancel_all_jobs()
+    await shutdown_exports()
+    shutdown_executor()
+
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -106,6 +182,7 @@ app.include_router(templates.router)
 app.include_router(projects.router)
 app.include_router(sections.router)
 app.include_router(ai.router)  # Generic AI endpoint'leri
+app.include_router(export.router)
 app.include_router(debug.router)  # Debug endpoint'leri (sadece development için)
 
 
@@ -0,0 +1,13 @@
+"""
+Pydantic models for Export
+API_Contract.md'ye göre hazırlanmıştır.
+"""
+
+from pydantic import BaseModel, Field
+
+
+class ExportRequest(BaseModel):
+    """Export isteği"""
+    project_id: str
+    format: str = Field("docx", pattern="^docx$")  # PDF henüz yok
+    allow_incomplete: bool = False  # Tamamlanmamış bölümler için taslak kullanılır
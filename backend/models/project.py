@@ -3,9 +3,10 @@ Pydantic models for Project-related data structures
 API_Contract.md'ye göre hazırlanmıştır.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from typing import Any, Literal, Optional, List
 from datetime import datetime
+import uuid
 
 
 # --- Nested Models ---
@@ -70,6 +71,7 @@ class Section(BaseModel):
     order: int
     draft_content: str = ""
     final_content: Optional[str] = None
+    version: int = 1  # Her yazmada artar (If-Match / ETag)
     created_at: datetime
     updated_at: datetime
 
@@ -83,6 +85,7 @@ class Project(BaseModel):
     template_id: str
     template_name: str
     title: str
+    version: int = 1  # Proje alanlarının sürümü; bölümlerinki ayrı tutulur
     created_at: datetime
     updated_at: datetime
     general_info: GeneralInfo = Field(default_factory=GeneralInfo)
@@ -110,6 +113,7 @@ class ProjectList(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: Optional[str] = None  # Sonraki sayfa için cursor (yoksa son sayfa)
 
 
 # --- Request Models ---
@@ -155,3 +159,113 @@ class UpdateWideImpactRequest(BaseModel):
     """Geniş etki güncelleme request"""
     wide_impact: List[WideImpactRow]
 
+
+# Patch ile adreslenebilen tablolar: (satır modeli, yeni satır ID öneki)
+PATCHABLE_TABLES = {
+    "work_schedule": (WorkScheduleRow, "ws-"),
+    "risk_management": (RiskManagementRow, "rm-"),
+    "research_facilities": (ResearchFacilityRow, "rf-"),
+    "wide_impact": (WideImpactRow, "wi-"),
+}
+
+
+def parse_table_pointer(pointer: str):
+    """
+    "/<tablo>/<satır id>[/<alan>]" yolunu çözer (RFC 6901 kaçışlarıyla)
+    
+    Returns:
+        tuple: (tablo, satır id veya "-", alan veya None)
+    
+    Raises:
+        ValueError: Yol geçersizse
+    """
+    parts = pointer.split("/")
+    if len(parts) not in (3, 4) or parts[0] != "":
+        raise ValueError(f"Geçersiz path: '{pointer}' (beklenen: /<tablo>/<satır id>[/<alan>])")
+    parts = [part.replace("~1", "/").replace("~0", "~") for part in parts]
+    
+    table, row_id = parts[1], parts[2]
+    field = parts[3] if len(parts) == 4 else None
+    if table not in PATCHABLE_TABLES:
+        raise ValueError(f"Bilinmeyen tablo: '{table}'")
+    if not row_id:
+        raise ValueError(f"Satır id'si boş: '{pointer}'")
+    if field is not None and (field == "id" or field not in PATCHABLE_TABLES[table][0].model_fields):
+        raise ValueError(f"'{table}' tablosunda '{field}' alanı yok")
+    return table, row_id, field
+
+
+class TablePatchOperation(BaseModel):
+    """
+    Proje tablosu patch işlemi (RFC 6902; satırlar index yerine id ile adreslenir)
+    
+    - add: `/<tablo>/-` sona, `/<tablo>/<id>` o satırın önüne ekler (value: satır, id opsiyonel)
+    - remove: `/<tablo>/<id>` satırı siler
+    - replace: `/<tablo>/<id>/<alan>` tek hücreyi, `/<tablo>/<id>` tüm satırı değiştirir
+    - move: `from` satırını `path` satırının önüne (`-` ise sona) taşır
+    - test: hücre/satır value'ya eşit değilse patch'in tamamı uygulanmaz
+    
+    Yalnızca değişen hücre veya satır doğrulanır; tablonun geri kalanı gönderilmez.
+    """
+    op: Literal["add", "remove", "replace", "move", "test"]
+    path: str
+    from_: Optional[str] = Field(None, alias="from")
+    value: Any = None
+    
+    _operation: dict = PrivateAttr(default_factory=dict)
+    
+    @model_validator(mode="after")
+    def _normalize(self):
+        table, row_id, field = parse_table_pointer(self.path)
+        row_model, id_prefix = PATCHABLE_TABLES[table]
+        operation = {"op": self.op, "table": table, "row_id": row_id, "field": field}
+        
+        if row_id == "-" and self.op not in ("add", "move"):
+            raise ValueError(f"'{self.op}' işlemi '-' ile kullanılamaz")
+        if field is not None and self.op in ("add", "remove", "move"):
+            raise ValueError(f"'{self.op}' işlemi satır adresi bekler, alan değil")
+        
+        if self.op == "add":
+            if not isinstance(self.value, dict):
+                raise ValueError("Satır değeri nesne olmalı")
+            row = row_model.model_validate({"id": f"{id_prefix}{uuid.uuid4()}", **self.value})
+            operation["value"] = row.model_dump()
+        elif self.op in ("replace", "test") and field is not None:
+            if not isinstance(self.value, str):
+                raise ValueError(f"'{field}' alanı metin olmalı")
+            operation["value"] = self.value
+        elif self.op in ("replace", "test"):
+            if not isinstance(self.value, dict):
+                raise ValueError("Satır değeri nesne olmalı")
+            operation["value"] = row_model.model_validate({**self.value, "id": row_id}).model_dump()
+        elif self.op == "move":
+            if not self.from_:
+                raise ValueError("'move' işlemi 'from' bekler")
+            from_table, from_id, from_field = parse_table_pointer(self.from_)
+            if from_table != table or from_field is not None or from_id == "-":
+                raise ValueError("'move' aynı tablodaki bir satırı taşıyabilir")
+            operation["row_id"] = from_id
+            operation["before"] = row_id
+        
+        if self.op == "add":
+            operation["before"] = row_id
+        
+        self._operation = operation
+        return self
+    
+    def to_operation(self) -> dict:
+        """
+        Data katmanının uyguladığı normalize edilmiş işlem
+        
+        Returns:
+            dict: op, table, row_id, field, value, before (add/move)
+        """
+        return self._operation
+
+
+class GenerateAllRequest(BaseModel):
+    """Projenin tüm bölümleri için toplu AI üretimi request"""
+    style: str = "Akademik, bilimsel ve profesyonel"
+    additional_instructions: str = ""
+    concurrency: Optional[int] = Field(None, ge=1, description="Eşzamanlı üretim sayısı (sunucu üst sınırını aşamaz)")
+    use_cache: bool = True
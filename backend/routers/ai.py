@@ -7,7 +7,11 @@ Wide Impact, Scientific Merit gibi özel alanlar için kullanılır
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
-from services.gemini import generate_text, revise_text
+from services.gemini import generate_text, revise_text, stream_generate_text, stream_revise_text
+from services.ai_cache import ai_cache
+from services.ai_rate_limiter import ai_rate_limiter
+from services.ai_resilience import retry_after_header
+from utils.sse import sse_response
 
 
 router = APIRouter(prefix="/api/v1/ai", tags=["AI"])
@@ -21,6 +25,7 @@ class GenericGenerateRequest(BaseModel):
     style: str = "Akademik, bilimsel ve profesyonel"
     additional_instructions: str = ""
     context: Optional[Dict[str, Any]] = None  # Opsiyonel context bilgisi
+    use_cache: bool = True  # False: aynı istek için yeni öneri üret
 
 
 class GenericReviseRequest(BaseModel):
@@ -29,6 +34,7 @@ class GenericReviseRequest(BaseModel):
     revision_prompt: str
     style: str = "Akademik, bilimsel ve profesyonel"
     context: Optional[Dict[str, Any]] = None  # Opsiyonel context bilgisi
+    use_cache: bool = True  # False: aynı istek için yeni öneri üret
 
 
 # --- Response Models ---
@@ -38,6 +44,25 @@ class AIResponse(BaseModel):
     generated_content: str
 
 
+# --- Helper Functions ---
+
+def get_section_title_from_context(context: Optional[Dict[str, Any]]) -> str:
+    """
+    Context'teki field_type bilgisine göre prompt'ta kullanılacak başlığı döndürür
+    """
+    # Context bilgisinden field type al (varsa)
+    field_type = context.get("field_type", "") if context else ""
+    
+    if field_type == "scientific_merit_1_1":
+        return "Konunun Önemi ve Araştırma Önerisinin Bilimsel Niteliği"
+    if field_type == "scientific_merit_1_2":
+        return "Amaç ve Hedefler"
+    if field_type == "wide_impact":
+        category = context.get("category", "")
+        return f"Yaygın Etki - {category}"
+    return "Generic Content"
+
+
 # --- Endpoints ---
 
 @router.post("/generate", response_model=AIResponse)
@@ -71,20 +96,7 @@ async def generate_generic_ai(request: GenericGenerateRequest):
         }
     """
     try:
-        # Context bilgisinden field type al (varsa)
-        field_type = ""
-        if request.context:
-            field_type = request.context.get("field_type", "")
-            
-        # Section title için context bilgisini kullan
-        section_title = "Generic Content"
-        if field_type == "scientific_merit_1_1":
-            section_title = "Konunun Önemi ve Araştırma Önerisinin Bilimsel Niteliği"
-        elif field_type == "scientific_merit_1_2":
-            section_title = "Amaç ve Hedefler"
-        elif field_type == "wide_impact":
-            category = request.context.get("category", "") if request.context else ""
-            section_title = f"Yaygın Etki - {category}"
+        section_title = get_section_title_from_context(request.context)
         
         # AI metin üretimi
         result = await generate_text(
@@ -92,7 +104,8 @@ async def generate_generic_ai(request: GenericGenerateRequest):
             section_title=section_title,
             project_title="",
             style=request.style,
-            additional_instructions=request.additional_instructions
+            additional_instructions=request.additional_instructions,
+            use_cache=request.use_cache
         )
         
         # generate_text dict döndürüyor: {"generated_content": "..."}
@@ -101,7 +114,8 @@ async def generate_generic_ai(request: GenericGenerateRequest):
     except Exception as e:
         print(f"❌ Generic AI generation error: {e}")
         raise HTTPException(
-            status_code=500,
+            status_code=getattr(e, "status_code", 500),
+            headers=retry_after_header(e),
             detail=f"AI metin üretimi sırasında bir hata oluştu: {str(e)}"
         )
 
@@ -135,20 +149,7 @@ async def revise_generic_ai(request: GenericReviseRequest):
         }
     """
     try:
-        # Context bilgisinden field type al (varsa)
-        field_type = ""
-        if request.context:
-            field_type = request.context.get("field_type", "")
-            
-        # Section title için context bilgisini kullan
-        section_title = "Generic Content"
-        if field_type == "scientific_merit_1_1":
-            section_title = "Konunun Önemi ve Araştırma Önerisinin Bilimsel Niteliği"
-        elif field_type == "scientific_merit_1_2":
-            section_title = "Amaç ve Hedefler"
-        elif field_type == "wide_impact":
-            category = request.context.get("category", "") if request.context else ""
-            section_title = f"Yaygın Etki - {category}"
+        section_title = get_section_title_from_context(request.context)
         
         # AI metin revizyonu
         result = await revise_text(
@@ -156,7 +157,8 @@ async def revise_generic_ai(request: GenericReviseRequest):
             section_title=section_title,
             project_title="",
             revision_prompt=request.revision_prompt,
-            style=request.style
+            style=request.style,
+            use_cache=request.use_cache
         )
         
         # revise_text dict döndürüyor: {"generated_content": "..."}
@@ -165,10 +167,85 @@ async def revise_generic_ai(request: GenericReviseRequest):
     except Exception as e:
         print(f"❌ Generic AI revision error: {e}")
         raise HTTPException(
-            status_code=500,
+            status_code=getattr(e, "status_code", 500),
+            headers=retry_after_header(e),
             detail=f"AI metin revizyonu sırasında bir hata oluştu: {str(e)}"
         )
 
 
+@router.post("/generate/stream")
+async def stream_generic_ai(request: GenericGenerateRequest):
+    """
+    Generic AI metin üretimi (streaming)
+    
+    /generate ile aynı request'i alır, metni üretildikçe Server-Sent Events
+    olarak gönderir.
+    
+    Events:
+        chunk: {"delta": "..."} - temizlenmiş metin parçası
+        done: {"word_count": int} - üretim tamamlandı
+        error: {"error": "ai_generation_failed", "message": "..."}
+    """
+    chunks = stream_generate_text(
+        draft_content=request.content,
+        section_title=get_section_title_from_context(request.context),
+        project_title="",
+        style=request.style,
+        additional_instructions=request.additional_instructions,
+        use_cache=request.use_cache
+    )
+    return sse_response(chunks, error_code="ai_generation_failed")
+
+
+@router.post("/revise/stream")
+async def stream_revise_generic_ai(request: GenericReviseRequest):
+    """
+    Generic AI metin revizyonu (streaming)
+    
+    /revise ile aynı request'i alır, revize edilen metni Server-Sent Events
+    olarak gönderir (event formatı /generate/stream ile aynıdır).
+    """
+    chunks = stream_revise_text(
+        current_content=request.current_content,
+        revision_prompt=request.revision_prompt,
+        section_title=get_section_title_from_context(request.context),
+        project_title="",
+        style=request.style,
+        use_cache=request.use_cache
+    )
+    return sse_response(chunks, error_code="ai_revision_failed")
+
+
+@router.get("/cache")
+async def get_ai_cache_stats():
+    """
+    📊 AI yanıt cache'inin istatistiklerini döndürür
+    
+    Returns:
+        dict: Kayıt sayısı, byte kullanımı, hit/miss sayaçları
+    """
+    return ai_cache.stats()
+
+
+@router.get("/quota")
+async def get_ai_quota():
+    """
+    📈 AI kotasının güncel durumunu döndürür
+    
+    Returns:
+        dict: RPM/TPM limitleri ve kalan kota, kuyrukta bekleyen istekler,
+        kullanıcının son bir dakikadaki kullanımı
+    """
+    return await ai_rate_limiter.status()
 
 
+@router.delete("/cache", status_code=204)
+async def clear_ai_cache():
+    """
+    🧹 AI yanıt cache'ini temizler
+    
+    Returns:
+        None (204 No Content)
+    """
+    ai_cache.clear()
+    return None
@@ -3,40 +3,34 @@ Debug Router
 Geliştirme ve test için yardımcı endpoint'ler
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from typing import List, Dict, Any
-import google.generativeai as genai
 from config.settings import settings
+from services.model_registry import model_registry
+from services.ai_resilience import circuit_status
+from services.loop_watchdog import loop_watchdog
+from services.request_profiler import request_profiler
 
 router = APIRouter(prefix="/api/v1/debug", tags=["Debug"])
 
 
 @router.get("/models")
-async def list_available_models():
+async def list_available_models(
+    refresh: bool = Query(False, description="Cache'i atlayıp listeyi yeniden çek")
+):
     """
     🔍 Mevcut Gemini modellerini listeler
     
+    Liste model registry'de cache'lenir; `refresh=true` ile yenilenebilir.
+    
     Returns:
         dict: Mevcut modeller ve özellikleri
     """
     try:
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        
-        # Tüm modelleri listele
-        models = genai.list_models()
-        
-        # Model bilgilerini topla
-        model_list = []
-        for m in models:
-            model_info = {
-                "name": m.name,
-                "display_name": m.display_name,
-                "description": m.description,
-                "supported_generation_methods": list(m.supported_generation_methods),
-                "input_token_limit": m.input_token_limit if hasattr(m, 'input_token_limit') else None,
-                "output_token_limit": m.output_token_limit if hasattr(m, 'output_token_limit') else None,
-            }
-            model_list.append(model_info)
+        # Ağ çağrısı yapabilir, event loop'u bloklamasın
+        model_list = await run_in_threadpool(model_registry.list_models, refresh)
         
         # generateContent destekleyen modelleri filtrele
         generate_models = [
@@ -49,9 +43,11 @@ async def list_available_models():
             "generate_content_models": len(generate_models),
             "all_models": model_list,
             "recommended_models": generate_models,
-            "api_key_set": bool(settings.GOOGLE_API_KEY and settings.GOOGLE_API_KEY != "your-api-key-here")
+            "api_key_set": bool(settings.GOOGLE_API_KEY and settings.GOOGLE_API_KEY != "your-api-key-here"),
+            "registry": model_registry.status(),
+            "circuit_breakers": circuit_status()
         }
-        
+    
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -62,3 +58,96 @@ async def list_available_models():
             }
         )
 
+
+@router.get("/event-loop")
+async def event_loop_blocks(
+    reset: bool = Query(False, description="Raporu döndürdükten sonra sıfırla")
+):
+    """
+    🐢 Event loop'u bloklayan kodları route bazında listeler
+    
+    LOOP_WATCHDOG_THRESHOLD_MS'den uzun süren her bloklama, o anda loop
+    thread'inde çalışan kodun yığınıyla kaydedilir. Route'lar toplam
+    bloklama süresine göre sıralıdır.
+    
+    Returns:
+        dict: Route bazında sayı/toplam/en uzun süre, son yığın ve son olaylar
+    """
+    report = loop_watchdog.report()
+    if reset:
+        loop_watchdog.reset()
+    return report
+
+
+def _get_profile(profile_id: int) -> Dict[str, Any]:
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "profile_not_found",
+                "message": f"'{profile_id}' ID'li profil bulunamadı (halkadan düşmüş olabilir)."
+            }
+        )
+    return profile
+
+
+@router.get("/profiles")
+async def list_request_profiles():
+    """
+    🔬 Gecikme bütçesini aşan isteklerin profillerini listeler
+    
+    Projects ve sections isteklerinin PROFILER_SAMPLE_RATE oranı
+    örneklenir; PROFILER_LATENCY_BUDGET_MS'i aşanların profili saklanır.
+    
+    Returns:
+        dict: Ayarlar ve profil özetleri (yeniden eskiye, en çok zaman alan çerçevelerle)
+    """
+    return {
+        "sample_rate": request_profiler.sample_rate,
+        "budget_ms": request_profiler.budget_ms,
+        "interval_ms": request_profiler.interval_ms,
+        "profiles": request_profiler.profiles(),
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_request_profile(profile_id: int):
+    """
+    🔬 Tek profilin özeti
+    
+    Args:
+        profile_id: Profil ID'si
+    
+    Returns:
+        dict: Route, süre, örnek sayısı ve en çok zaman alan çerçeveler
+    
+    Raises:
+        HTTPException: Profil bulunamazsa 404 hatası
+    """
+    profile = _get_profile(profile_id)
+    return {key: value for key, value in profile.items() if key != "collapsed"}
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+async def download_request_profile(profile_id: int):
+    """
+    🔥 Profilin collapsed yığın dosyası
+    
+    Her satır `çerçeve;çerçeve;... örnek_sayısı` biçimindedir;
+    flamegraph.pl veya speedscope ile doğrudan açılabilir.
+    
+    Args:
+        profile_id: Profil ID'si
+    
+    Returns:
+        PlainTextResponse: profile-<id>.folded
+    
+    Raises:
+        HTTPException: Profil bulunamazsa 404 hatası
+    """
+    profile = _get_profile(profile_id)
+    return PlainTextResponse(
+        profile["collapsed"],
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'}
+    )
@@ -0,0 +1,230 @@
+"""
+Export Router
+Projeyi şablonunun .docx formuna doldurur; render arka plandaki export
+işlerinde yapılır, dosya parça parça indirilir.
+"""
+
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from models.export import ExportRequest
+from data.mock_projects import get_project_by_id, get_mock_user_id
+from services.docx_export import DOCX_MEDIA_TYPE, find_incomplete_sections
+from services.export_jobs import start_export, get_export_job, wait_for_export, job_status
+from services.export_cache import get_export_cache
+from services.autosave import draft_coalescer
+
+router = APIRouter(prefix="/api/v1/export", tags=["Export"])
+
+
+async def get_exportable_project(request: ExportRequest, user_id: str) -> dict:
+    """
+    Export isteğini doğrular ve projeyi döndürür
+    
+    Raises:
+        HTTPException 400: Bilinmeyen şablon veya tamamlanmamış bölümler
+        HTTPException 404: Proje bulunamazsa
+    """
+    # allow_incomplete ile taslaklar da export edilir; bekleyenler önce yazılır
+    await draft_coalescer.flush_project(request.project_id)
+    project = await run_in_threadpool(get_project_by_id, request.project_id, user_id)
+    
+    if not project:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "project_not_found",
+                "message": f"'{request.project_id}' ID'li proje bulunamadı."
+            }
+        )
+    
+    try:
+        incomplete = await run_in_threadpool(find_incomplete_sections, project)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "template_not_found",
+                "message": str(e)
+            }
+        )
+    
+    if incomplete and not request.allow_incomplete:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "incomplete_sections",
+                "message": "Tüm bölümler tamamlanmalıdır",
+                "incomplete_sections": incomplete
+            }
+        )
+    
+    return project
+
+
+def export_file_response(job: dict) -> FileResponse:
+    """
+    Biten işin dosyası (64 KB'lık parçalarla stream edilir)
+    
+    Raises:
+        HTTPException 410: Dosya artık yoksa (eski iş temizlendi)
+    """
+    try:
+        stat_result = os.stat(job["file_path"])
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=410,
+            detail={
+                "error": "export_expired",
+                "message": "Export dosyası artık mevcut değil, yeniden export edin."
+            }
+        )
+    return FileResponse(
+        job["file_path"],
+        media_type=DOCX_MEDIA_TYPE,
+        filename=job["file_name"],
+        stat_result=stat_result
+    )
+
+
+@router.post("/")
+async def export_project(request: ExportRequest):
+    """
+    📤 Projeyi DOCX olarak export eder ve dosyayı döner
+    
+    Render export işi olarak process havuzunda yapılır; proje son
+    export'tan beri değişmediyse önceki dosya tekrar kullanılır.
+    
+    Args:
+        request: project_id, format, allow_incomplete
+    
+    Returns:
+        FileResponse: .docx dosyası (attachment)
+    
+    Raises:
+        HTTPException 400: Desteklenmeyen format veya tamamlanmamış bölümler
+        HTTPException 404: Proje bulunamazsa
+        HTTPException 500: Render başarısız olursa
+    """
+    user_id = get_mock_user_id()
+    project = await get_exportable_project(request, user_id)
+    
+    status, _ = start_export(project, user_id, request.allow_incomplete)
+    status = await wait_for_export(status["job_id"])
+    
+    if status["status"] != "completed":
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "export_failed",
+                "message": status["error"] or "Export tamamlanamadı."
+            }
+        )
+    
+    return export_file_response(get_export_job(status["job_id"], user_id))
+
+
+@router.post("/jobs", status_code=202)
+async def create_export_job(request: ExportRequest):
+    """
+    🧵 Export işini arka planda başlatır
+    
+    Aynı proje için içerik değişmediyse devam eden veya biten iş döner
+    (`reused: true`); dosya `download_url`'den indirilir.
+    
+    Args:
+        request: project_id, format, allow_incomplete
+    
+    Returns:
+        dict: İş durumu (job_id, status, download_url)
+    
+    Raises:
+        HTTPException 400: Desteklenmeyen format veya tamamlanmamış bölümler
+        HTTPException 404: Proje bulunamazsa
+    """
+    user_id = get_mock_user_id()
+    project = await get_exportable_project(request, user_id)
+    
+    status, reused = start_export(project, user_id, request.allow_incomplete)
+    return {**status, "reused": reused}
+
+
+@router.get("/jobs/{job_id}")
+async def get_export_job_status(job_id: str):
+    """
+    📊 Export işinin durumunu döndürür
+    
+    Args:
+        job_id: İş ID'si
+    
+    Returns:
+        dict: pending / running / completed / failed / cancelled
+    
+    Raises:
+        HTTPException 404: İş bulunamazsa
+    """
+    job = get_export_job(job_id, get_mock_user_id())
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "job_not_found",
+                "message": f"'{job_id}' ID'li export işi bulunamadı."
+            }
+        )
+    
+    return job_status(job)
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export(job_id: str):
+    """
+    📥 Biten export işinin dosyasını indirir
+    
+    Dosya diskten parça parça gönderilir; belleğe tamamı okunmaz.
+    
+    Args:
+        job_id: İş ID'si
+    
+    Returns:
+        FileResponse: .docx dosyası
+    
+    Raises:
+        HTTPException 404: İş bulunamazsa
+        HTTPException 409: İş henüz bitmediyse veya başarısız olduysa
+        HTTPException 410: Dosya artık yoksa
+    """
+    job = get_export_job(job_id, get_mock_user_id())
+    
+    if not job:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "job_not_found",
+                "message": f"'{job_id}' ID'li export işi bulunamadı."
+            }
+        )
+    
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "export_not_ready",
+                "message": f"Export işi henüz hazır değil (durum: {job['status']})."
+            }
+        )
+    
+    return export_file_response(job)
+
+
+@router.get("/cache")
+async def get_export_cache_stats():
+    """
+    📦 Export cache istatistikleri
+    
+    Returns:
+        dict: Dosya sayısı, toplam boyut, hit/miss, silinen dosyalar
+    """
+    return get_export_cache().stats()
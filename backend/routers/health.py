@@ -3,9 +3,12 @@ Health Check Router
 Sistem sağlık kontrolü endpoint'leri
 """
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 from config.settings import settings
+from services.metrics import metrics
+from services.readiness import readiness_monitor
 
 router = APIRouter(
     prefix="/api/v1",
@@ -39,31 +42,24 @@ async def health_check():
     "/ready",
     status_code=status.HTTP_200_OK,
     summary="Hazırlık kontrolü",
-    description="Servisin istekleri kabul etmeye hazır olup olmadığını kontrol eder"
+    description="Servisin istekleri kabul etmeye hazır olup olmadığını kontrol eder",
+    responses={503: {"description": "Açılış sürüyor veya kritik bir kontrol başarısız"}}
 )
 async def readiness_check():
     """
     Readiness probe - Kubernetes ve deployment için.
     
+    Kontroller (store yazma/okuma, event loop gecikmesi, AI thread
+    havuzu kuyruğu, Gemini erişimi, export process'leri) arka planda
+    READINESS_REFRESH_SECONDS'ta bir çalışır; bu endpoint son sonucu
+    beklemeden döndürür. Her kontrol kendi süresini (latency_ms) içerir.
+    
     Returns:
-        dict: Hazırlık durumu
+        JSONResponse: ready / degraded (200) veya starting / not_ready (503)
     """
-    # Burada database bağlantısı, external API'ler vb. kontrol edilebilir
-    checks = {
-        "api": "ready",
-        "google_ai": "configured" if settings.GOOGLE_API_KEY else "not_configured",
-        # Arkadaşınız ekleyecek:
-        # "database": "connected" if check_db() else "disconnected",
-        # "supabase": "connected" if check_supabase() else "disconnected",
-    }
-    
-    all_ready = all(v in ["ready", "configured", "connected"] for v in checks.values())
-    
-    return {
-        "status": "ready" if all_ready else "not_ready",
-        "checks": checks,
-        "timestamp": datetime.now().isoformat(),
-    }
+    snapshot = readiness_monitor.snapshot()
+    status_code = 200 if snapshot["status"] in ("ready", "degraded") else 503
+    return JSONResponse(status_code=status_code, content=snapshot)
 
 
 @router.get(
@@ -85,3 +81,34 @@ async def liveness_check():
         "timestamp": datetime.now().isoformat(),
     }
 
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Performans metrikleri",
+    description="İstek ve AI metriklerini Prometheus metin formatında döndürür"
+)
+async def metrics_endpoint():
+    """
+    Prometheus scrape endpoint'i.
+    
+    Route bazında istek sayısı/durum kodu, süre ve yanıt boyutu
+    histogramları, işlemdeki istekler ve AI çağrısı metrikleri
+    (prompt/çıktı uzunluğu, Gemini süresi, retry, cache isabeti).
+    Değerler worker (process) bazındadır.
+    
+    Returns:
+        PlainTextResponse: text/plain; version=0.0.4
+    
+    Raises:
+        HTTPException: METRICS_ENABLED kapalıysa 404 hatası
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "metrics_disabled",
+                "message": "Metrikler kapalı (METRICS_ENABLED=false)."
+            }
+        )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
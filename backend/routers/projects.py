@@ -3,7 +3,9 @@ Projects Router
 Proje oluşturma, listeleme, güncelleme ve silme işlemleri.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Header, Response, Body
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, List, Optional, Set
 from models.project import (
     Project,
     ProjectList,
@@ -13,7 +15,9 @@ from models.project import (
     UpdateKeywordsRequest,
     UpdateScientificMeritRequest,
     UpdateProjectManagementRequest,
-    UpdateWideImpactRequest
+    UpdateWideImpactRequest,
+    TablePatchOperation,
+    GenerateAllRequest
 )
 from data.mock_projects import (
     get_all_projects,
@@ -25,12 +29,26 @@ from data.mock_projects import (
     update_scientific_merit,
     update_project_management,
     update_wide_impact,
+    patch_project_tables,
     delete_project,
     get_mock_user_id
 )
-from data.mock_templates import get_template_by_id
+from data.template_registry import get_template_by_id
+from data.project_repository import VersionConflict, section_summary
+from data.table_patch import TablePatchConflict
+from utils.responses import FastJSONResponse
+from utils.etag import project_etag, project_version_etag, etag_matches, parse_if_match, version_conflict_error
+from services.generation_jobs import start_generate_all, get_job
+from services.autosave import draft_coalescer, DRAFT_NOT_SAVED_HEADER
+from services.request_profiler import ProfiledRoute
 
-router = APIRouter(prefix="/api/v1/projects", tags=["Projects"])
+router = APIRouter(prefix="/api/v1/projects", tags=["Projects"], route_class=ProfiledRoute)
+
+# Tek patch isteğindeki en fazla işlem sayısı
+MAX_TABLE_PATCH_OPERATIONS = 200
+
+# fields / exclude ile seçilebilen üst seviye alanlar
+PROJECT_FIELDS = tuple(Project.model_fields)
 
 
 def get_current_user_id():
@@ -41,10 +59,102 @@ def get_current_user_id():
     return get_mock_user_id()
 
 
+async def apply_project_update(
+    update: Callable,
+    project_id: str,
+    value,
+    if_match: Optional[str],
+    response: Response
+) -> dict:
+    """
+    Proje alanı güncellemesini If-Match koşuluyla uygular
+    
+    Args:
+        update: data katmanındaki update_* fonksiyonu
+        project_id: Proje ID'si
+        value: Yazılacak değer
+        if_match: If-Match başlığı (yoksa koşulsuz yazılır)
+        response: Projenin yeni ETag'i (GET ile aynı biçim) bu yanıta eklenir
+    
+    Returns:
+        dict: update fonksiyonunun sonucu ("version" alanıyla)
+    
+    Raises:
+        HTTPException 404: Proje bulunamazsa
+        HTTPException 412: If-Match güncel proje sürümüyle uyuşmazsa
+    """
+    try:
+        result = await run_in_threadpool(update, project_id, value, get_current_user_id(), parse_if_match(if_match))
+    except VersionConflict as e:
+        raise version_conflict_error(e)
+    
+    if not result:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "project_not_found",
+                "message": f"'{project_id}' ID'li proje bulunamadı."
+            }
+        )
+    
+    sections_version = result.pop("sections_version")
+    response.headers["ETag"] = project_version_etag(result["version"], sections_version)
+    return result
+
+
+def parse_project_fields(value: Optional[str], param: str) -> Optional[Set[str]]:
+    """
+    Virgülle ayrılmış alan listesini çözer
+    
+    Raises:
+        HTTPException 400: Project modelinde olmayan alan varsa
+    """
+    if value is None:
+        return None
+    
+    fields = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = fields.difference(PROJECT_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_fields",
+                "message": f"{param} içinde bilinmeyen alan: {', '.join(sorted(unknown))}",
+                "allowed_fields": list(PROJECT_FIELDS)
+            }
+        )
+    return fields
+
+
+def project_view(project: dict, fields: Optional[Set[str]], exclude: Optional[Set[str]], sections: str) -> dict:
+    """
+    Projenin istenen alanlarını içeren gösterimi
+    
+    Args:
+        project: Proje verisi
+        fields: Yalnızca bu alanlar (id her zaman dahil); None ise hepsi
+        exclude: Çıkarılacak alanlar
+        sections: "meta" ise bölüm metinleri yerine kelime sayısı ve durum
+    """
+    view = {}
+    for field in PROJECT_FIELDS:
+        if fields is not None and field not in fields and field != "id":
+            continue
+        if exclude and field in exclude:
+            continue
+        view[field] = project.get(field)
+    
+    if sections == "meta" and "sections" in view:
+        view["sections"] = [section_summary(section) for section in view["sections"]]
+    return view
+
+
 @router.get("/", response_model=ProjectList)
 async def list_projects(
     page: int = Query(1, ge=1, description="Sayfa numarası"),
-    limit: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı")
+    limit: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı"),
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor (verilirse page yok sayılır)"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="created_at sıralaması")
 ):
     """
     📁 Kullanıcının tüm projelerini listeler
@@ -52,30 +162,72 @@ async def list_projects(
     Args:
         page: Sayfa numarası (default: 1)
         limit: Sayfa başına kayıt (default: 20, max: 100)
-        
+        cursor: Keyset pagination cursor'ı (yeni projeler eklense de sayfalar kaymaz)
+        order: asc (eskiden yeniye) veya desc (yeniden eskiye)
+    
     Returns:
-        ProjectList: Projeler listesi, toplam, sayfa ve limit bilgisi
+        ProjectList: Projeler listesi, toplam, sayfa, limit ve next_cursor bilgisi
+    
+    Raises:
+        HTTPException: Cursor geçersizse 400 hatası
     """
     user_id = get_current_user_id()
-    return get_all_projects(user_id, page, limit)
+    
+    try:
+        # Store özetleri ProjectList yapısında; yeniden doğrulanmadan yazılır
+        page_data = await run_in_threadpool(get_all_projects, user_id, page, limit, cursor=cursor, order=order)
+        return FastJSONResponse(page_data)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_cursor",
+                "message": "Geçersiz sayfalama cursor'ı."
+            }
+        )
 
 
 @router.get("/{project_id}", response_model=Project)
-async def get_project(project_id: str):
+async def get_project(
+    project_id: str,
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış üst seviye alanlar (ör. title,sections)"),
+    exclude: Optional[str] = Query(None, description="Virgülle ayrılmış, yanıttan çıkarılacak alanlar"),
+    sections: str = Query("full", pattern="^(full|meta)$", description="meta: bölüm metinleri yerine kelime sayısı ve durum"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     📄 Belirli bir projeyi detaylı olarak getirir
     
+    Yanıt ETag başlığı taşır; istemci bunu If-None-Match ile gönderirse
+    ve proje değişmediyse gövdesiz 304 döner. Otomatik kaydı kabul edilip
+    store'a yazılamayan bölümler (bir kez) X-Draft-Not-Saved başlığında
+    listelenir; bu bölümlerde saklı taslak döner.
+    
+    Dashboard ve gezinme paneli `fields` / `exclude` / `sections=meta` ile
+    yalnızca ihtiyaç duyduğu alanları alır; uzun bölüm metinleri
+    gönderilmez.
+    
     Args:
         project_id: Proje ID'si
-        
+        fields: Yalnızca bu alanlar döner (id her zaman dahil)
+        exclude: Bu alanlar yanıttan çıkarılır
+        sections: full (varsayılan) veya meta
+        if_none_match: Önceki yanıttaki ETag
+    
     Returns:
-        Project: Proje detayları (bölümler, tablolar, vb. dahil)
-        
+        Project: Proje detayları (bölümler, tablolar, vb. dahil), seçili alanlar veya 304
+    
     Raises:
-        HTTPException: Proje bulunamazsa 404 hatası
+        HTTPException: Bilinmeyen alan seçilirse 400, proje bulunamazsa 404 hatası
     """
+    selected_fields = parse_project_fields(fields, "fields")
+    excluded_fields = parse_project_fields(exclude, "exclude")
+    sparse = selected_fields is not None or bool(excluded_fields) or sections == "meta"
+    
     user_id = get_current_user_id()
-    project = get_project_by_id(project_id, user_id)
+    # Otomatik kayıtta bekleyen taslaklar okunmadan önce yazılır
+    await draft_coalescer.flush_project(project_id)
+    project = await run_in_threadpool(get_project_by_id, project_id, user_id)
     
     if not project:
         raise HTTPException(
@@ -86,7 +238,20 @@ async def get_project(project_id: str):
             }
         )
     
-    return project
+    variant = None
+    if sparse:
+        variant = f"{sorted(selected_fields or ())}|{sorted(excluded_fields or ())}|{sections}"
+    headers = {"ETag": project_etag(project, variant)}
+    # Kabul edilip yazılamayan taslaklar (kullanıcı yazmayı bıraktıysa başka yerde bildirilmez)
+    unsaved = draft_coalescer.take_failures(project_id, user_id)
+    if unsaved:
+        headers[DRAFT_NOT_SAVED_HEADER] = ",".join(unsaved)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    # Store verisi Project yapısında; response_model ile yeniden doğrulanmaz
+    content = project_view(project, selected_fields, excluded_fields, sections) if sparse else project
+    return FastJSONResponse(content, headers=headers)
 
 
 @router.post("/", response_model=Project, status_code=201)
@@ -96,10 +261,10 @@ async def create_new_project(request: CreateProjectRequest):
     
     Args:
         request: template_id ve title içerir
-        
+    
     Returns:
         Project: Oluşturulan proje (boş bölümlerle birlikte)
-        
+    
     Raises:
         HTTPException: Template bulunamazsa 404 hatası
     """
@@ -117,7 +282,8 @@ async def create_new_project(request: CreateProjectRequest):
         )
     
     # Yeni proje oluştur
-    project = create_project(
+    project = await run_in_threadpool(
+        create_project,
         template_id=request.template_id,
         template_name=template["name"],
         title=request.title,
@@ -128,132 +294,197 @@ async def create_new_project(request: CreateProjectRequest):
 
 
 @router.patch("/{project_id}")
-async def update_project(project_id: str, request: UpdateProjectTitleRequest):
+async def update_project(
+    project_id: str,
+    request: UpdateProjectTitleRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     ✏️ Proje başlığını günceller
     
     Args:
         project_id: Proje ID'si
         request: Yeni başlık
-        
+    
     Returns:
-        dict: Güncellenmiş başlık ve timestamp
-        
+        dict: Güncellenmiş başlık, timestamp ve proje sürümü (ETag başlığında da)
+    
     Raises:
-        HTTPException: Proje bulunamazsa 404 hatası
+        HTTPException: Proje bulunamazsa 404, If-Match güncel sürüm değilse 412 hatası
     """
-    user_id = get_current_user_id()
-    result = update_project_title(project_id, request.title, user_id)
-    
-    if not result:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "project_not_found",
-                "message": f"'{project_id}' ID'li proje bulunamadı."
-            }
-        )
-    
-    return result
+    return await apply_project_update(update_project_title, project_id, request.title, if_match, response)
 
 
 @router.patch("/{project_id}/general-info")
-async def update_project_general_info(project_id: str, request: UpdateGeneralInfoRequest):
+async def update_project_general_info(
+    project_id: str,
+    request: UpdateGeneralInfoRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     📝 Genel bilgileri (A bölümü) günceller
     
     Args:
         project_id: Proje ID'si
         request: Genel bilgiler (applicant_name, research_title, vb.)
-        
+    
     Returns:
         dict: Güncellenmiş general_info ve timestamp
     """
-    user_id = get_current_user_id()
-    result = update_general_info(project_id, request.model_dump(), user_id)
-    
-    if not result:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "project_not_found",
-                "message": f"'{project_id}' ID'li proje bulunamadı."
-            }
-        )
-    
-    return result
+    return await apply_project_update(update_general_info, project_id, request.model_dump(), if_match, response)
 
 
 @router.patch("/{project_id}/keywords")
-async def update_project_keywords(project_id: str, request: UpdateKeywordsRequest):
+async def update_project_keywords(
+    project_id: str,
+    request: UpdateKeywordsRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     🔑 Anahtar kelimeleri günceller
     
     Args:
         project_id: Proje ID'si
         request: Anahtar kelimeler
-        
+    
     Returns:
         dict: Güncellenmiş keywords ve timestamp
     """
-    user_id = get_current_user_id()
-    result = update_keywords(project_id, request.keywords, user_id)
-    
-    if not result:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "error": "project_not_found",
-                "message": f"'{project_id}' ID'li proje bulunamadı."
-            }
-        )
-    
-    return result
+    return await apply_project_update(update_keywords, project_id, request.keywords, if_match, response)
 
 
 @router.patch("/{project_id}/scientific-merit")
-async def update_project_scientific_merit(project_id: str, request: UpdateScientificMeritRequest):
+async def update_project_scientific_merit(
+    project_id: str,
+    request: UpdateScientificMeritRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     🔬 Bilimsel Nitelik (1.1 ve 1.2) günceller
     
     Args:
         project_id: Proje ID'si
         request: Bilimsel nitelik bilgileri
-        
+    
     Returns:
         dict: Güncellenmiş scientific_merit ve timestamp
     """
-    user_id = get_current_user_id()
-    result = update_scientific_merit(project_id, request.model_dump(), user_id)
+    return await apply_project_update(update_scientific_merit, project_id, request.model_dump(), if_match, response)
+
+
+@router.patch("/{project_id}/project-management")
+async def update_project_project_management(
+    project_id: str,
+    request: UpdateProjectManagementRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    📊 Proje Yönetimi tablolarını (3.1, 3.2, 3.3) günceller
     
-    if not result:
+    Args:
+        project_id: Proje ID'si
+        request: İş programı, risk yönetimi, araştırma imkanları
+    
+    Returns:
+        dict: Güncellenmiş project_management ve timestamp
+    """
+    return await apply_project_update(update_project_management, project_id, request.model_dump(), if_match, response)
+
+
+@router.patch("/{project_id}/wide-impact")
+async def update_project_wide_impact(
+    project_id: str,
+    request: UpdateWideImpactRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """
+    🌍 Projenin Geniş Etkisi tablosunu günceller
+    
+    Args:
+        project_id: Proje ID'si
+        request: Geniş etki verileri
+    
+    Returns:
+        dict: Güncellenmiş wide_impact ve timestamp
+    """
+    # List[WideImpactRow] -> list of dicts
+    wide_impact_data = [item.model_dump() for item in request.wide_impact]
+    return await apply_project_update(update_wide_impact, project_id, wide_impact_data, if_match, response)
+
+
+@router.patch("/{project_id}/tables")
+async def patch_project_tables_endpoint(
+    project_id: str,
+    response: Response,
+    operations: List[TablePatchOperation] = Body(..., min_length=1, max_length=MAX_TABLE_PATCH_OPERATIONS),
+    if_match: Optional[str] = Header(None)
+):
+    """
+    🧩 Proje tablolarını satır bazında günceller (JSON Patch)
+    
+    Tam liste göndermek yerine tek hücre/satır değiştirilir, eklenir,
+    taşınır veya silinir; satırlar id ile adreslenir. İşlemler sırayla
+    ve tek adımda uygulanır: biri başarısız olursa hiçbiri uygulanmaz.
+    
+    Args:
+        project_id: Proje ID'si
+        operations: RFC 6902 işlem listesi (ör. {"op": "replace",
+            "path": "/work_schedule/<satır id>/activities", "value": "..."})
+        if_match: Projenin son okunan ETag'i (opsiyonel)
+    
+    Returns:
+        dict: Değişen tabloların satırları, timestamp ve proje sürümü
+    
+    Raises:
+        HTTPException: Proje bulunamazsa 404, satır yoksa veya test başarısızsa 409,
+            If-Match güncel sürüm değilse 412 hatası
+    """
+    try:
+        return await apply_project_update(
+            patch_project_tables, project_id, [operation.to_operation() for operation in operations],
+            if_match, response
+        )
+    except TablePatchConflict as e:
         raise HTTPException(
-            status_code=404,
+            status_code=409,
             detail={
-                "error": "project_not_found",
-                "message": f"'{project_id}' ID'li proje bulunamadı."
+                "error": "patch_conflict",
+                "message": str(e)
             }
         )
-    
-    return result
 
 
-@router.patch("/{project_id}/project-management")
-async def update_project_project_management(project_id: str, request: UpdateProjectManagementRequest):
+@router.post("/{project_id}/generate-all", status_code=202)
+async def generate_all_sections(project_id: str, request: GenerateAllRequest):
     """
-    📊 Proje Yönetimi tablolarını (3.1, 3.2, 3.3) günceller
+    🤖 Projenin tüm bölümleri için AI üretimini arka planda başlatır
+    
+    Bölümler sınırlı eşzamanlılıkla paralel üretilir; toplam süre yaklaşık
+    en yavaş bölümün süresi kadardır. İş ID'si hemen döner, ilerleme
+    GET /{project_id}/generate-all/{job_id} ile izlenir.
+    Taslağı (draft_content) boş olan bölümler atlanır.
     
     Args:
         project_id: Proje ID'si
-        request: İş programı, risk yönetimi, araştırma imkanları
-        
+        request: style, additional_instructions, concurrency, use_cache
+    
     Returns:
-        dict: Güncellenmiş project_management ve timestamp
+        dict: İş durumu (job_id, status, progress, sections)
+    
+    Raises:
+        HTTPException: Proje bulunamazsa 404 hatası
     """
     user_id = get_current_user_id()
-    result = update_project_management(project_id, request.model_dump(), user_id)
+    await draft_coalescer.flush_project(project_id)
+    project = await run_in_threadpool(get_project_by_id, project_id, user_id)
     
-    if not result:
+    if not project:
         raise HTTPException(
             status_code=404,
             detail={
@@ -262,37 +493,44 @@ async def update_project_project_management(project_id: str, request: UpdateProj
             }
         )
     
-    return result
+    return start_generate_all(
+        project,
+        user_id=user_id,
+        style=request.style,
+        additional_instructions=request.additional_instructions,
+        concurrency=request.concurrency,
+        use_cache=request.use_cache
+    )
 
 
-@router.patch("/{project_id}/wide-impact")
-async def update_project_wide_impact(project_id: str, request: UpdateWideImpactRequest):
+@router.get("/{project_id}/generate-all/{job_id}")
+async def get_generate_all_status(project_id: str, job_id: str):
     """
-    🌍 Projenin Geniş Etkisi tablosunu günceller
+    📊 Toplu üretim işinin durumunu ve tamamlanan bölümlerin sonuçlarını getirir
     
     Args:
         project_id: Proje ID'si
-        request: Geniş etki verileri
-        
+        job_id: generate-all çağrısından dönen iş ID'si
+    
     Returns:
-        dict: Güncellenmiş wide_impact ve timestamp
+        dict: İş durumu, ilerleme sayaçları ve bölüm bazında sonuçlar
+    
+    Raises:
+        HTTPException: İş bulunamazsa 404 hatası
     """
     user_id = get_current_user_id()
+    job = get_job(job_id, project_id, user_id)
     
-    # List[WideImpactRow] -> list of dicts
-    wide_impact_data = [item.model_dump() for item in request.wide_impact]
-    result = update_wide_impact(project_id, wide_impact_data, user_id)
-    
-    if not result:
+    if not job:
         raise HTTPException(
             status_code=404,
             detail={
-                "error": "project_not_found",
-                "message": f"'{project_id}' ID'li proje bulunamadı."
+                "error": "job_not_found",
+                "message": f"'{job_id}' ID'li iş bulunamadı."
             }
         )
     
-    return result
+    return job
 
 
 @router.delete("/{project_id}", status_code=204)
@@ -302,15 +540,15 @@ async def delete_project_endpoint(project_id: str):
     
     Args:
         project_id: Proje ID'si
-        
+    
     Returns:
         None (204 No Content)
-        
+    
     Raises:
         HTTPException: Proje bulunamazsa 404 hatası
     """
     user_id = get_current_user_id()
-    success = delete_project(project_id, user_id)
+    success = await run_in_threadpool(delete_project, project_id, user_id)
     
     if not success:
         raise HTTPException(
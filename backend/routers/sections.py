@@ -3,22 +3,49 @@ Sections Router
 Proje bölümlerini düzenleme ve AI ile metin üretme
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional
-from services.gemini import generate_text, revise_text
-from data.mock_projects import get_project_by_id, get_mock_user_id, MOCK_PROJECTS
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Header, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from services.gemini import generate_text, revise_text, stream_generate_text, stream_revise_text
+from services.ai_resilience import retry_after_header
+from utils.sse import sse_response
+from utils.etag import version_etag, parse_if_match, version_conflict_error
+from data.project_repository import VersionConflict
+from services.autosave import draft_coalescer, DraftNotSaved
+from services.request_profiler import ProfiledRoute
+from data.template_registry import get_section_limits
+from data.mock_projects import (
+    get_section_by_id,
+    update_section_final,
+    get_section_revisions,
+    get_section_revision,
+    get_mock_user_id
+)
 
 
-router = APIRouter(prefix="/api/v1/sections", tags=["Sections"])
+router = APIRouter(prefix="/api/v1/sections", tags=["Sections"], route_class=ProfiledRoute)
 
 
 # --- Request Models ---
 
+class DraftEdit(BaseModel):
+    """Taslakta tek değişiklik: [start, end) aralığı text ile değiştirilir"""
+    start: int = Field(..., ge=0)
+    end: int = Field(..., ge=0)
+    text: str = ""
+
+
 class UpdateSectionRequest(BaseModel):
-    """Bölüm draft_content güncelleme request"""
-    draft_content: str
+    """Bölüm draft_content güncelleme request (tam metin veya değişiklikler)"""
+    draft_content: Optional[str] = None
+    edits: Optional[List[DraftEdit]] = None  # draft_content yerine, güncel taslağa göre
+    
+    @model_validator(mode="after")
+    def _one_payload(self):
+        if (self.draft_content is None) == (self.edits is None):
+            raise ValueError("draft_content veya edits alanlarından yalnızca biri verilmeli")
+        return self
 
 
 class GenerateRequest(BaseModel):
@@ -26,6 +53,7 @@ class GenerateRequest(BaseModel):
     draft_content: str
     style: str = "Akademik, bilimsel ve profesyonel"
     additional_instructions: str = ""
+    use_cache: bool = True  # False: aynı istek için yeni öneri üret
 
 
 class ReviseRequest(BaseModel):
@@ -33,6 +61,7 @@ class ReviseRequest(BaseModel):
     current_content: str
     revision_prompt: str
     style: str = "Akademik, bilimsel ve profesyonel"
+    use_cache: bool = True  # False: aynı istek için yeni öneri üret
 
 
 class AcceptContentRequest(BaseModel):
@@ -40,81 +69,69 @@ class AcceptContentRequest(BaseModel):
     content: str
 
 
-# --- Helper Functions ---
-
-def get_section_from_project(project_id: str, section_id: str, user_id: str):
-    """
-    Proje içinden section'ı bulur
-    
-    Returns:
-        tuple: (project, section) veya (None, None) if not found
-    """
-    project = MOCK_PROJECTS.get(project_id)
-    
-    if not project or project["user_id"] != user_id:
-        return None, None
-    
-    section = None
-    for sec in project.get("sections", []):
-        if sec["id"] == section_id:
-            section = sec
-            break
-    
-    return project, section
-
-
-def get_template_section_limits(section_title: str):
-    """
-    Section başlığına göre min/max kelime limitlerini döndürür
-    Gerçek uygulamada template'den alınacak
-    """
-    # Basit bir mapping, gerçekte template'den gelecek
-    limits = {
-        "Projenin Özeti": {"min": 25, "max": 450},
-        "Araştırma Önerisinin Bilimsel Niteliği": {"min": 0, "max": 0},
-        "Projenin Yönetimi": {"min": 100, "max": 800},
-        "Projenin Geniş Etkisi": {"min": 50, "max": 500},
-    }
-    return limits.get(section_title, {"min": 0, "max": 0})
-
-
 # --- Endpoints ---
 
 @router.patch("/{section_id}")
-async def update_section(section_id: str, request: UpdateSectionRequest):
+async def update_section(
+    section_id: str,
+    request: UpdateSectionRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     ✏️ Bölüm taslağını (draft_content) günceller
     
+    Otomatik kayıt yazmaları birleştirilir: bölüme art arda gelen
+    yazmalardan yalnızca sonuncusu AUTOSAVE_DEBOUNCE_MS sonra store'a
+    yazılır. Projeyi okuyan endpoint'ler önce bekleyen taslakları yazar.
+    
+    If-Match verilirse yazma yalnızca bölüm sürümü eşleşirse yapılır;
+    böylece iki sekmenin otomatik kaydı birbirini ezmez.
+    
     Args:
         section_id: Section ID'si
-        request: Yeni draft_content
-        
+        request: Yeni draft_content veya güncel taslağa uygulanacak edits
+        if_match: Bölümün son okunan ETag'i (opsiyonel)
+    
     Returns:
-        dict: Güncellenmiş section
-        
+        dict: Güncellenmiş section (version alanı ve ETag başlığıyla)
+    
     Raises:
-        HTTPException: Section bulunamazsa 404 hatası
+        HTTPException: Section bulunamazsa 404, If-Match güncel sürüm değilse 412,
+            edits taslağa uygulanamazsa 422 hatası
     """
     user_id = get_mock_user_id()
     
-    # Section'ı bul
-    found_section = None
-    found_project = None
-    
-    for project in MOCK_PROJECTS.values():
-        if project["user_id"] != user_id:
-            continue
-        
-        for section in project.get("sections", []):
-            if section["id"] == section_id:
-                found_section = section
-                found_project = project
-                break
-        
-        if found_section:
-            break
+    # Güncelle (section bulunamazsa None döner)
+    try:
+        updated_section = await draft_coalescer.submit(
+            section_id,
+            user_id,
+            content=request.draft_content,
+            edits=[edit.model_dump() for edit in request.edits] if request.edits is not None else None,
+            expected_version=parse_if_match(if_match)
+        )
+    except VersionConflict as e:
+        raise version_conflict_error(e)
+    except DraftNotSaved as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "draft_not_saved",
+                "message": "Önceki taslak kaydedilemedi; bölümü yeniden alıp taslağı tekrar gönderin.",
+                "reason": str(e)
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "invalid_draft_edit",
+                "message": str(e)
+            }
+        )
     
-    if not found_section:
+    if not updated_section:
         raise HTTPException(
             status_code=404,
             detail={
@@ -123,11 +140,8 @@ async def update_section(section_id: str, request: UpdateSectionRequest):
             }
         )
     
-    # Güncelle
-    found_section["draft_content"] = request.draft_content
-    found_section["updated_at"] = datetime.utcnow().isoformat() + "Z"
-    
-    return found_section
+    response.headers["ETag"] = version_etag(updated_section["version"])
+    return updated_section
 
 
 @router.post("/{section_id}/generate")
@@ -138,31 +152,17 @@ async def generate_section_content(section_id: str, request: GenerateRequest):
     Args:
         section_id: Section ID'si
         request: draft_content, style, additional_instructions
-        
+    
     Returns:
         dict: {"generated_content": str}
-        
+    
     Raises:
         HTTPException: Section bulunamazsa 404 hatası veya AI hatası
     """
     user_id = get_mock_user_id()
     
     # Section'ı bul
-    found_section = None
-    found_project = None
-    
-    for project in MOCK_PROJECTS.values():
-        if project["user_id"] != user_id:
-            continue
-        
-        for section in project.get("sections", []):
-            if section["id"] == section_id:
-                found_section = section
-                found_project = project
-                break
-        
-        if found_section:
-            break
+    found_project, found_section = await run_in_threadpool(get_section_by_id, section_id, user_id)
     
     if not found_section:
         raise HTTPException(
@@ -174,7 +174,7 @@ async def generate_section_content(section_id: str, request: GenerateRequest):
         )
     
     # Template limits
-    limits = get_template_section_limits(found_section["title"])
+    limits = get_section_limits(found_project["template_id"], found_section["title"])
     
     try:
         # AI ile metin üret
@@ -185,14 +185,16 @@ async def generate_section_content(section_id: str, request: GenerateRequest):
             style=request.style,
             min_words=limits["min"],
             max_words=limits["max"],
-            additional_instructions=request.additional_instructions
+            additional_instructions=request.additional_instructions,
+            use_cache=request.use_cache
         )
         
         return result
-        
+    
     except Exception as e:
         raise HTTPException(
-            status_code=500,
+            status_code=getattr(e, "status_code", 500),
+            headers=retry_after_header(e),
             detail={
                 "error": "ai_generation_failed",
                 "message": f"AI metin üretimi başarısız: {str(e)}"
@@ -208,31 +210,17 @@ async def revise_section_content(section_id: str, request: ReviseRequest):
     Args:
         section_id: Section ID'si
         request: current_content, revision_prompt, style
-        
+    
     Returns:
         dict: {"generated_content": str}
-        
+    
     Raises:
         HTTPException: Section bulunamazsa 404 hatası veya AI hatası
     """
     user_id = get_mock_user_id()
     
     # Section'ı bul
-    found_section = None
-    found_project = None
-    
-    for project in MOCK_PROJECTS.values():
-        if project["user_id"] != user_id:
-            continue
-        
-        for section in project.get("sections", []):
-            if section["id"] == section_id:
-                found_section = section
-                found_project = project
-                break
-        
-        if found_section:
-            break
+    found_project, found_section = await run_in_threadpool(get_section_by_id, section_id, user_id)
     
     if not found_section:
         raise HTTPException(
@@ -244,7 +232,7 @@ async def revise_section_content(section_id: str, request: ReviseRequest):
         )
     
     # Template limits
-    limits = get_template_section_limits(found_section["title"])
+    limits = get_section_limits(found_project["template_id"], found_section["title"])
     
     try:
         # AI ile metni revize et
@@ -255,14 +243,16 @@ async def revise_section_content(section_id: str, request: ReviseRequest):
             project_title=found_project["title"],
             style=request.style,
             min_words=limits["min"],
-            max_words=limits["max"]
+            max_words=limits["max"],
+            use_cache=request.use_cache
         )
         
         return result
-        
+    
     except Exception as e:
         raise HTTPException(
-            status_code=500,
+            status_code=getattr(e, "status_code", 500),
+            headers=retry_after_header(e),
             detail={
                 "error": "ai_revision_failed",
                 "message": f"AI revizyonu başarısız: {str(e)}"
@@ -270,39 +260,118 @@ async def revise_section_content(section_id: str, request: ReviseRequest):
         )
 
 
+@router.post("/{section_id}/generate/stream")
+async def stream_section_content(section_id: str, request: GenerateRequest):
+    """
+    🤖 AI ile metin üretir (streaming)
+    
+    /generate ile aynı request'i alır, metni Gemini ürettikçe
+    Server-Sent Events olarak gönderir.
+    
+    Events:
+        chunk: {"delta": "..."} - temizlenmiş metin parçası
+        done: {"word_count": int} - üretim tamamlandı
+        error: {"error": "ai_generation_failed", "message": "..."}
+    
+    Raises:
+        HTTPException: Section bulunamazsa 404 hatası
+    """
+    user_id = get_mock_user_id()
+    found_project, found_section = await run_in_threadpool(get_section_by_id, section_id, user_id)
+    
+    if not found_section:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "section_not_found",
+                "message": f"'{section_id}' ID'li bölüm bulunamadı."
+            }
+        )
+    
+    limits = get_section_limits(found_project["template_id"], found_section["title"])
+    chunks = stream_generate_text(
+        draft_content=request.draft_content,
+        section_title=found_section["title"],
+        project_title=found_project["title"],
+        style=request.style,
+        min_words=limits["min"],
+        max_words=limits["max"],
+        additional_instructions=request.additional_instructions,
+        use_cache=request.use_cache
+    )
+    return sse_response(chunks, error_code="ai_generation_failed")
+
+
+@router.post("/{section_id}/revise/stream")
+async def stream_revise_section_content(section_id: str, request: ReviseRequest):
+    """
+    🔄 Mevcut AI önerisini revize eder (streaming)
+    
+    /revise ile aynı request'i alır, event formatı /generate/stream ile aynıdır.
+    
+    Raises:
+        HTTPException: Section bulunamazsa 404 hatası
+    """
+    user_id = get_mock_user_id()
+    found_project, found_section = await run_in_threadpool(get_section_by_id, section_id, user_id)
+    
+    if not found_section:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "section_not_found",
+                "message": f"'{section_id}' ID'li bölüm bulunamadı."
+            }
+        )
+    
+    limits = get_section_limits(found_project["template_id"], found_section["title"])
+    chunks = stream_revise_text(
+        current_content=request.current_content,
+        revision_prompt=request.revision_prompt,
+        section_title=found_section["title"],
+        project_title=found_project["title"],
+        style=request.style,
+        min_words=limits["min"],
+        max_words=limits["max"],
+        use_cache=request.use_cache
+    )
+    return sse_response(chunks, error_code="ai_revision_failed")
+
+
 @router.post("/{section_id}/accept")
-async def accept_section_content(section_id: str, request: AcceptContentRequest):
+async def accept_section_content(
+    section_id: str,
+    request: AcceptContentRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
     """
     ✅ AI önerisini kabul eder ve final_content olarak kaydeder
     
     Args:
         section_id: Section ID'si
         request: Kabul edilen içerik
-        
+        if_match: Bölümün son okunan ETag'i (opsiyonel)
+    
     Returns:
         dict: Güncellenmiş section (revizyon bilgisiyle birlikte)
-        
+    
     Raises:
-        HTTPException: Section bulunamazsa 404 hatası
+        HTTPException: Section bulunamazsa 404, If-Match güncel sürüm değilse 412 hatası
     """
     user_id = get_mock_user_id()
+    expected_version = parse_if_match(if_match)
     
-    # Section'ı bul
-    found_section = None
-    found_project = None
+    # Bekleyen taslak önce yazılır; sürüm sırası korunur
+    await draft_coalescer.flush_section(section_id)
     
-    for project in MOCK_PROJECTS.values():
-        if project["user_id"] != user_id:
-            continue
-        
-        for section in project.get("sections", []):
-            if section["id"] == section_id:
-                found_section = section
-                found_project = project
-                break
-        
-        if found_section:
-            break
+    # final_content'i güncelle (section bulunamazsa None döner)
+    try:
+        found_section = await run_in_threadpool(
+            update_section_final, section_id, request.content, user_id, expected_version
+        )
+    except VersionConflict as e:
+        raise version_conflict_error(e)
     
     if not found_section:
         raise HTTPException(
@@ -313,55 +382,72 @@ async def accept_section_content(section_id: str, request: AcceptContentRequest)
             }
         )
     
-    # final_content'i güncelle
-    found_section["final_content"] = request.content
-    found_section["updated_at"] = datetime.utcnow().isoformat() + "Z"
-    
-    # Revision oluştur (basit mock)
-    revision = {
-        "id": f"rev-{section_id}-{int(datetime.utcnow().timestamp())}",
-        "section_id": section_id,
-        "content": request.content,
-        "revision_number": 1,  # Basitleştirilmiş, gerçekte revision sayısını tutmalıyız
-        "created_at": datetime.utcnow().isoformat() + "Z"
-    }
-    
-    return {
-        **found_section,
-        "revision": revision
-    }
+    # update_section_final içeriği revizyon geçmişine de ekler
+    response.headers["ETag"] = version_etag(found_section["version"])
+    return found_section
 
 
 @router.get("/{section_id}/revisions")
-async def get_section_revisions(section_id: str):
+async def list_section_revisions(
+    section_id: str,
+    page: int = Query(1, ge=1, description="Sayfa numarası"),
+    limit: int = Query(20, ge=1, le=100, description="Sayfa başına revizyon sayısı"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="revision_number sıralaması"),
+    include_content: bool = Query(True, description="False ise yalnızca numara ve tarih döner")
+):
     """
     📚 Bölümün revizyon geçmişini getirir
     
+    Her kabul edilen içerik bir revizyondur. Geçmiş farklar (delta) ve
+    aralıklı tam kopyalar olarak saklanır; sayfa tek geçişte üretilir.
+    
     Args:
         section_id: Section ID'si
-        
+        page: Sayfa numarası (default: 1)
+        limit: Sayfa başına revizyon (default: 20, max: 100)
+        order: asc (ilk revizyon önce) veya desc (son revizyon önce)
+        include_content: Revizyon içerikleri dönsün mü
+    
     Returns:
-        dict: {"revisions": [...], "total": int}
-        
+        dict: {"revisions": [...], "total": int, "page": int, "limit": int}
+    
     Raises:
         HTTPException: Section bulunamazsa 404 hatası
     """
     user_id = get_mock_user_id()
+    result = await run_in_threadpool(
+        get_section_revisions, section_id, user_id, page, limit, order, include_content
+    )
     
-    # Section'ı bul
-    found_section = None
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "section_not_found",
+                "message": f"'{section_id}' ID'li bölüm bulunamadı."
+            }
+        )
     
-    for project in MOCK_PROJECTS.values():
-        if project["user_id"] != user_id:
-            continue
-        
-        for section in project.get("sections", []):
-            if section["id"] == section_id:
-                found_section = section
-                break
-        
-        if found_section:
-            break
+    return result
+
+
+@router.get("/{section_id}/revisions/{revision_number}")
+async def get_section_revision_by_number(section_id: str, revision_number: int):
+    """
+    📄 Bölümün belirli bir revizyonunu getirir
+    
+    Args:
+        section_id: Section ID'si
+        revision_number: Revizyon numarası (1'den başlar)
+    
+    Returns:
+        dict: id, section_id, content, revision_number, created_at
+    
+    Raises:
+        HTTPException: Section veya revizyon bulunamazsa 404 hatası
+    """
+    user_id = get_mock_user_id()
+    _, found_section = await run_in_threadpool(get_section_by_id, section_id, user_id)
     
     if not found_section:
         raise HTTPException(
@@ -372,21 +458,16 @@ async def get_section_revisions(section_id: str):
             }
         )
     
-    # Mock revisions (gerçek uygulamada database'den gelecek)
-    revisions = []
-    
-    # Eğer final_content varsa, bir revizyon oluştur
-    if found_section.get("final_content"):
-        revisions.append({
-            "id": f"rev-{section_id}-1",
-            "section_id": section_id,
-            "content": found_section["final_content"],
-            "revision_number": 1,
-            "created_at": found_section["updated_at"]
-        })
-    
-    return {
-        "revisions": revisions,
-        "total": len(revisions)
-    }
+    revision = await run_in_threadpool(get_section_revision, section_id, revision_number, user_id)
+    
+    if not revision:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "revision_not_found",
+                "message": f"'{section_id}' bölümünün {revision_number} numaralı revizyonu bulunamadı."
+            }
+        )
+    
+    return revision
 
@@ -3,41 +3,63 @@ Templates Router
 Şablon listesi ve detaylarını sağlar.
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from data.mock_templates import get_all_templates, get_template_by_id
+from fastapi import APIRouter, HTTPException, Header, Response
+from typing import List, Dict, Any, Optional
+from config.settings import settings
+from data.template_registry import template_registry
+from utils.etag import etag_matches
 
 router = APIRouter(prefix="/api/v1/templates", tags=["Templates"])
 
 
+def cached_template_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """
+    Hazır gövdeyi ETag ve Cache-Control ile döndürür
+    
+    Şablonlar uygulama çalışırken değişmez; gövde kayıt defteri kurulurken
+    bir kez serileştirilir. İstemcinin ETag'i güncelse gövdesiz 304 döner.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.TEMPLATES_CACHE_MAX_AGE_SECONDS}"
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/", response_model=List[Dict[str, Any]])
-async def list_templates():
+async def list_templates(if_none_match: Optional[str] = Header(None)):
     """
     📋 Tüm proje şablonlarını listeler
     
+    Args:
+        if_none_match: Önceki yanıttaki ETag
+    
     Returns:
-        List[Dict]: Mevcut tüm şablonlar (TÜBİTAK 2209-A, 1001, 1003, vb.)
+        List[Dict]: Mevcut tüm şablonlar (TÜBİTAK 2209-A, 1001, 1003, vb.) veya 304
     """
-    return get_all_templates()
+    return cached_template_response(template_registry.body, template_registry.etag, if_none_match)
 
 
 @router.get("/{template_id}", response_model=Dict[str, Any])
-async def get_template(template_id: str):
+async def get_template(template_id: str, if_none_match: Optional[str] = Header(None)):
     """
     📄 Belirli bir şablonu getirir
     
     Args:
         template_id: Şablon ID'si (örn: tubitak-2209a)
-        
+        if_none_match: Önceki yanıttaki ETag
+    
     Returns:
-        Dict: Şablon detayları ve bölümleri
-        
+        Dict: Şablon detayları ve bölümleri veya 304
+    
     Raises:
         HTTPException: Şablon bulunamazsa 404 hatası
     """
-    template = get_template_by_id(template_id)
+    cached = template_registry.template_body(template_id)
     
-    if not template:
+    if not cached:
         raise HTTPException(
             status_code=404,
             detail={
@@ -46,5 +68,5 @@ async def get_template(template_id: str):
             }
         )
     
-    return template
-
+    body, etag = cached
+    return cached_template_response(body, etag, if_none_match)
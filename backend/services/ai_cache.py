@@ -0,0 +1,136 @@
+"""
+AI Yanıt Cache'i
+Aynı prompt için tekrar Gemini çağrısı yapmamak üzere içerik adresli, LRU + TTL cache
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from config.settings import settings
+
+
+@dataclass
+class CacheEntry:
+    """Cache kaydı"""
+    value: str
+    size_bytes: int
+    expires_at: float
+
+
+class AIResponseCache:
+    """
+    Prompt hash'i ile adreslenen LRU cache
+    
+    Kayıt sayısı ve toplam byte boyutu sınırlıdır; sınır aşılınca en eski
+    kullanılan kayıtlar atılır. Süresi dolan kayıtlar okunurken silinir.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        """
+        Model adı ve prompt'tan cache anahtarı üretir
+        
+        Args:
+            model_name: Kullanılan Gemini modelinin adı
+            prompt: build_generate_prompt / build_revise_prompt çıktısı
+            
+        Returns:
+            str: SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Kayıt varsa ve süresi dolmamışsa değerini döndürür"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+    
+    def set(self, key: str, value: str):
+        """Değeri cache'e yazar, gerekirse eski kayıtları atar"""
+        size_bytes = len(key) + len(value.encode("utf-8"))
+        if size_bytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = CacheEntry(
+                value=value,
+                size_bytes=size_bytes,
+                expires_at=time.monotonic() + self.ttl_seconds
+            )
+            self.total_bytes += size_bytes
+            
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def clear(self):
+        """Tüm kayıtları siler (sayaçlar korunur)"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self) -> dict:
+        """Cache istatistiklerini döndürür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.AI_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size_bytes
+
+
+# Global cache instance
+ai_cache = AIResponseCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AI_CACHE_MAX_BYTES,
+    ttl_seconds=settings.AI_CACHE_TTL_SECONDS
+)
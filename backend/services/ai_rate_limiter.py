@@ -0,0 +1,392 @@
+"""
+AI kota yönetimi
+Gemini'ye giden istekleri token bucket ile dakikadaki istek (RPM) ve token (TPM)
+sınırına göre yumuşatır; bekleyen istekler kullanıcılar arasında sırayla dağıtılır
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Dict, List, Tuple, Deque
+from config.settings import settings
+
+# (bucket adı, kapasite, saniyedeki dolum, alınacak miktar)
+BucketRequest = Tuple[str, float, float, float]
+
+RPM_BUCKET = "ai:requests"
+TPM_BUCKET = "ai:tokens"
+
+# Kullanıcı kullanım geçmişinin penceresi (kotalar dakikalık)
+USAGE_WINDOW_SECONDS = 60
+
+# Kotayı kullanan kullanıcı (istek middleware'i atar; auth gelince gerçek ID)
+_current_user: ContextVar[str] = ContextVar("ai_rate_limit_user", default="anonymous")
+
+
+def set_current_user(user_id: str):
+    """Geçerli istek için kota sahibini belirler"""
+    _current_user.set(user_id)
+
+
+def get_current_user() -> str:
+    """Geçerli isteğin kota sahibi"""
+    return _current_user.get()
+
+
+def estimate_tokens(text: str) -> int:
+    """Metnin yaklaşık token sayısı (Gemini için ~4 karakter / token)"""
+    return max(len(text) // 4, 1)
+
+
+class RateLimitExceeded(Exception):
+    """Kota, isteğin süre sınırı içinde açılmayacak"""
+    
+    def __init__(self, retry_after: float):
+        super().__init__("AI kotası dolu, lütfen biraz sonra tekrar deneyin")
+        self.retry_after = retry_after
+
+
+# --- Bucket store'ları ---
+
+class MemoryBucketStore:
+    """Bucket durumunu process içinde tutar (varsayılan)"""
+    
+    name = "memory"
+    # İşlemler mikro saniyelik; event loop'ta doğrudan çağrılır
+    blocking = False
+    
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+    
+    def take(self, requests: List[BucketRequest]) -> float:
+        """
+        Tüm bucket'lardan istenen miktarı birlikte almaya çalışır
+        
+        Returns:
+            float: 0 ise alındı; değilse yeterli token için beklenecek süre
+        """
+        with self._lock:
+            now = time.monotonic()
+            levels = [self._level(name, capacity, rate, now) for name, capacity, rate, _ in requests]
+            wait = max(
+                (amount - level) / rate if level < amount else 0.0
+                for level, (_, _, rate, amount) in zip(levels, requests)
+            )
+            if wait > 0:
+                return wait
+            for level, (name, _, _, amount) in zip(levels, requests):
+                self._buckets[name] = (level - amount, now)
+            return 0.0
+    
+    def charge(self, name: str, capacity: float, rate: float, amount: float):
+        """Koşulsuz düşüm (yanıt geldikten sonra çıktı token'ları için); eksiye inebilir"""
+        with self._lock:
+            now = time.monotonic()
+            self._buckets[name] = (self._level(name, capacity, rate, now) - amount, now)
+    
+    def peek(self, name: str, capacity: float, rate: float) -> float:
+        with self._lock:
+            return self._level(name, capacity, rate, time.monotonic())
+    
+    def _level(self, name: str, capacity: float, rate: float, now: float) -> float:
+        level, updated_at = self._buckets.get(name, (capacity, now))
+        return min(capacity, level + (now - updated_at) * rate)
+
+
+class SQLiteBucketStore:
+    """
+    Bucket durumunu yerel bir SQLite dosyasında tutar
+    
+    Aynı makinedeki birden fazla uvicorn worker'ı aynı kotayı paylaşır.
+    Her işlem tek satırlık kısa bir BEGIN IMMEDIATE transaction'ıdır;
+    worker'lar yarışırken busy timeout kadar bloklayabileceği için
+    limiter bu store'u event loop dışında, kendi thread'inde çağırır.
+    """
+    
+    name = "sqlite"
+    blocking = True
+    
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute(
+            "create table if not exists rate_buckets (name text primary key, level real not null, updated_at real not null)"
+        )
+        self._lock = threading.Lock()
+    
+    def take(self, requests: List[BucketRequest]) -> float:
+        with self._transaction() as conn:
+            now = time.time()
+            levels = [self._level(conn, name, capacity, rate, now) for name, capacity, rate, _ in requests]
+            wait = max(
+                (amount - level) / rate if level < amount else 0.0
+                for level, (_, _, rate, amount) in zip(levels, requests)
+            )
+            if wait > 0:
+                return wait
+            for level, (name, _, _, amount) in zip(levels, requests):
+                self._store(conn, name, level - amount, now)
+            return 0.0
+    
+    def charge(self, name: str, capacity: float, rate: float, amount: float):
+        with self._transaction() as conn:
+            now = time.time()
+            self._store(conn, name, self._level(conn, name, capacity, rate, now) - amount, now)
+    
+    def peek(self, name: str, capacity: float, rate: float) -> float:
+        with self._lock:
+            return self._level(self._conn, name, capacity, rate, time.time())
+    
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+            self._conn.execute("commit")
+    
+    def _level(self, conn, name: str, capacity: float, rate: float, now: float) -> float:
+        row = conn.execute("select level, updated_at from rate_buckets where name = ?", (name,)).fetchone()
+        if row is None:
+            return capacity
+        level, updated_at = row
+        return min(capacity, level + max(now - updated_at, 0.0) * rate)
+    
+    def _store(self, conn, name: str, level: float, now: float):
+        conn.execute(
+            "insert into rate_buckets (name, level, updated_at) values (?, ?, ?) "
+            "on conflict(name) do update set level = excluded.level, updated_at = excluded.updated_at",
+            (name, level, now)
+        )
+
+
+def create_bucket_store(store_url: Optional[str]):
+    """
+    AI_RATE_LIMIT_STORE_URL'e göre bucket store'u oluşturur
+    
+    Desteklenen URL'ler:
+        - boş / "memory://" -> MemoryBucketStore (worker başına ayrı kota)
+        - "sqlite:///path.db" -> SQLiteBucketStore (worker'lar arası ortak kota)
+    
+    Raises:
+        ValueError: URL şeması desteklenmiyorsa
+    """
+    if not store_url or store_url == "memory://":
+        return MemoryBucketStore()
+    if store_url.startswith("sqlite:///"):
+        return SQLiteBucketStore(store_url[len("sqlite:///"):])
+    raise ValueError(f"Desteklenmeyen AI_RATE_LIMIT_STORE_URL: {store_url}")
+
+
+# --- Limiter ---
+
+class AIRateLimiter:
+    """
+    RPM ve TPM token bucket'ları + kullanıcı bazında adil kuyruk
+    
+    Kota müsaitse istek hemen geçer. Değilse kullanıcının kuyruğuna girer;
+    kuyruklar round-robin işlendiği için çok istek gönderen bir kullanıcı
+    diğerlerini bekletemez (her turda kullanıcı başına bir istek).
+    
+    Bloklayan store'lar (SQLite) tek thread'lik ayrı bir executor'da
+    çağrılır: store zaten tek bağlantı ve kilitle çalışır, AI ve istek
+    thread havuzlarından da thread almaz.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, store, enabled: bool = True):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.store = store
+        self.enabled = enabled
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, int]]] = {}
+        self._turns: Deque[str] = deque()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._usage: Dict[str, Deque[Tuple[float, int]]] = {}
+        self._usage_swept_at = time.monotonic()
+        self._store_executor: Optional[ThreadPoolExecutor] = None
+    
+    async def acquire(self, tokens: int, timeout: Optional[float] = None, user_id: Optional[str] = None):
+        """
+        Bir Gemini çağrısı için kota alır, gerekirse sırasını bekler
+        
+        Args:
+            tokens: Tahmini prompt token sayısı
+            timeout: En fazla bekleme süresi (genelde isteğin kalan süresi)
+            user_id: Kota sahibi (verilmezse geçerli istekten alınır)
+        
+        Raises:
+            RateLimitExceeded: Kota timeout içinde açılmayacaksa
+        """
+        if not self.enabled:
+            return
+        
+        user_id = user_id or get_current_user()
+        # Kapasiteden büyük istek hiç geçemezdi; tek başına tüm dakikayı kullanır
+        tokens = min(tokens, self.tokens_per_minute)
+        
+        if not self._queues:
+            wait = await self._call_store(self.store.take, self._bucket_requests(tokens))
+            if wait == 0:
+                self._record_usage(user_id, tokens)
+                return
+            if timeout is not None and wait > timeout:
+                raise RateLimitExceeded(retry_after=wait)
+        
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(user_id)
+        if queue is None:
+            queue = self._queues[user_id] = deque()
+            self._turns.append(user_id)
+        queue.append((waiter, tokens))
+        
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitExceeded(retry_after=self._estimated_wait())
+    
+    async def record_output(self, tokens: int, user_id: Optional[str] = None):
+        """Yanıt geldikten sonra üretilen token'ları TPM kotasından düşer"""
+        if not self.enabled or tokens <= 0:
+            return
+        self._record_usage(user_id or get_current_user(), tokens, count_request=False)
+        await self._call_store(
+            self.store.charge, TPM_BUCKET, self.tokens_per_minute, self.tokens_per_minute / 60, tokens
+        )
+    
+    async def status(self, user_id: Optional[str] = None) -> dict:
+        """Güncel kota durumu"""
+        user_id = user_id or get_current_user()
+        usage = self._recent_usage(user_id)
+        rpm_available = await self._call_store(
+            self.store.peek, RPM_BUCKET, self.requests_per_minute, self.requests_per_minute / 60
+        )
+        tpm_available = await self._call_store(
+            self.store.peek, TPM_BUCKET, self.tokens_per_minute, self.tokens_per_minute / 60
+        )
+        return {
+            "enabled": self.enabled,
+            "store": self.store.name,
+            "requests_per_minute": {
+                "limit": self.requests_per_minute,
+                "available": max(int(rpm_available), 0),
+            },
+            "tokens_per_minute": {
+                "limit": self.tokens_per_minute,
+                "available": max(int(tpm_available), 0),
+            },
+            "queue": {
+                "waiting": sum(len(queue) for queue in self._queues.values()),
+                "users": len(self._queues),
+            },
+            "user": {
+                "user_id": user_id,
+                "requests_last_minute": sum(1 for _, tokens in usage if tokens >= 0),
+                "tokens_last_minute": sum(abs(tokens) for _, tokens in usage),
+            },
+        }
+    
+    async def _dispatch(self):
+        try:
+            while self._turns:
+                user_id = self._turns[0]
+                queue = self._queues[user_id]
+                
+                # Vazgeçilmiş (timeout / iptal) istekleri at
+                while queue and queue[0][0].done():
+                    queue.popleft()
+                if not queue:
+                    self._turns.popleft()
+                    del self._queues[user_id]
+                    continue
+                
+                waiter, tokens = queue[0]
+                wait = await self._call_store(self.store.take, self._bucket_requests(tokens))
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                if waiter.done():
+                    # Store beklenirken vazgeçildi (timeout); alınan kota geri verilir
+                    for name, capacity, rate, amount in self._bucket_requests(tokens):
+                        await self._call_store(self.store.charge, name, capacity, rate, -amount)
+                    continue
+                
+                queue.popleft()
+                waiter.set_result(None)
+                self._record_usage(user_id, tokens)
+                
+                # Sıra bir sonraki kullanıcıya geçer
+                self._turns.rotate(-1)
+                if not queue:
+                    self._turns.pop()
+                    del self._queues[user_id]
+        finally:
+            self._dispatcher = None
+    
+    async def _call_store(self, method: Callable, *args) -> Any:
+        if not self.store.blocking:
+            return method(*args)
+        if self._store_executor is None:
+            self._store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit-store")
+        return await asyncio.get_running_loop().run_in_executor(self._store_executor, method, *args)
+    
+    def _bucket_requests(self, tokens: int) -> List[BucketRequest]:
+        return [
+            (RPM_BUCKET, self.requests_per_minute, self.requests_per_minute / 60, 1),
+            (TPM_BUCKET, self.tokens_per_minute, self.tokens_per_minute / 60, tokens),
+        ]
+    
+    def _estimated_wait(self) -> float:
+        # Kuyruktaki her istek için ortalama bir RPM aralığı
+        waiting = sum(len(queue) for queue in self._queues.values())
+        return (waiting + 1) * 60 / self.requests_per_minute
+    
+    def _record_usage(self, user_id: str, tokens: int, count_request: bool = True):
+        # Çıktı token'ları negatif işaretle tutulur (istek sayısına katılmaz)
+        now = time.monotonic()
+        if now - self._usage_swept_at >= USAGE_WINDOW_SECONDS:
+            self._evict_idle_users(now)
+        self._recent_usage(user_id)
+        usage = self._usage.setdefault(user_id, deque())
+        usage.append((now, tokens if count_request else -tokens))
+    
+    def _evict_idle_users(self, now: float):
+        # Son kullanımı pencere dışında kalan (kotası tamamen dolmuş) kullanıcılar silinir;
+        # yoksa AI'ı bir kez kullanan her kullanıcı sözlükte kalırdı
+        cutoff = now - USAGE_WINDOW_SECONDS
+        idle = [user_id for user_id, usage in self._usage.items() if not usage or usage[-1][0] < cutoff]
+        for user_id in idle:
+            del self._usage[user_id]
+        self._usage_swept_at = now
+    
+    def _recent_usage(self, user_id: str) -> Deque[Tuple[float, int]]:
+        usage = self._usage.get(user_id, deque())
+        cutoff = time.monotonic() - USAGE_WINDOW_SECONDS
+        while usage and usage[0][0] < cutoff:
+            usage.popleft()
+        if not usage:
+            self._usage.pop(user_id, None)
+        return usage
+
+
+# Global limiter instance
+ai_rate_limiter = AIRateLimiter(
+    requests_per_minute=settings.AI_RATE_LIMIT_RPM,
+    tokens_per_minute=settings.AI_RATE_LIMIT_TPM,
+    store=create_bucket_store(settings.AI_RATE_LIMIT_STORE_URL),
+    enabled=settings.AI_RATE_LIMIT_ENABLED
+)
@@ -0,0 +1,387 @@
+"""
+AI çağrıları için dayanıklılık katmanı
+Geçici hatalarda jitter'lı üstel bekleme ile yeniden deneme, model bazında
+circuit breaker, istekten gelen süre sınırı (deadline) ve model yedeklemesi
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Iterable, Callable, Awaitable, TypeVar
+from google.api_core import exceptions as google_exceptions
+from config.settings import settings
+from services.ai_rate_limiter import ai_rate_limiter, RateLimitExceeded
+from services.metrics import ai_upstream_latency, ai_retries, ai_fallbacks
+
+T = TypeVar("T")
+
+
+# --- Hatalar ---
+
+class AIServiceError(Exception):
+    """Dayanıklılık katmanının ürettiği hatalar (HTTP durum koduyla)"""
+    status_code = 500
+
+
+class AIUnavailableError(AIServiceError):
+    """Tüm modeller denendi veya circuit açık; Gemini şu an kullanılamıyor"""
+    status_code = 503
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AIDeadlineExceeded(AIServiceError):
+    """İsteğin süre sınırı Gemini yanıtı gelmeden doldu"""
+    status_code = 504
+
+
+class CircuitOpenError(AIUnavailableError):
+    """Modelin circuit'i açık, çağrı yapılmadan hemen reddedildi"""
+
+
+class AIRateLimitExceeded(AIUnavailableError):
+    """AI kotası süre sınırı içinde açılmayacak"""
+    status_code = 429
+
+
+def retry_after_header(error: Exception) -> Optional[Dict[str, str]]:
+    """429/503 yanıtları için Retry-After header'ı (kota dolu veya circuit açıksa)"""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        return None
+    return {"Retry-After": str(max(int(retry_after + 0.999), 1))}
+
+
+# 429 / 5xx ve bağlantı hataları geçicidir, tekrar denemeye değer
+RETRYABLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Hata aynı modelle tekrar denenebilir mi"""
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def is_fallback_error(error: Exception) -> bool:
+    """Hata durumunda sıradaki modele geçilebilir mi"""
+    return (
+        is_retryable_error(error)
+        or isinstance(error, (CircuitOpenError, google_exceptions.NotFound))
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Jitter'lı üstel bekleme süresi ("full jitter")
+    
+    Aynı anda hata alan isteklerin hep birlikte tekrar denemesini önlemek
+    için süre [0, min(max, base * 2^attempt)] aralığından rastgele seçilir.
+    
+    Args:
+        attempt: Kaçıncı tekrar (0'dan başlar)
+    
+    Returns:
+        float: Beklenecek süre (saniye)
+    """
+    ceiling = min(
+        settings.AI_RETRY_MAX_DELAY_SECONDS,
+        settings.AI_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+    )
+    return random.uniform(0, ceiling)
+
+
+# --- Deadline ---
+
+# İsteğin bitmesi gereken an (time.monotonic); middleware tarafından atanır
+_request_deadline: ContextVar[Optional[float]] = ContextVar("ai_request_deadline", default=None)
+
+
+def set_request_deadline(timeout: Optional[float]):
+    """
+    Geçerli istek (context) için süre sınırı koyar
+    
+    Args:
+        timeout: Saniye cinsinden süre; None ise sınır kaldırılır
+    """
+    _request_deadline.set(time.monotonic() + timeout if timeout is not None else None)
+
+
+def get_request_deadline() -> float:
+    """
+    Geçerli isteğin deadline'ını döndürür
+    
+    Context'te deadline yoksa (ör. arka plan işi) AI_REQUEST_TIMEOUT_SECONDS
+    kadar süre verilir.
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        deadline = time.monotonic() + settings.AI_REQUEST_TIMEOUT_SECONDS
+    return deadline
+
+
+def remaining_time(deadline: float) -> float:
+    """Deadline'a kalan süre (saniye, negatif olabilir)"""
+    return deadline - time.monotonic()
+
+
+# --- Circuit breaker ---
+
+class CircuitBreaker:
+    """
+    Model bazında basit circuit breaker
+    
+    Durumlar:
+        - closed: Çağrılar serbest, art arda hatalar sayılır
+        - open: failure_threshold'a ulaşıldı; reset_timeout boyunca çağrılar
+          Gemini'ye gitmeden reddedilir
+        - half_open: Süre doldu; tek bir deneme çağrısına izin verilir,
+          başarılıysa closed, değilse tekrar open
+    """
+    
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+    
+    @property
+    def state(self) -> str:
+        """Güncel durum (open süresi dolduysa half_open)"""
+        with self._lock:
+            return self._current_state()
+    
+    def allow_request(self) -> bool:
+        """Çağrı yapılabilir mi (half_open'da yalnızca tek deneme)"""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+    
+    def retry_after(self) -> float:
+        """Circuit'in tekrar denemeye açılmasına kalan süre"""
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+    
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+    
+    def release_probe(self):
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def reset(self):
+        self.record_success()
+    
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+            }
+    
+    def _current_state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return self._state
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(model_name: str) -> CircuitBreaker:
+    """Model için (process başına tek) circuit breaker döndürür"""
+    breaker = _breakers.get(model_name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(model_name, CircuitBreaker(
+                model_name,
+                failure_threshold=settings.AI_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.AI_CIRCUIT_RESET_SECONDS
+            ))
+    return breaker
+
+
+def circuit_status() -> Dict[str, Dict[str, Any]]:
+    """Tüm circuit breaker'ların durumu (debug için)"""
+    return {name: breaker.status() for name, breaker in list(_breakers.items())}
+
+
+def reset_circuits():
+    """Tüm circuit'leri kapatır (benchmark ve debug için)"""
+    for breaker in list(_breakers.values()):
+        breaker.reset()
+
+
+# --- Çağrı yürütme ---
+
+async def call_with_retry(
+    model,
+    operation: Callable[[Any], Awaitable[T]],
+    deadline: float,
+    prompt_tokens: int = 1
+) -> T:
+    """
+    Tek bir model üzerinde işlemi retry + circuit breaker ile çalıştırır
+    
+    Her deneme öncesinde AI kotasından pay alınır (bkz. ai_rate_limiter).
+    
+    Args:
+        model: Çağrılacak model
+        operation: model alıp Gemini çağrısını yapan coroutine fonksiyonu
+        deadline: İşlemin bitmesi gereken an (time.monotonic)
+        prompt_tokens: Kotadan düşülecek tahmini prompt token sayısı
+    
+    Returns:
+        operation'ın sonucu
+    
+    Raises:
+        CircuitOpenError: Circuit açıksa
+        AIRateLimitExceeded: Kota süre sınırı içinde açılmayacaksa
+        AIDeadlineExceeded: Süre dolduysa
+        Exception: Tekrar denemeler tükendiyse son hata
+    """
+    model_name = getattr(model, "model_name", "")
+    breaker = get_circuit_breaker(model_name)
+    max_attempts = max(settings.AI_RETRY_MAX_ATTEMPTS, 1)
+    
+    for attempt in range(max_attempts):
+        if not breaker.allow_request():
+            raise CircuitOpenError(
+                f"{breaker.name} geçici olarak devre dışı (circuit açık)",
+                retry_after=breaker.retry_after()
+            )
+        
+        try:
+            await ai_rate_limiter.acquire(prompt_tokens, timeout=max(remaining_time(deadline), 0.0))
+        except RateLimitExceeded as e:
+            breaker.release_probe()
+            raise AIRateLimitExceeded(str(e), retry_after=e.retry_after)
+        except asyncio.CancelledError:
+            breaker.release_probe()
+            raise
+        
+        timeout = remaining_time(deadline)
+        if timeout <= 0:
+            breaker.release_probe()
+            raise AIDeadlineExceeded("Gemini yanıtı süre sınırı içinde alınamadı")
+        
+        started = time.perf_counter()
+        try:
+            # Süre dolarsa beklemeyi bırakırız; executor'daki çağrı arka planda biter
+            result = await asyncio.wait_for(operation(model), timeout=timeout)
+        except asyncio.TimeoutError:
+            ai_upstream_latency.observe((model_name, "timeout"), time.perf_counter() - started)
+            breaker.record_failure()
+            raise AIDeadlineExceeded("Gemini yanıtı süre sınırı içinde alınamadı")
+        except asyncio.CancelledError:
+            # İstemci ayrıldı; sonuç bilinmiyor, half_open denemesini serbest bırak
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            ai_upstream_latency.observe((model_name, "error"), time.perf_counter() - started)
+            if not is_retryable_error(e):
+                # Kalıcı hata (ör. geçersiz istek): servis yanıt veriyor demektir
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            
+            delay = backoff_delay(attempt)
+            if attempt + 1 >= max_attempts or remaining_time(deadline) <= delay:
+                raise
+            ai_retries.inc((model_name,))
+            await asyncio.sleep(delay)
+            continue
+        
+        ai_upstream_latency.observe((model_name, "ok"), time.perf_counter() - started)
+        breaker.record_success()
+        return result
+    
+    raise AIUnavailableError("Gemini çağrısı başarısız")
+
+
+async def run_with_resilience(
+    models: Iterable,
+    operation: Callable[[Any], Awaitable[T]],
+    deadline: Optional[float] = None,
+    prompt_tokens: int = 1
+) -> T:
+    """
+    İşlemi sırayla modeller üzerinde dener (birincil model + yedekler)
+    
+    Bir model geçici hatalarla tükenirse, circuit'i açıksa veya bulunamazsa
+    sıradakine geçilir. Kalıcı hatalar (ör. geçersiz istek) hemen yükseltilir.
+    
+    Args:
+        models: Denenecek modeller (öncelik sırasıyla)
+        operation: model alıp Gemini çağrısını yapan coroutine fonksiyonu
+        deadline: Süre sınırı; verilmezse istekten alınır
+        prompt_tokens: Kotadan düşülecek tahmini prompt token sayısı
+    
+    Returns:
+        operation'ın sonucu
+    
+    Raises:
+        AIUnavailableError: Hiçbir model yanıt veremediyse
+        AIRateLimitExceeded: Kota süre sınırı içinde açılmayacaksa
+        AIDeadlineExceeded: Süre dolduysa
+    """
+    if deadline is None:
+        deadline = get_request_deadline()
+    
+    last_error: Optional[Exception] = None
+    retry_after: Optional[float] = None
+    
+    for model in models:
+        try:
+            return await call_with_retry(model, operation, deadline, prompt_tokens)
+        except AIDeadlineExceeded:
+            raise
+        except Exception as e:
+            if not is_fallback_error(e):
+                raise
+            ai_fallbacks.inc((getattr(model, "model_name", ""),))
+            last_error = e
+            if isinstance(e, CircuitOpenError):
+                retry_after = e.retry_after if retry_after is None else min(retry_after, e.retry_after)
+        
+        if remaining_time(deadline) <= 0:
+            raise AIDeadlineExceeded("Gemini yanıtı süre sınırı içinde alınamadı")
+    
+    raise AIUnavailableError(
+        f"Gemini şu anda yanıt veremiyor: {last_error}",
+        retry_after=retry_after
+    ) from last_error
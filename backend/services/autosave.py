@@ -0,0 +1,378 @@
+"""
+Otomatik kayıt birleştirici
+Klavye kaynaklı taslak (draft_content) yazmalarını bölüm başına kısa bir süre
+bellekte toplayıp store'a tek yazma olarak aktarır
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from data.mock_projects import get_section_by_id, update_section_draft
+from data.project_repository import VersionConflict
+
+# Proje okumasında yazılamayan taslakların bölüm ID'lerini taşıyan başlık
+DRAFT_NOT_SAVED_HEADER = "X-Draft-Not-Saved"
+
+
+def apply_draft_edits(content: str, edits: List[dict]) -> str:
+    """
+    Metin değişikliklerini sırayla uygular
+    
+    Her değişiklik [start, end) aralığını text ile değiştirir; konumlar
+    bir önceki değişiklik uygulanmış metne göredir (Unicode karakter indeksi).
+    
+    Args:
+        content: Güncel taslak
+        edits: {"start", "end", "text"} listesi
+    
+    Returns:
+        str: Yeni taslak
+    
+    Raises:
+        ValueError: Aralık metnin dışındaysa
+    """
+    for edit in edits:
+        start, end = edit["start"], edit["end"]
+        if start > end or end > len(content):
+            raise ValueError(f"Geçersiz aralık [{start}, {end}), taslak uzunluğu {len(content)}")
+        content = content[:start] + edit["text"] + content[end:]
+    return content
+
+
+class DraftNotSaved(Exception):
+    """
+    Daha önce kabul edilen (200 dönen) taslak store'a yazılamadı
+    
+    İstemcinin bir sonraki yazmasında fırlatılır (araya projeyi okuma
+    girdiyse orada bildirilir, bkz. take_failures); istemci bölümü yeniden
+    okuyup taslağını tekrar göndermelidir.
+    """
+
+
+class _PendingDraft:
+    """Store'a henüz yazılmamış taslak"""
+    
+    __slots__ = ("section", "user_id", "content", "version", "first_at", "last_at", "submits", "done", "failed")
+    
+    def __init__(self, section: dict, user_id: str, content: str, version: int):
+        self.section = section
+        self.user_id = user_id
+        self.content = content
+        # Yazma tamamlandığında bölümün alacağı sürüm (istemciye bu döner)
+        self.version = version
+        self.first_at = 0.0
+        self.last_at = 0.0
+        self.submits = 0
+        self.done = asyncio.Event()
+        # Yazma başarısız olduysa True (üzerine kurulan pencereler de yazılmaz)
+        self.failed = False
+    
+    @property
+    def section_id(self) -> str:
+        return self.section["id"]
+    
+    @property
+    def project_id(self) -> str:
+        return self.section["project_id"]
+
+
+class DraftCoalescer:
+    """
+    Bölüm taslağı yazmalarını birleştirir
+    
+    Bir bölüme gelen yazmalar bellekte tutulur; son yazmadan `debounce`
+    saniye sonra (sürekli yazılıyorsa en geç `max_delay` saniye sonra)
+    yalnızca son içerik store'a yazılır. Okuyan endpoint'ler önce
+    `flush_project` / `flush_section` çağırır; yazılmamış taslak okunmaz.
+    
+    Sürümler store ile aynı anlamı taşır: birleştirilen yazmalar tek bir
+    store yazması olduğu için bölüm sürümü pencere başına bir artar ve
+    If-Match bu bekleyen sürüme göre kontrol edilir.
+    
+    Yazma başarısız olursa (ör. başka bir worker araya yazdı) taslak
+    istemciye 200 ile dönmüş olduğundan hata bölüm için saklanır ve aynı
+    kullanıcının bir sonraki yazmasında fırlatılır (412 veya 409) ya da,
+    kullanıcı yazmayı bıraktıysa, projeyi okumasında bildirilir
+    (take_failures); o pencerenin üzerine kurulmuş bekleyen taslak da atılır.
+    
+    Bekleyen taslaklar process belleğindedir: okumadan önce yazma yalnızca
+    aynı worker'da geçerlidir. Birden fazla worker ortak SQLite store ile
+    çalışırken başka worker'a düşen okuma, taslağı en fazla `max_delay`
+    kadar eski görebilir (AUTOSAVE_DEBOUNCE_MS=0 ile her yazma doğrudan
+    store'a gider).
+    
+    Attributes:
+        debounce: Son yazmadan sonra beklenecek süre (saniye, 0: doğrudan yazılır)
+        max_delay: İlk bekleyen yazmadan sonra en fazla beklenecek süre (saniye)
+    """
+    
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self.submitted = 0
+        self.written = 0
+        self.conflicts = 0
+        self.failed = 0
+        self._pending: Dict[str, _PendingDraft] = {}
+        # Yazılamayan taslaklar: section_id -> (user_id, project_id, hata);
+        # sonraki yazmada veya proje okumasında bildirilir
+        self._failures: Dict[str, Tuple[str, str, Exception]] = {}
+        # Yazılmakta olan taslaklar (yeni yazmalar bunun üzerine kurulur)
+        self._flushing: Dict[str, _PendingDraft] = {}
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(
+        self,
+        section_id: str,
+        user_id: str,
+        content: Optional[str] = None,
+        edits: Optional[List[dict]] = None,
+        expected_version: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Taslak yazmasını kabul eder
+        
+        Args:
+            section_id: Section ID'si
+            user_id: Kullanıcı ID'si
+            content: Yeni taslağın tamamı
+            edits: content yerine güncel taslağa uygulanacak değişiklikler
+            expected_version: If-Match ile gelen sürüm
+        
+        Returns:
+            dict: Bölümün yazma sonrası hali (version dahil) veya None if not found
+        
+        Raises:
+            VersionConflict: expected_version güncel (veya bekleyen) sürüm değilse
+                veya önceki taslak sürüm uyuşmazlığı yüzünden yazılamadıysa
+            DraftNotSaved: Önceki taslak başka bir hatayla yazılamadıysa
+            ValueError: edits taslağa uygulanamazsa
+        """
+        self.submitted += 1
+        self._raise_failure(section_id, user_id)
+        if self.debounce <= 0:
+            return await self._write_through(section_id, user_id, content, edits, expected_version)
+        
+        entry = self._pending.get(section_id)
+        if entry is None:
+            entry = await self._new_entry(section_id, user_id)
+            if entry is None:
+                return None
+        if entry.user_id != user_id:
+            return None
+        
+        current_version = entry.version if entry.submits else entry.version - 1
+        if expected_version is not None and expected_version != current_version:
+            self._discard_if_clean(entry)
+            raise VersionConflict(current_version)
+        
+        try:
+            entry.content = apply_draft_edits(entry.content, edits) if edits is not None else content
+        except ValueError:
+            self._discard_if_clean(entry)
+            raise
+        
+        loop = asyncio.get_running_loop()
+        entry.last_at = loop.time()
+        if not entry.submits:
+            entry.first_at = entry.last_at
+            task = loop.create_task(self._flush_later(entry))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        entry.submits += 1
+        
+        return {
+            **entry.section,
+            "draft_content": entry.content,
+            "updated_at": datetime.utcnow().isoformat() + "Z",
+            "version": entry.version
+        }
+    
+    async def flush_section(self, section_id: str):
+        """Bölümün bekleyen taslağını yazar ve devam eden yazmayı bekler"""
+        entry = self._pending.get(section_id)
+        # submits == 0: başka bir submit'in henüz doğrulamadığı boş pencere
+        if entry is not None and entry.submits:
+            await self._flush(entry)
+        flushing = self._flushing.get(section_id)
+        if flushing is not None:
+            await flushing.done.wait()
+    
+    async def flush_project(self, project_id: str):
+        """Projenin tüm bölümlerindeki bekleyen taslakları yazar (okumadan önce)"""
+        section_ids = {
+            entry.section_id
+            for entry in (*self._pending.values(), *self._flushing.values())
+            if entry.project_id == project_id
+        }
+        for section_id in section_ids:
+            await self.flush_section(section_id)
+    
+    async def flush_all(self):
+        """Tüm bekleyen taslakları yazar (kapanışta)"""
+        for section_id in list(self._pending) + list(self._flushing):
+            await self.flush_section(section_id)
+    
+    def take_failures(self, project_id: str, user_id: str) -> List[str]:
+        """
+        Kullanıcının projede yazılamayan taslaklarını bildirir
+        
+        Okuma endpoint'leri flush_project'ten sonra çağırır; kullanıcı yazmayı
+        bıraktıysa kaybolan taslak böylece bildirilir. Bildirilen hatalar
+        silinir, sonraki yazmada tekrar fırlatılmaz.
+        
+        Args:
+            project_id: Proje ID'si
+            user_id: Kullanıcı ID'si
+        
+        Returns:
+            List[str]: Taslağı yazılamayan bölümlerin ID'leri
+        """
+        section_ids = [
+            section_id
+            for section_id, (owner, failed_project_id, _) in self._failures.items()
+            if owner == user_id and failed_project_id == project_id
+        ]
+        for section_id in section_ids:
+            del self._failures[section_id]
+        return section_ids
+    
+    def stats(self) -> dict:
+        """Yazma birleştirme istatistikleri"""
+        return {
+            "debounce_ms": int(self.debounce * 1000),
+            "max_delay_ms": int(self.max_delay * 1000),
+            "submitted": self.submitted,
+            "written": self.written,
+            "conflicts": self.conflicts,
+            "failed": self.failed,
+            "pending": len(self._pending),
+        }
+    
+    # --- Yardımcılar ---
+    
+    async def _write_through(
+        self,
+        section_id: str,
+        user_id: str,
+        content: Optional[str],
+        edits: Optional[List[dict]],
+        expected_version: Optional[int]
+    ) -> Optional[dict]:
+        if edits is not None:
+            _, section = await run_in_threadpool(get_section_by_id, section_id, user_id)
+            if not section:
+                return None
+            content = apply_draft_edits(section["draft_content"] or "", edits)
+            # Değişiklikler okunan sürüme göredir; arada yazılırsa 412
+            if expected_version is None:
+                expected_version = section.get("version", 1)
+        section = await run_in_threadpool(update_section_draft, section_id, content, user_id, expected_version)
+        if section:
+            self.written += 1
+        return section
+    
+    def _raise_failure(self, section_id: str, user_id: str):
+        failure = self._failures.get(section_id)
+        if failure is None or failure[0] != user_id:
+            return
+        del self._failures[section_id]
+        error = failure[2]
+        if isinstance(error, VersionConflict):
+            raise VersionConflict(error.current_version)
+        raise DraftNotSaved(str(error))
+    
+    async def _new_entry(self, section_id: str, user_id: str) -> Optional[_PendingDraft]:
+        # Yazılmakta olan taslak varsa yeni pencere onun sonucundan başlar
+        flushing = self._flushing.get(section_id)
+        if flushing is not None:
+            if flushing.user_id != user_id:
+                return None
+            section, content, version = flushing.section, flushing.content, flushing.version
+        else:
+            _, section = await run_in_threadpool(get_section_by_id, section_id, user_id)
+            if not section:
+                return None
+            section = dict(section)
+            content, version = section["draft_content"] or "", section.get("version", 1)
+        
+        # Beklerken başka bir istek pencereyi açmış olabilir
+        entry = self._pending.get(section_id)
+        if entry is None:
+            entry = _PendingDraft(section, user_id, content, version + 1)
+            self._pending[section_id] = entry
+        return entry
+    
+    def _discard_if_clean(self, entry: _PendingDraft):
+        if not entry.submits and self._pending.get(entry.section_id) is entry:
+            del self._pending[entry.section_id]
+    
+    async def _flush_later(self, entry: _PendingDraft):
+        loop = asyncio.get_running_loop()
+        while self._pending.get(entry.section_id) is entry:
+            deadline = min(entry.last_at + self.debounce, entry.first_at + self.max_delay)
+            delay = deadline - loop.time()
+            if delay <= 0:
+                await self._flush(entry)
+                return
+            await asyncio.sleep(delay)
+    
+    async def _flush(self, entry: _PendingDraft):
+        section_id = entry.section_id
+        if self._pending.get(section_id) is entry:
+            del self._pending[section_id]
+            previous = self._flushing.get(section_id)
+            self._flushing[section_id] = entry
+            # Yazma ayrı task'ta: flush'ı bekleyen istek iptal edilse de tamamlanır
+            task = asyncio.get_running_loop().create_task(self._write(entry, previous))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await entry.done.wait()
+    
+    async def _write(self, entry: _PendingDraft, previous: Optional[_PendingDraft]):
+        section_id = entry.section_id
+        try:
+            if previous is not None:
+                await previous.done.wait()
+                if previous.failed:
+                    # Bu pencerenin sürümü yazılamayan taslağa dayanıyor; hata zaten kayıtlı
+                    entry.failed = True
+                    self._drop_pending(section_id)
+                    return
+            # None: bölüm (proje) bu arada silinmiş
+            if await run_in_threadpool(
+                update_section_draft, section_id, entry.content, entry.user_id, entry.version - 1
+            ):
+                self.written += 1
+        except VersionConflict as e:
+            # Başka bir worker araya yazdı; istemcinin sonraki yazması 412 alır
+            self.conflicts += 1
+            self._record_failure(entry, e)
+        except Exception as e:
+            self._record_failure(entry, e)
+        finally:
+            if self._flushing.get(section_id) is entry:
+                del self._flushing[section_id]
+            entry.done.set()
+    
+    def _record_failure(self, entry: _PendingDraft, error: Exception):
+        self.failed += 1
+        entry.failed = True
+        self._failures[entry.section_id] = (entry.user_id, entry.project_id, error)
+        self._drop_pending(entry.section_id)
+        print(f"⚠️ Taslak yazılamadı ({entry.section_id}), sonraki yazmada veya okumada bildirilecek: {error}")
+    
+    def _drop_pending(self, section_id: str):
+        # Bekleyen pencere yazılamayan taslağın sürümü üzerine kuruldu; yazılamaz
+        pending = self._pending.pop(section_id, None)
+        if pending is not None:
+            pending.failed = True
+            pending.done.set()
+
+
+draft_coalescer = DraftCoalescer(
+    debounce=settings.AUTOSAVE_DEBOUNCE_MS / 1000,
+    max_delay=settings.AUTOSAVE_MAX_DELAY_MS / 1000
+)
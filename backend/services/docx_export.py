@@ -0,0 +1,419 @@
+"""
+DOCX Export Service
+Projeyi şablonun .docx formuna doldurur; şablonlar açılışta bir kez derlenir
+"""
+
+import hashlib
+import io
+import os
+import threading
+import zipfile
+from typing import Callable, Dict, List
+from config.settings import settings
+from data.template_registry import get_all_templates, get_template_by_id
+from services.docx_template import CompiledDocxTemplate, DocxTemplateCompiler, xml_text
+
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Doldurma kodu değiştiğinde artırılır; eski export'lar cache'ten düşer
+EXPORT_LAYOUT_VERSION = 1
+
+# Repo kökündeki docs/ klasörü (EXPORT_2209A_TEMPLATE_PATH ile değiştirilebilir)
+DEFAULT_2209A_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "docs",
+    "2209-A_arastirma_onerisi_formu_09102025.docx"
+)
+
+WORK_SCHEDULE_COLUMNS = ["date_range", "activities", "responsible", "success_criteria_contribution"]
+RISK_MANAGEMENT_COLUMNS = ["risk", "countermeasure"]
+RESEARCH_FACILITIES_COLUMNS = ["equipment_type_model", "project_usage"]
+
+
+class ExportTemplate:
+    """
+    Derlenmiş şablon ve metnini doldurduğu bölümler
+    
+    Attributes:
+        template_id: Şablon ID'si
+        compiled: Doldurmaya hazır .docx
+        text_sections: Şablonda metin alanı olan bölüm başlıkları (export
+            öncesi final_content kontrolü bu bölümler için yapılır)
+        version: Şablon dosyası ve doldurma düzeninin özeti (export cache anahtarında kullanılır)
+    """
+    
+    def __init__(self, template_id: str, compiled: CompiledDocxTemplate, text_sections: List[str], version: str):
+        self.template_id = template_id
+        self.compiled = compiled
+        self.text_sections = text_sections
+        self.version = version
+
+
+def template_version(docx_bytes: bytes) -> str:
+    """Şablon dosyasının ve doldurma düzeninin kısa özeti"""
+    digest = hashlib.sha256(docx_bytes)
+    digest.update(f"layout-{EXPORT_LAYOUT_VERSION}".encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+# --- Doldurma değerleri (context -> değer) ---
+
+def project_field(*path: str) -> Callable[[dict], str]:
+    """Proje içindeki iç içe bir alan (ör. general_info.applicant_name)"""
+    def value(context: dict) -> str:
+        current = context["project"]
+        for key in path:
+            current = (current or {}).get(key)
+        return current or ""
+    return value
+
+
+def section_text(title: str) -> Callable[[dict], str]:
+    """Bölümün export edilecek metni"""
+    return lambda context: context["sections"].get(title, "")
+
+
+def project_rows(*path: str) -> Callable[[dict], List[dict]]:
+    """Projedeki tablo satırları (ör. project_management.work_schedule)"""
+    def value(context: dict) -> List[dict]:
+        current = context["project"]
+        for key in path:
+            current = (current or {}).get(key)
+        return current or []
+    return value
+
+
+def wide_impact_output(index: int) -> Callable[[dict], str]:
+    """Yaygın etki tablosundaki index'inci kategorinin çıktıları"""
+    def value(context: dict) -> str:
+        rows = context["project"].get("wide_impact") or []
+        return rows[index].get("outputs", "") if index < len(rows) else ""
+    return value
+
+
+# --- 2209-A ---
+
+def compile_2209a_template(docx_bytes: bytes) -> ExportTemplate:
+    """
+    TÜBİTAK 2209-A araştırma önerisi formunu derler
+    
+    Doldurma noktaları formdaki başlık/etiket metinlerine göre bulunur.
+    Proje Yönetimi ve Yaygın Etki bölümleri formda tablolardan oluştuğu için
+    proje tablolarından doldurulur.
+    """
+    compiler = DocxTemplateCompiler(docx_bytes)
+    
+    # A. Genel bilgiler: etiketlerin yanına
+    general_rows = compiler.rows(compiler.find_table("Başvuru Sahibinin Adı Soyadı"))
+    for row, field in zip(general_rows, ["applicant_name", "research_title", "advisor_name", "institution"]):
+        paragraph = compiler.paragraphs(compiler.cells(row)[0])[0]
+        compiler.append_text(paragraph, project_field("general_info", field))
+    
+    # Özet ve anahtar kelimeler
+    summary_rows = compiler.rows(compiler.find_table("Anahtar Kelimeler"))
+    compiler.fill_cell(compiler.cells(summary_rows[0])[0], section_text("Projenin Özeti"), keep_paragraphs=1)
+    keywords_paragraph = compiler.paragraphs(compiler.cells(summary_rows[1])[0])[0]
+    compiler.append_text(keywords_paragraph, lambda context: " " + project_field("keywords")(context).strip())
+    
+    # 1. Bilimsel nitelik, 2. Yöntem
+    for anchor, value in [
+        ("Konunun Önemi ve Araştırma Önerisinin Bilimsel Niteliği", project_field("scientific_merit", "importance_and_quality")),
+        ("Amaç ve Hedefler", project_field("scientific_merit", "aims_and_objectives")),
+        ("Yöntem bölümünün;", section_text("Yöntem")),
+        ("BELİRTMEK İSTEDİĞİNİZ DİĞER KONULAR", section_text("Belirtmek İstediğiniz Diğer Konular")),
+    ]:
+        box = compiler.table_after(anchor)
+        compiler.fill_cell(compiler.cells(compiler.rows(box)[0])[0], value)
+    
+    # 3. Proje yönetimi tabloları
+    compiler.fill_rows(
+        compiler.find_table("Tarih Aralığı"), 1, WORK_SCHEDULE_COLUMNS,
+        project_rows("project_management", "work_schedule")
+    )
+    compiler.fill_rows(
+        compiler.find_table("En Önemli Riskler"), 1, RISK_MANAGEMENT_COLUMNS,
+        project_rows("project_management", "risk_management")
+    )
+    compiler.fill_rows(
+        compiler.find_table("Projede Kullanım Amacı"), 1, RESEARCH_FACILITIES_COLUMNS,
+        project_rows("project_management", "research_facilities")
+    )
+    
+    # 4. Yaygın etki: kategori satırlarının ikinci sütunu
+    impact_rows = compiler.rows(compiler.find_table("Çıktı, Etki ve Kazanımlar"))
+    for index, row in enumerate(impact_rows[1:]):
+        compiler.fill_cell(compiler.cells(row)[1], wide_impact_output(index))
+    
+    # 6. Ekler: kaynaklar başlığın altına
+    compiler.insert_after(compiler.find_paragraph("KAYNAKLAR"), section_text("Kaynakça"))
+    
+    return ExportTemplate(
+        "tubitak-2209a",
+        compiler.compile(),
+        text_sections=["Projenin Özeti", "Yöntem", "Belirtmek İstediğiniz Diğer Konular", "Kaynakça"],
+        version=template_version(docx_bytes)
+    )
+
+
+# --- Genel şablon (ayrı .docx formu olmayan programlar) ---
+
+_PARAGRAPH = '<w:p><w:pPr><w:spacing w:before="60" w:after="60"/><w:jc w:val="both"/>{extra}<w:rPr>{rpr}</w:rPr></w:pPr>{runs}</w:p>'
+_BODY_RPR = '<w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:cs="Arial"/><w:sz w:val="18"/><w:szCs w:val="18"/>'
+_BOLD_RPR = '<w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:cs="Arial"/><w:b/><w:sz w:val="18"/><w:szCs w:val="18"/>'
+_HEADING_RPR = '<w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:cs="Arial"/><w:b/><w:sz w:val="22"/><w:szCs w:val="22"/>'
+_CELL_BORDERS = (
+    '<w:tcBorders>'
+    + "".join(f'<w:{side} w:val="single" w:sz="4" w:space="0" w:color="000000"/>' for side in ("top", "left", "bottom", "right"))
+    + '</w:tcBorders>'
+)
+
+
+def _paragraph(text: str = "", rpr: str = _BODY_RPR, centered: bool = False) -> str:
+    run = f'<w:r><w:rPr>{rpr}</w:rPr><w:t xml:space="preserve">{xml_text(text)}</w:t></w:r>' if text else ""
+    extra = '<w:jc w:val="center"/>' if centered else ""
+    return _PARAGRAPH.format(extra=extra, rpr=rpr, runs=run).replace('<w:jc w:val="both"/><w:jc', "<w:jc")
+
+
+def _table(rows: List[List[str]], widths: List[int], header: bool = False) -> str:
+    grid = "".join(f'<w:gridCol w:w="{width}"/>' for width in widths)
+    body = ""
+    for index, row in enumerate(rows):
+        rpr = _BOLD_RPR if header and index == 0 else _BODY_RPR
+        body += "<w:tr>" + "".join(
+            f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/>{_CELL_BORDERS}</w:tcPr>{_paragraph(text, rpr)}</w:tc>'
+            for text, width in zip(row, widths)
+        ) + "</w:tr>"
+    return f'<w:tbl><w:tblPr><w:tblW w:w="{sum(widths)}" w:type="dxa"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>'
+
+
+def _zip_entry(name: str) -> zipfile.ZipInfo:
+    # Sabit tarih: aynı şablon her açılışta aynı byte'ları (ve sürümü) üretir
+    entry = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    entry.compress_type = zipfile.ZIP_DEFLATED
+    return entry
+
+
+def build_generic_docx(template: dict) -> bytes:
+    """
+    Şablondaki bölüm listesinden 2209-A düzeninde sade bir form üretir
+    
+    Args:
+        template: Şablon (id, name, sections)
+    
+    Returns:
+        bytes: .docx içeriği (derlenmeye hazır, ipucu metinleriyle)
+    """
+    body = [
+        _paragraph(f"TÜBİTAK {template['name'].replace('TÜBİTAK ', '')}", _HEADING_RPR, centered=True),
+        _paragraph("PROJE ÖNERİSİ FORMU", _HEADING_RPR, centered=True),
+        _paragraph(),
+        _paragraph("A. GENEL BİLGİLER", _HEADING_RPR),
+        _table([
+            ["Başvuru Sahibinin Adı Soyadı: "],
+            ["Projenin Başlığı: "],
+            ["Danışmanın / Yürütücünün Adı Soyadı: "],
+            ["Projenin Yürütüleceği Kurum/Kuruluş: "],
+        ], [9072]),
+        _paragraph(),
+        _paragraph("Anahtar Kelimeler: ", _BOLD_RPR),
+    ]
+    for index, section in enumerate(template["sections"], start=1):
+        body.append(_paragraph())
+        body.append(_paragraph(f"{index}. {section['title'].upper()}", _HEADING_RPR))
+        body.append(_table([[section.get("placeholder", "")]], [9072]))
+    
+    body += [
+        _paragraph(),
+        _paragraph("ÇALIŞMA TAKVİMİ", _HEADING_RPR),
+        _table([
+            ["Tarih Aralığı", "Faaliyetler", "Kim(ler) Tarafından Gerçekleştirileceği", "Başarı Ölçütü"],
+            ["", "", "", ""],
+        ], [1920, 2400, 2340, 2412], header=True),
+        _paragraph(),
+        _paragraph("RİSK YÖNETİMİ", _HEADING_RPR),
+        _table([["En Önemli Riskler", "Alınacak Tedbirler (B Planı)"], ["", ""]], [4536, 4536], header=True),
+    ]
+    
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><w:body>'
+        + "".join(body)
+        + '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+        '<w:pgMar w:top="1134" w:right="1134" w:bottom="1134" w:left="1134" w:header="709" w:footer="709" w:gutter="0"/>'
+        '</w:sectPr></w:body></w:document>'
+    )
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(_zip_entry("[Content_Types].xml"), (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        ))
+        archive.writestr(_zip_entry("_rels/.rels"), (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/>'
+            '</Relationships>'
+        ))
+        archive.writestr(_zip_entry("word/document.xml"), document)
+    return buffer.getvalue()
+
+
+def compile_generic_template(template: dict) -> ExportTemplate:
+    """Genel formu üretir ve 2209-A ile aynı şekilde derler"""
+    docx_bytes = build_generic_docx(template)
+    compiler = DocxTemplateCompiler(docx_bytes)
+    
+    general_rows = compiler.rows(compiler.find_table("Başvuru Sahibinin Adı Soyadı"))
+    for row, field in zip(general_rows, ["applicant_name", "research_title", "advisor_name", "institution"]):
+        compiler.append_text(compiler.paragraphs(compiler.cells(row)[0])[0], project_field("general_info", field))
+    compiler.append_text(compiler.find_paragraph("Anahtar Kelimeler"), project_field("keywords"))
+    
+    titles = []
+    for index, section in enumerate(template["sections"], start=1):
+        box = compiler.table_after(f"{index}. {section['title'].upper()}")
+        compiler.fill_cell(compiler.cells(compiler.rows(box)[0])[0], section_text(section["title"]))
+        titles.append(section["title"])
+    
+    compiler.fill_rows(
+        compiler.find_table("Tarih Aralığı"), 1, WORK_SCHEDULE_COLUMNS,
+        project_rows("project_management", "work_schedule")
+    )
+    compiler.fill_rows(
+        compiler.find_table("En Önemli Riskler"), 1, RISK_MANAGEMENT_COLUMNS,
+        project_rows("project_management", "risk_management")
+    )
+    
+    return ExportTemplate(
+        template["id"],
+        compiler.compile(),
+        text_sections=titles,
+        version=template_version(docx_bytes)
+    )
+
+
+# --- Şablon kayıt defteri ---
+
+_export_templates: Dict[str, ExportTemplate] = {}
+_export_templates_lock = threading.Lock()
+
+
+def load_export_template(template_id: str) -> ExportTemplate:
+    """
+    Şablonu diskten okuyup derler (cache'siz)
+    
+    2209-A için resmi form kullanılır; dosya bulunamazsa diğer şablonlar
+    gibi genel form üretilir.
+    
+    Raises:
+        ValueError: Şablon bulunamazsa
+    """
+    template = get_template_by_id(template_id)
+    if not template:
+        raise ValueError(f"'{template_id}' ID'li şablon bulunamadı")
+    
+    if template_id == "tubitak-2209a":
+        path = settings.EXPORT_2209A_TEMPLATE_PATH or DEFAULT_2209A_TEMPLATE_PATH
+        if os.path.exists(path):
+            with open(path, "rb") as template_file:
+                return compile_2209a_template(template_file.read())
+        print(f"⚠️ 2209-A şablonu bulunamadı ({path}), genel form kullanılacak")
+    
+    return compile_generic_template(template)
+
+
+def get_export_template(template_id: str) -> ExportTemplate:
+    """
+    Derlenmiş şablonu döndürür (ilk kullanımda derlenir, sonra cache'ten)
+    
+    Raises:
+        ValueError: Şablon bulunamazsa
+    """
+    export_template = _export_templates.get(template_id)
+    if export_template is None:
+        with _export_templates_lock:
+            export_template = _export_templates.get(template_id)
+            if export_template is None:
+                export_template = load_export_template(template_id)
+                _export_templates[template_id] = export_template
+    return export_template
+
+
+def compile_export_templates():
+    """Tüm şablonları önceden derler (uygulama açılışında çağrılır)"""
+    for template in get_all_templates():
+        try:
+            get_export_template(template["id"])
+        except Exception as e:
+            print(f"⚠️ Export şablonu derlenemedi ({template['id']}): {e}")
+
+
+# --- Export ---
+
+def find_incomplete_sections(project: dict) -> List[dict]:
+    """
+    Export'ta metni kullanılan ama final_content'i boş olan bölümler
+    
+    Returns:
+        List[dict]: [{"title": str, "order": int}]
+    """
+    text_sections = set(get_export_template(project["template_id"]).text_sections)
+    return [
+        {"title": section["title"], "order": section["order"]}
+        for section in project.get("sections", [])
+        if section["title"] in text_sections and not (section.get("final_content") or "").strip()
+    ]
+
+
+def build_export_context(project: dict, allow_incomplete: bool = False) -> dict:
+    """
+    Doldurma fonksiyonlarının kullandığı veri
+    
+    Bölüm metni olarak final_content kullanılır; allow_incomplete ise
+    kabul edilmemiş bölümler için draft_content'e düşülür.
+    """
+    sections = {}
+    for section in project.get("sections", []):
+        content = section.get("final_content") or ""
+        if not content and allow_incomplete:
+            content = section.get("draft_content") or ""
+        sections[section["title"]] = content
+    return {"project": project, "sections": sections}
+
+
+def export_filename(project: dict) -> str:
+    """İndirilecek dosyanın adı (ör. tubitak-2209a-project-1234abcd.docx)"""
+    return f"{project['template_id']}-{project['id'][:16]}.docx"
+
+
+def write_project_docx(project: dict, allow_incomplete: bool, path: str) -> int:
+    """
+    Projeyi .docx olarak dosyaya yazar (export işleri process havuzunda çağırır)
+    
+    Dosya önce geçici adla yazılıp taşınır; yarım dosya hiçbir zaman
+    indirilemez.
+    
+    Returns:
+        int: Dosya boyutu (byte)
+    """
+    export_template = get_export_template(project["template_id"])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as output:
+            size = export_template.compiled.write(build_export_context(project, allow_incomplete), output)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return size
+
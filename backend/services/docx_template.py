@@ -0,0 +1,384 @@
+"""
+DOCX şablon motoru
+Şablon bir kez derlenir (sabit XML parçaları + doldurma noktaları, önceden
+sıkıştırılmış zip kayıtları); her export'ta yalnızca doldurma ve paketleme yapılır
+"""
+
+import io
+import re
+import struct
+import zipfile
+import zlib
+from datetime import datetime
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape, unescape
+
+
+DOCUMENT_PART = "word/document.xml"
+
+# Doldurma fonksiyonu: export context'inden XML parçası üretir
+SlotRenderer = Callable[[dict], str]
+# (etiket adı, başlangıç, bitiş) - xml string'i içindeki eleman aralığı
+Span = Tuple[str, int, int]
+
+_TAG_RE = re.compile(r"<(/?)([A-Za-z_][\w.\-]*(?::[\w.\-]+)?)([^>]*?)(/?)>")
+_TEXT_RE = re.compile(r"<w:t(?:\s[^>]*)?>([^<]*)</w:t>")
+_PPR_RE = re.compile(r"<w:pPr>.*?</w:pPr>", re.S)
+_MARK_RPR_RE = re.compile(r"<w:rPr>.*?</w:rPr>", re.S)
+_EMPHASIS_RE = re.compile(r'<w:(?:b|bCs|i|iCs)(?:\s+w:val="[^"]*")?\s*/>')
+_WORD_IDS_RE = re.compile(r'\s+w14:(?:paraId|textId)="[^"]*"')
+# XML 1.0'da geçersiz kontrol karakterleri
+_INVALID_XML_CHARS_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def xml_text(text: str) -> str:
+    """Metni <w:t> içine yazılabilir hale getirir"""
+    return escape(_INVALID_XML_CHARS_RE.sub("", text))
+
+
+def child_spans(xml: str, start: int, end: int) -> List[Span]:
+    """
+    [start, end) aralığındaki doğrudan alt elemanları döndürür
+    
+    XML'i yeniden serialize etmeden (namespace önekleri ve mc:Ignorable
+    bozulmadan) aralıklar üzerinde çalışmak için basit bir tag tarayıcısı.
+    """
+    spans = []
+    depth = 0
+    open_name, open_start = "", 0
+    for match in _TAG_RE.finditer(xml, start, end):
+        closing, name, _, self_closing = match.groups()
+        if closing:
+            depth -= 1
+            if depth == 0:
+                spans.append((open_name, open_start, match.end()))
+        elif self_closing:
+            if depth == 0:
+                spans.append((name, match.start(), match.end()))
+        else:
+            if depth == 0:
+                open_name, open_start = name, match.start()
+            depth += 1
+    return spans
+
+
+def inner_span(xml: str, span: Span) -> Tuple[int, int]:
+    """Elemanın açılış ve kapanış tag'leri arasındaki aralık"""
+    name, start, end = span
+    return xml.index(">", start) + 1, end - len(f"</{name}>")
+
+
+def text_of(xml: str, span: Span) -> str:
+    """Eleman içindeki düz metin"""
+    return unescape("".join(_TEXT_RE.findall(xml, span[1], span[2])))
+
+
+def plain_paragraph_style(paragraph_xml: str) -> Tuple[str, str]:
+    """
+    Paragrafın pPr'ını ve içerik için kullanılacak rPr'ı döndürür
+    
+    Etiket/ipucu paragraflarındaki kalın ve italik biçim, doldurulan
+    içeriğe taşınmaz.
+    """
+    ppr_match = _PPR_RE.search(paragraph_xml)
+    ppr = _EMPHASIS_RE.sub("", ppr_match.group(0)) if ppr_match else ""
+    rpr_match = _MARK_RPR_RE.search(ppr)
+    return ppr, rpr_match.group(0) if rpr_match else ""
+
+
+def render_run(text: str, rpr: str) -> str:
+    """Tek bir metin run'ı"""
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{xml_text(text)}</w:t></w:r>'
+
+
+def render_paragraphs(text: str, ppr: str, rpr: str) -> str:
+    """Metni satır sonlarından paragraflara böler (boş metin için tek boş paragraf)"""
+    lines = text.split("\n") if text else [""]
+    return "".join(
+        f"<w:p>{ppr}{render_run(line, rpr) if line else ''}</w:p>"
+        for line in lines
+    )
+
+
+# --- Zip paketleme ---
+
+class _PackedPart:
+    """Zip içindeki bir parça (sıkıştırılmış veri ve başlık alanları)"""
+    
+    def __init__(self, name: str, data: bytes, level: int):
+        self.name = name.encode("utf-8")
+        self.crc = zlib.crc32(data)
+        self.size = len(data)
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self.compressed = compressor.compress(data) + compressor.flush()
+        self.method = zipfile.ZIP_DEFLATED
+        if len(self.compressed) >= self.size:
+            # Zaten sıkıştırılmış içerik (ör. jpeg) olduğu gibi saklanır
+            self.compressed, self.method = data, zipfile.ZIP_STORED
+    
+    def local_record(self, dos_time: int, dos_date: int) -> bytes:
+        header = struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 20, 0x0800, self.method, dos_time, dos_date,
+            self.crc, len(self.compressed), self.size, len(self.name), 0
+        )
+        return header + self.name + self.compressed
+    
+    def central_record(self, dos_time: int, dos_date: int, offset: int) -> bytes:
+        header = struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, 0x0800, self.method, dos_time, dos_date,
+            self.crc, len(self.compressed), self.size, len(self.name), 0, 0, 0, 0, 0, offset
+        )
+        return header + self.name
+
+
+def _dos_timestamp(moment: datetime) -> Tuple[int, int]:
+    dos_time = (moment.hour << 11) | (moment.minute << 5) | (moment.second // 2)
+    dos_date = ((moment.year - 1980) << 9) | (moment.month << 5) | moment.day
+    return dos_time, dos_date
+
+
+# --- Derlenmiş şablon ---
+
+class CompiledDocxTemplate:
+    """
+    Doldurmaya hazır DOCX şablonu
+    
+    document.xml sabit byte parçaları ve doldurma fonksiyonları dizisi olarak,
+    diğer parçalar önceden sıkıştırılmış zip kayıtları olarak tutulur.
+    Bir export yalnızca doldurulan document.xml'in sıkıştırılmasını gerektirir.
+    """
+    
+    def __init__(
+        self,
+        parts: List[Tuple[str, Optional[bytes]]],
+        segments: List[Union[bytes, SlotRenderer]],
+        compression_level: int = 6
+    ):
+        self.compression_level = compression_level
+        self.dos_time, self.dos_date = _dos_timestamp(datetime.now())
+        self.segments = segments
+        self._parts: List[Optional[_PackedPart]] = []
+        self._local_records: List[Optional[bytes]] = []
+        for name, data in parts:
+            if data is None:
+                # document.xml: her export'ta yeniden paketlenir
+                self._parts.append(None)
+                self._local_records.append(None)
+            else:
+                packed = _PackedPart(name, data, compression_level)
+                self._parts.append(packed)
+                self._local_records.append(packed.local_record(self.dos_time, self.dos_date))
+    
+    def render_document(self, context: dict) -> bytes:
+        """Doldurulmuş document.xml"""
+        return b"".join(
+            segment if isinstance(segment, bytes) else segment(context).encode("utf-8")
+            for segment in self.segments
+        )
+    
+    def render(self, context: dict) -> bytes:
+        """
+        Şablonu doldurur ve .docx dosyası olarak paketler
+        
+        Args:
+            context: Doldurma fonksiyonlarına verilecek veri
+        
+        Returns:
+            bytes: .docx içeriği
+        """
+        buffer = io.BytesIO()
+        self.write(context, buffer)
+        return buffer.getvalue()
+    
+    def write(self, context: dict, stream: BinaryIO) -> int:
+        """
+        Doldurulmuş .docx'i parça parça stream'e yazar (dosyanın tamamı bellekte birleştirilmez)
+        
+        Returns:
+            int: Yazılan byte sayısı
+        """
+        document = _PackedPart(DOCUMENT_PART, self.render_document(context), self.compression_level)
+        
+        central = []
+        offset = 0
+        for packed, local_record in zip(self._parts, self._local_records):
+            if packed is None:
+                packed = document
+                local_record = document.local_record(self.dos_time, self.dos_date)
+            central.append(packed.central_record(self.dos_time, self.dos_date, offset))
+            stream.write(local_record)
+            offset += len(local_record)
+        
+        central_directory = b"".join(central)
+        end_record = struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central),
+            len(central_directory), offset, 0
+        )
+        stream.write(central_directory)
+        stream.write(end_record)
+        return offset + len(central_directory) + len(end_record)
+
+
+class DocxTemplateCompiler:
+    """
+    Bir .docx dosyasındaki doldurma noktalarını işaretleyip derler
+    
+    Doldurma noktaları body'deki tablo/paragrafların metnine göre (anchor)
+    bulunur; böylece şablondaki küçük düzen değişiklikleri kodu bozmaz.
+    
+    Raises:
+        ValueError: Anchor bulunamazsa veya dosya geçerli bir .docx değilse
+    """
+    
+    def __init__(self, docx_bytes: bytes):
+        with zipfile.ZipFile(io.BytesIO(docx_bytes)) as archive:
+            if DOCUMENT_PART not in archive.namelist():
+                raise ValueError("Geçerli bir .docx dosyası değil (word/document.xml yok)")
+            self.parts = [(info.filename, archive.read(info)) for info in archive.infolist()]
+        self.xml = dict(self.parts)[DOCUMENT_PART].decode("utf-8")
+        
+        body_start = self.xml.index("<w:body>") + len("<w:body>")
+        body_end = self.xml.index("</w:body>")
+        self.blocks = child_spans(self.xml, body_start, body_end)
+        self._edits: List[Tuple[int, int, SlotRenderer]] = []
+    
+    # --- Konum bulma ---
+    
+    def find_table(self, anchor: str) -> Span:
+        """Metninde anchor geçen ilk tablo"""
+        return self._find_block("w:tbl", anchor)
+    
+    def find_paragraph(self, anchor: str) -> Span:
+        """Metninde anchor geçen ilk (üst seviye) paragraf"""
+        return self._find_block("w:p", anchor)
+    
+    def table_after(self, anchor: str) -> Span:
+        """Metninde anchor geçen paragraftan sonraki ilk tablo"""
+        paragraph = self.find_paragraph(anchor)
+        for block in self.blocks:
+            if block[0] == "w:tbl" and block[1] > paragraph[1]:
+                return block
+        raise ValueError(f"Şablonda '{anchor}' sonrasında tablo bulunamadı")
+    
+    def rows(self, table: Span) -> List[Span]:
+        return [span for span in child_spans(self.xml, *inner_span(self.xml, table)) if span[0] == "w:tr"]
+    
+    def cells(self, row: Span) -> List[Span]:
+        return [span for span in child_spans(self.xml, *inner_span(self.xml, row)) if span[0] == "w:tc"]
+    
+    def paragraphs(self, container: Span) -> List[Span]:
+        return [span for span in child_spans(self.xml, *inner_span(self.xml, container)) if span[0] == "w:p"]
+    
+    # --- Doldurma noktaları ---
+    
+    def append_text(self, paragraph: Span, value: Callable[[dict], str]):
+        """Paragrafın sonuna (ör. "Adı Soyadı:" etiketinin yanına) metin ekler"""
+        _, rpr = plain_paragraph_style(self.xml[paragraph[1]:paragraph[2]])
+        position = paragraph[2] - len("</w:p>")
+        
+        def render(context: dict) -> str:
+            text = value(context)
+            return render_run(text, rpr) if text else ""
+        
+        self._edits.append((position, position, render))
+    
+    def fill_cell(self, cell: Span, value: Callable[[dict], str], keep_paragraphs: int = 0):
+        """
+        Hücredeki ipucu paragraflarını içerikle değiştirir
+        
+        Args:
+            cell: Hücre
+            value: İçeriği döndüren fonksiyon
+            keep_paragraphs: Baştan korunacak paragraf sayısı (ör. "Özet" başlığı)
+        """
+        paragraphs = self.paragraphs(cell)
+        last = paragraphs[-1]
+        ppr, rpr = plain_paragraph_style(self.xml[last[1]:last[2]])
+        
+        self._edits.append((
+            paragraphs[keep_paragraphs][1],
+            last[2],
+            lambda context: render_paragraphs(value(context), ppr, rpr)
+        ))
+    
+    def fill_rows(
+        self,
+        table: Span,
+        template_row: int,
+        columns: List[str],
+        value: Callable[[dict], List[dict]]
+    ):
+        """
+        Tablonun veri satırlarını listeden üretir
+        
+        template_row'daki satır biçimi her kayıt için kopyalanır; başlık
+        satırları korunur. Liste boşsa şablondaki boş satırlar bırakılır.
+        """
+        rows = self.rows(table)
+        prototype = rows[template_row]
+        original_rows = self.xml[prototype[1]:rows[-1][2]]
+        
+        row_open = _WORD_IDS_RE.sub("", self.xml[prototype[1]:self.xml.index(">", prototype[1]) + 1])
+        cells = self.cells(prototype)
+        row_properties = self.xml[self.xml.index(">", prototype[1]) + 1:cells[0][1]]
+        
+        cell_prototypes = []
+        for cell in cells:
+            first_paragraph = self.paragraphs(cell)[0]
+            cell_open = self.xml[cell[1]:first_paragraph[1]]
+            ppr, rpr = plain_paragraph_style(self.xml[first_paragraph[1]:first_paragraph[2]])
+            cell_prototypes.append((cell_open, ppr, rpr))
+        
+        if len(columns) != len(cell_prototypes):
+            raise ValueError(f"Tablo sütun sayısı uyuşmuyor: {len(cell_prototypes)} != {len(columns)}")
+        
+        def render(context: dict) -> str:
+            records = value(context)
+            if not records:
+                return original_rows
+            return "".join(
+                row_open + row_properties + "".join(
+                    cell_open + render_paragraphs(str(record.get(column) or ""), ppr, rpr) + "</w:tc>"
+                    for column, (cell_open, ppr, rpr) in zip(columns, cell_prototypes)
+                ) + "</w:tr>"
+                for record in records
+            )
+        
+        self._edits.append((prototype[1], rows[-1][2], render))
+    
+    def insert_after(self, paragraph: Span, value: Callable[[dict], str]):
+        """Paragraftan sonra içerik paragrafları ekler (ör. Kaynaklar başlığının altı)"""
+        ppr, rpr = plain_paragraph_style(self.xml[paragraph[1]:paragraph[2]])
+        position = paragraph[2]
+        
+        def render(context: dict) -> str:
+            text = value(context)
+            return render_paragraphs(text, ppr, rpr) if text else ""
+        
+        self._edits.append((position, position, render))
+    
+    def compile(self, compression_level: int = 6) -> CompiledDocxTemplate:
+        """
+        İşaretlenen noktalarla şablonu derler
+        
+        Raises:
+            ValueError: Doldurma noktaları çakışıyorsa
+        """
+        segments: List[Union[bytes, SlotRenderer]] = []
+        cursor = 0
+        for start, end, render in sorted(self._edits, key=lambda edit: (edit[0], edit[1])):
+            if start < cursor:
+                raise ValueError("Şablondaki doldurma noktaları çakışıyor")
+            segments.append(self.xml[cursor:start].encode("utf-8"))
+            segments.append(render)
+            cursor = end
+        segments.append(self.xml[cursor:].encode("utf-8"))
+        
+        parts = [(name, None if name == DOCUMENT_PART else data) for name, data in self.parts]
+        return CompiledDocxTemplate(parts, segments, compression_level)
+    
+    def _find_block(self, name: str, anchor: str) -> Span:
+        for block in self.blocks:
+            if block[0] == name and anchor in text_of(self.xml, block):
+                return block
+        raise ValueError(f"Şablonda '{anchor}' bulunamadı")
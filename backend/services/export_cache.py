@@ -0,0 +1,243 @@
+"""
+Export Artifact Cache
+Üretilen export dosyalarını diskte proje içeriğinin özetiyle saklar; değişmemiş
+proje tekrar export edildiğinde dosya render edilmeden diskten verilir
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+from config.settings import settings
+from data.mock_projects import add_project_delete_listener
+from models.project import Project
+from services.docx_export import get_export_template
+
+# Export çıktısını etkilemeyen alanlar
+VOLATILE_FIELDS = {"created_at", "updated_at", "version"}
+# Project modelindeki içerik alanları (zaman damgaları ve sürüm hariç)
+CONTENT_FIELDS = [name for name in Project.model_fields if name not in VOLATILE_FIELDS]
+
+# Dosya adı: <64 hex anahtar>-<project_id>.<format>
+_ARTIFACT_NAME_RE = re.compile(r"^([0-9a-f]{64})-(.+)\.(docx|pdf)$")
+
+
+def project_content_hash(project: dict) -> str:
+    """
+    Projenin içerik özeti (Project modelindeki alanlar, zaman damgaları ve sürüm hariç)
+    
+    Yalnızca updated_at'i veya sürümü değişen proje (ör. geri alınan düzenleme)
+    aynı özeti verir.
+    """
+    content = {field: project.get(field) for field in CONTENT_FIELDS}
+    content["sections"] = [
+        {key: value for key, value in section.items() if key not in VOLATILE_FIELDS}
+        for section in project.get("sections", [])
+    ]
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def export_cache_key(project: dict, export_format: str = "docx", allow_incomplete: bool = False) -> str:
+    """
+    Export dosyasının cache anahtarı
+    
+    İçerik özeti + şablon sürümü + format + allow_incomplete; bunlardan
+    biri değişirse dosya da değişir.
+    
+    Raises:
+        ValueError: Şablon bulunamazsa
+    """
+    version = get_export_template(project["template_id"]).version
+    raw = f"{project_content_hash(project)}|{project['template_id']}|{version}|{export_format}|{int(allow_incomplete)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ExportArtifactCache:
+    """
+    Diskte toplam boyutla sınırlı LRU export cache'i
+    
+    Dosya adında proje ID'si tutulduğu için açılışta klasör taranıp index
+    yeniden kurulur ve proje silinince dosyaları silinebilir. Proje
+    değişince eski dosyalar silinmez; anahtar içerik özetinden üretildiği
+    için artık istenmezler, LRU'da geriler ve boyut sınırıyla atılırlar.
+    Render geçici dosyaya yapılıp yerine taşındığından cache'te yarım
+    dosya bulunmaz.
+    
+    Attributes:
+        directory: Dosyaların klasörü
+        max_bytes: Toplam boyut üst sınırı (aşılırsa en az kullanılan silinir)
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._project_keys: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing()
+    
+    def path_for(self, key: str, project_id: str, export_format: str = "docx") -> str:
+        """Anahtarın dosya yolu (render bu yola yazar, sonra put çağrılır)"""
+        return os.path.join(self.directory, f"{key}-{project_id}.{export_format}")
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Cache'teki dosyanın yolu
+        
+        Returns:
+            str: Dosya yolu veya None (yoksa ya da diskten silinmişse)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and os.path.exists(entry["path"]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                path = entry["path"]
+            else:
+                if entry:
+                    self._remove(key)
+                self.misses += 1
+                return None
+        # Son kullanım diske de yazılır; yeniden açılışta LRU sırası korunur
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+    
+    def put(self, key: str, project_id: str, export_format: str = "docx") -> str:
+        """
+        path_for(key) yoluna yazılmış dosyayı cache'e kaydeder
+        
+        Returns:
+            str: Dosya yolu
+        """
+        path = self.path_for(key, project_id, export_format)
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, delete_file=False)
+            self._add(key, project_id, path, size)
+            self._evict()
+        return path
+    
+    def invalidate_project(self, project_id: str) -> int:
+        """
+        Projenin tüm dosyalarını siler
+        
+        Returns:
+            int: Silinen dosya sayısı
+        """
+        with self._lock:
+            keys = list(self._project_keys.get(project_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+        return len(keys)
+    
+    def stats(self) -> dict:
+        """Cache istatistikleri"""
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "entries": len(self._entries),
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+    
+    def _load_existing(self):
+        found = []
+        for name in os.listdir(self.directory):
+            match = _ARTIFACT_NAME_RE.match(name)
+            path = os.path.join(self.directory, name)
+            if match and os.path.isfile(path):
+                stat_result = os.stat(path)
+                found.append((stat_result.st_mtime, match.group(1), match.group(2), path, stat_result.st_size))
+        for _, key, project_id, path, size in sorted(found):
+            self._add(key, project_id, path, size)
+        self._evict()
+    
+    def _add(self, key: str, project_id: str, path: str, size: int):
+        self._entries[key] = {"project_id": project_id, "path": path, "size": size}
+        self._project_keys.setdefault(project_id, set()).add(key)
+        self.total_bytes += size
+    
+    def _remove(self, key: str, delete_file: bool = True):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry["size"]
+        keys = self._project_keys.get(entry["project_id"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._project_keys[entry["project_id"]]
+        if delete_file:
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+    
+    def _evict(self):
+        # En son eklenen dosya sınırdan büyük olsa da tutulur (hemen indirilecek)
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+
+_export_cache: Optional[ExportArtifactCache] = None
+_owns_directory = False
+_export_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportArtifactCache:
+    """
+    Global export cache'i (ilk kullanımda oluşturulur)
+    
+    EXPORT_DIR verilmezse geçici klasör kullanılır ve kapanışta silinir.
+    """
+    global _export_cache, _owns_directory
+    if _export_cache is None:
+        with _export_cache_lock:
+            if _export_cache is None:
+                if settings.EXPORT_DIR:
+                    directory = settings.EXPORT_DIR
+                else:
+                    directory = tempfile.mkdtemp(prefix="akademikform-exports-")
+                    _owns_directory = True
+                _export_cache = ExportArtifactCache(directory, settings.EXPORT_CACHE_MAX_BYTES)
+    return _export_cache
+
+
+def close_export_cache():
+    """Cache'i bırakır; geçici klasör kullanıldıysa siler"""
+    global _export_cache, _owns_directory
+    with _export_cache_lock:
+        if _export_cache is not None and _owns_directory:
+            shutil.rmtree(_export_cache.directory, ignore_errors=True)
+        _export_cache = None
+        _owns_directory = False
+
+
+def invalidate_project_exports(project_id: str):
+    """Silinen projenin export dosyalarını siler (data katmanı dinleyicisi)"""
+    if _export_cache is not None:
+        _export_cache.invalidate_project(project_id)
+
+
+add_project_delete_listener(invalidate_project_exports)
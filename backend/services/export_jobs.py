@@ -0,0 +1,243 @@
+"""
+Export işleri
+DOCX render'ını process havuzunda arka planda yürütür; değişmemiş proje için
+devam eden iş veya cache'teki dosya tekrar kullanılır
+"""
+
+import asyncio
+import multiprocessing
+import os
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from services.docx_export import compile_export_templates, export_filename, write_project_docx
+from services.export_cache import close_export_cache, export_cache_key, get_export_cache
+
+# Bellekte tutulacak en fazla iş sayısı (dosyaları export cache'inde kalır)
+MAX_STORED_JOBS = 200
+
+_jobs: "OrderedDict[str, dict]" = OrderedDict()
+# (user_id, project_id) -> projenin en son export işi
+_latest_jobs: Dict[Tuple[str, str], str] = {}
+_tasks: Dict[str, asyncio.Task] = {}
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Açılışta process'leri başlatan boş işler (hepsi bitince havuz ısınmıştır)
+_warmup: List[Future] = []
+
+
+def get_export_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Render process havuzu (ilk kullanımda oluşturulur)
+    
+    Process'ler spawn ile başlatılır (thread'li bir process'i fork etmek
+    güvenli değil) ve açılışta şablonları bir kez derler.
+    
+    Returns:
+        ProcessPoolExecutor veya None (EXPORT_PROCESS_WORKERS=0 ise)
+    """
+    global _pool
+    if settings.EXPORT_PROCESS_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.EXPORT_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=compile_export_templates
+        )
+    return _pool
+
+
+def start_export_pool():
+    """Render process'lerini arka planda başlatır (ilk export spawn süresini beklemesin)"""
+    global _warmup
+    pool = get_export_pool()
+    if pool is not None:
+        _warmup = [pool.submit(os.getpid) for _ in range(settings.EXPORT_PROCESS_WORKERS)]
+
+
+def export_pool_warming() -> bool:
+    """Açılışta başlatılan render process'leri hâlâ spawn ediliyor mu"""
+    return any(not future.done() for future in _warmup)
+
+
+def start_export(project: dict, user_id: str, allow_incomplete: bool = False) -> Tuple[dict, bool]:
+    """
+    Projenin export işini başlatır veya aynı içerik için var olan işi döndürür
+    
+    Proje son export'tan beri değişmediyse (aynı cache anahtarı) devam
+    eden iş beklenir; dosya cache'teyse render edilmeden biten bir iş döner.
+    
+    Args:
+        project: Proje verisi
+        user_id: İşi başlatan kullanıcı
+        allow_incomplete: Kabul edilmemiş bölümlerde taslak kullanılsın mı
+    
+    Returns:
+        Tuple[dict, bool]: (iş durumu, var olan iş veya cache'teki dosya mı kullanıldı)
+    
+    Raises:
+        ValueError: Şablon bulunamazsa
+    """
+    cache_key = export_cache_key(project, "docx", allow_incomplete)
+    key = (user_id, project["id"])
+    
+    existing = _jobs.get(_latest_jobs.get(key, ""))
+    if existing and existing["cache_key"] == cache_key and _is_reusable(existing):
+        return job_status(existing), True
+    
+    cache = get_export_cache()
+    cached_path = cache.get(cache_key)
+    
+    job_id = f"export-{uuid.uuid4()}"
+    job = {
+        "job_id": job_id,
+        "project_id": project["id"],
+        "user_id": user_id,
+        "cache_key": cache_key,
+        "format": "docx",
+        "allow_incomplete": allow_incomplete,
+        "status": "pending",
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "finished_at": None,
+        "file_path": cached_path or cache.path_for(cache_key, project["id"]),
+        "file_name": export_filename(project),
+        "file_size_bytes": None,
+        "error": None,
+    }
+    _latest_jobs[key] = job_id
+    
+    if cached_path:
+        job["status"] = "completed"
+        job["finished_at"] = job["created_at"]
+        job["file_size_bytes"] = os.path.getsize(cached_path)
+        _store_job(job)
+        return job_status(job), True
+    
+    _store_job(job)
+    task = asyncio.create_task(_run_job(job, project))
+    _tasks[job_id] = task
+    task.add_done_callback(lambda _: _tasks.pop(job_id, None))
+    
+    return job_status(job), False
+
+
+def get_export_job(job_id: str, user_id: str) -> Optional[dict]:
+    """
+    İşin ham kaydı (dosya yolu dahil)
+    
+    Returns:
+        dict: İş veya None if not found
+    """
+    job = _jobs.get(job_id)
+    if not job or job["user_id"] != user_id:
+        return None
+    return job
+
+
+async def wait_for_export(job_id: str) -> dict:
+    """
+    İş bitene kadar bekler
+    
+    Bekleyen istek iptal edilse de iş devam eder (aynı işi bekleyen
+    başka istekler olabilir).
+    
+    Returns:
+        dict: İş durumu
+    """
+    task = _tasks.get(job_id)
+    if task:
+        await asyncio.shield(task)
+    return job_status(_jobs[job_id])
+
+
+def job_status(job: dict) -> dict:
+    """İşin API'ye dönecek görünümü"""
+    return {
+        "job_id": job["job_id"],
+        "project_id": job["project_id"],
+        "status": job["status"],
+        "format": job["format"],
+        "allow_incomplete": job["allow_incomplete"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "file_size_bytes": job["file_size_bytes"],
+        "download_url": (
+            f"/api/v1/export/jobs/{job['job_id']}/download" if job["status"] == "completed" else None
+        ),
+        "error": job["error"],
+    }
+
+
+async def shutdown_exports():
+    """Uygulama kapanırken işleri iptal eder, havuzu ve cache'i kapatır"""
+    global _pool
+    for task in list(_tasks.values()):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks.values(), return_exceptions=True)
+    
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    _warmup.clear()
+    close_export_cache()
+
+
+async def _run_job(job: dict, project: dict):
+    global _pool
+    job["status"] = "running"
+    try:
+        pool = get_export_pool()
+        if pool is None:
+            size = await run_in_threadpool(
+                write_project_docx, project, job["allow_incomplete"], job["file_path"]
+            )
+        else:
+            size = await asyncio.get_running_loop().run_in_executor(
+                pool, write_project_docx, project, job["allow_incomplete"], job["file_path"]
+            )
+        get_export_cache().put(job["cache_key"], job["project_id"])
+        job["file_size_bytes"] = size
+        job["status"] = "completed"
+    except asyncio.CancelledError:
+        job["status"] = "cancelled"
+        raise
+    except BrokenProcessPool as e:
+        # Bir render process'i çöktü; sonraki işler yeni havuzla çalışır.
+        # Bozuk havuz kapatılır (yönetim thread'i ve kalan process'ler sızmasın);
+        # aynı çöküşü gören başka bir iş havuzu zaten yenilediyse dokunulmaz
+        if _pool is pool:
+            _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        job["error"] = f"Export process'i beklenmedik şekilde kapandı: {e}"
+        job["status"] = "failed"
+    except Exception as e:
+        job["error"] = str(e)
+        job["status"] = "failed"
+    finally:
+        job["finished_at"] = datetime.utcnow().isoformat() + "Z"
+
+
+def _is_reusable(job: dict) -> bool:
+    if job["status"] in ("pending", "running"):
+        return True
+    return job["status"] == "completed" and os.path.exists(job["file_path"])
+
+
+def _store_job(job: dict):
+    _jobs[job["job_id"]] = job
+    while len(_jobs) > MAX_STORED_JOBS:
+        # En eski bitmiş işi at (dosyası cache'in LRU'suna kalır)
+        oldest_id = next((job_id for job_id, stored in _jobs.items() if stored["finished_at"]), None)
+        if oldest_id is None:
+            break
+        oldest = _jobs.pop(oldest_id)
+        key = (oldest["user_id"], oldest["project_id"])
+        if _latest_jobs.get(key) == oldest_id:
+            del _latest_jobs[key]
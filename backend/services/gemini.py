@@ -4,63 +4,243 @@ Akademik metin üretimi ve iyileştirme servisi
 """
 
 import os
-from typing import Optional
-import google.generativeai as genai
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Optional, AsyncIterator, Awaitable, Dict, Iterator
 from config.settings import settings
+from services.ai_cache import ai_cache
+from services.model_registry import model_registry
+from services.ai_resilience import AIServiceError, run_with_resilience
+from services.ai_rate_limiter import ai_rate_limiter, estimate_tokens
+from services.metrics import metrics, ai_requests, ai_prompt_chars, ai_output_chars
 
 
-# Gemini API'yi yapılandır
-def get_available_model():
+class CountingExecutor(Executor):
     """
-    Mevcut modelleri kontrol eder ve uygun bir model döndürür
-    Free tier için en uygun modeli seçer
+    Kuyrukta bekleyen ve çalışan işleri sayan thread havuzu
+    
+    Sayaçlar submit sırasında ve iş thread'de başlayıp bittiğinde
+    güncellenir; ThreadPoolExecutor'ın iç kuyruğuna bakmak gerekmez.
+    Başlamadan iptal edilen işler (shutdown) kuyruktan düşülür.
     """
-    try:
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
+    
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+    
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        def run():
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
         
-        # Önce mevcut modelleri listele
+        with self._lock:
+            self._queued += 1
         try:
-            models = genai.list_models()
-            available_models = [m.name for m in models if 'generateContent' in m.supported_generation_methods]
-            
-            # Öncelik sırası (free tier için en uygun modeller):
-            # 1. gemini-2.5-flash (stable, 1M token, 65K output) - EN İYİ
-            # 2. gemini-2.0-flash-001 (stable, 1M token, 8K output)
-            # 3. gemini-flash-latest (latest, 1M token, 65K output)
-            # 4. gemini-2.0-flash (stable)
-            preferred_models = [
-                'models/gemini-2.5-flash',           # En iyi: Stable, yüksek limit
-                'models/gemini-2.0-flash-001',      # İyi: Stable, orta limit
-                'models/gemini-flash-latest',        # İyi: Latest, yüksek limit
-                'models/gemini-2.0-flash',          # Alternatif
-                'models/gemini-2.5-flash-lite',     # Hafif versiyon
-            ]
-            
-            for preferred in preferred_models:
-                # Model adını kontrol et
-                if preferred in available_models:
-                    print(f"✅ Kullanılan model: {preferred}")
-                    return genai.GenerativeModel(preferred)
-            
-            # Eğer hiçbiri bulunamazsa, ilk uygun modeli kullan
-            if available_models:
-                model_name = available_models[0]
-                print(f"✅ Kullanılan model (ilk bulunan): {model_name}")
-                return genai.GenerativeModel(model_name)
-            
-        except Exception as list_error:
-            print(f"⚠️ Model listesi alınamadı: {list_error}")
-        
-        # Fallback: Direkt model adı ile dene (en stabil)
-        print("⚠️ Model listesi alınamadı, fallback model kullanılıyor: models/gemini-2.5-flash")
-        return genai.GenerativeModel('models/gemini-2.5-flash')
-        
-    except Exception as e:
-        print(f"⚠️ Gemini API yapılandırılamadı: {e}")
-        return None
+            future = self._executor.submit(run)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._forget_cancelled)
+        return future
+    
+    def stats(self) -> Dict[str, int]:
+        """Boş thread bekleyen (queued) ve çalışan (running) iş sayıları"""
+        with self._lock:
+            return {"queued": self._queued, "running": self._running}
+    
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+    
+    def _forget_cancelled(self, future: Future):
+        # İptal edilen iş hiç başlamamıştır (run çağrılmadı)
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+
+# Gemini SDK senkron çalışır; çağrılar event loop'u bloklamasın diye
+# boyutu sınırlı ayrı bir thread havuzunda yürütülür
+ai_executor = CountingExecutor(
+    max_workers=settings.AI_EXECUTOR_MAX_WORKERS,
+    thread_name_prefix="gemini-worker"
+)
+
+
+ai_cache_hits = metrics.counter("akademikform_ai_cache_hits_total", "AI yanıt cache'i isabetleri")
+ai_cache_misses = metrics.counter("akademikform_ai_cache_misses_total", "AI yanıt cache'i ıskaları")
+ai_cache_entries = metrics.gauge("akademikform_ai_cache_entries", "AI yanıt cache'indeki kayıt sayısı")
+ai_executor_queue = metrics.gauge(
+    "akademikform_ai_executor_queue", "AI thread havuzunda boş thread bekleyen çağrılar"
+)
+ai_executor_running = metrics.gauge(
+    "akademikform_ai_executor_running", "AI thread havuzunda çalışan çağrılar"
+)
+
+
+def collect_ai_metrics():
+    """Cache sayaçlarını ve executor kuyruğunu metriklere aktarır (okuma sırasında)"""
+    stats = ai_cache.stats()
+    ai_cache_hits.set(stats["hits"])
+    ai_cache_misses.set(stats["misses"])
+    ai_cache_entries.set(stats["entries"])
+    executor = ai_executor.stats()
+    ai_executor_queue.set(executor["queued"])
+    ai_executor_running.set(executor["running"])
+
+
+metrics.add_collector(collect_ai_metrics)
+
+
+async def resolve_model():
+    """
+    Kullanılacak modeli döndürür
+    
+    Model henüz çözümlenmediyse keşif (ağ çağrısı) executor üzerinde yapılır.
+    
+    Returns:
+        GenerativeModel veya None (yapılandırılmamışsa)
+    """
+    if model_registry.is_resolved:
+        return model_registry.get_model()
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ai_executor, model_registry.get_model)
+
+
+def start_model_warmup():
+    """
+    Modeli arka planda çözümlemeye başlar (startup'ı bekletmez)
+    """
+    if not model_registry.is_resolved:
+        ai_executor.submit(model_registry.get_model)
+
+
+async def call_model(model, prompt: str):
+    """
+    Gemini modelini executor üzerinde çağırır, event loop serbest kalır
+    
+    Args:
+        model: Çağrılacak model
+        prompt: Modele gönderilecek prompt
+    
+    Returns:
+        Gemini yanıt nesnesi
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ai_executor, model.generate_content, prompt)
+
+
+# Stream sonunu belirten işaret
+_STREAM_END = object()
+
+
+async def call_model_stream(model, prompt: str) -> AsyncIterator[str]:
+    """
+    Gemini modelini streaming modda executor üzerinde çağırır
+    
+    SDK'nın senkron iterator'ı thread'de tüketilir, parçalar bir
+    asyncio.Queue üzerinden event loop'a aktarılır.
+    
+    Args:
+        model: Çağrılacak model
+        prompt: Modele gönderilecek prompt
+    
+    Yields:
+        str: Modelin ürettiği ham metin parçaları
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop_event = threading.Event()
+    
+    def publish(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop kapanmışsa yapılacak bir şey yok
+            stop_event.set()
+    
+    def produce():
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                if stop_event.is_set():
+                    break
+                publish(chunk.text)
+            publish(_STREAM_END)
+        except Exception as e:
+            publish(e)
+    
+    loop.run_in_executor(ai_executor, produce)
+    
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # İstemci bağlantıyı kestiyse thread'deki üretimi durdur
+        stop_event.set()
+
+
+def candidate_models(model) -> Iterator:
+    """
+    Denenecek modeller: önce birincil, ardından yedekler
+    
+    Yedekler yalnızca birincil model başarısız olursa oluşturulur.
+    """
+    yield model
+    yield from model_registry.get_fallback_models(settings.AI_FALLBACK_MODELS_MAX)
 
-# Model'i başlat
-model = get_available_model()
+
+async def answer_with(model, call: Awaitable):
+    """
+    Çağrının sonucunu yanıt veren modelle birlikte döndürür
+    
+    Yedek modele geçildiyse yanıt birincil modelin cache anahtarıyla
+    saklanmamalı; çağıran taraf hangi modelin yanıt verdiğini buradan bilir.
+    
+    Returns:
+        tuple: (model, çağrının sonucu)
+    """
+    return model, await call
+
+
+async def open_model_stream(model, prompt: str):
+    """
+    Stream'i açar ve ilk parçayı bekler
+    
+    Hatalar genelde ilk parçadan önce gelir; bu sayede stream açılışı
+    da retry/fallback kapsamına girer.
+    
+    Returns:
+        tuple: (ilk parça veya None, kalan parçaların iterator'ı)
+    """
+    stream = call_model_stream(model, prompt)
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        return None, stream
+    except BaseException:
+        await stream.aclose()
+        raise
+    return first_chunk, stream
+
+
+def shutdown_executor():
+    """Uygulama kapanırken AI thread havuzunu kapatır"""
+    ai_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def build_generate_prompt(
@@ -83,7 +263,7 @@ def build_generate_prompt(
         min_words: Minimum kelime sayısı
         max_words: Maximum kelime sayısı
         additional_instructions: Ek talimatlar
-        
+    
     Returns:
         str: Hazırlanmış prompt
     """
@@ -105,7 +285,7 @@ Aşağıdaki taslak metni akademik dile çevir, geliştir ve iyileştir:
 
     if additional_instructions:
         prompt += f"\n**EK TALİMATLAR:**\n{additional_instructions}\n"
-
+    
     prompt += """
 **ÖNEMLİ KURALLAR:**
 1. Metni Türkçe yaz (eğer taslak Türkçeyse)
@@ -115,7 +295,7 @@ Aşağıdaki taslak metni akademik dile çevir, geliştir ve iyileştir:
 5. Kelime sayısı limitlerini dikkate al
 6. Sadece metni döndür, açıklama veya başlık ekleme
 """
-    
+
     return prompt
 
 
@@ -139,7 +319,7 @@ def build_revise_prompt(
         style: Yazım stili
         min_words: Minimum kelime sayısı
         max_words: Maximum kelime sayısı
-        
+    
     Returns:
         str: Hazırlanmış prompt
     """
@@ -165,10 +345,74 @@ def build_revise_prompt(
 4. Kelime sayısı limitlerini dikkate al
 5. Sadece metni döndür, açıklama veya başlık ekleme
 """
-    
+
     return prompt
 
 
+async def complete_prompt(prompt: str, use_cache: bool = True) -> str:
+    """
+    Prompt'u modele gönderir ve temizlenmiş metni döndürür
+    
+    Aynı model + prompt için cache'te geçerli bir yanıt varsa Gemini'ye
+    gidilmeden o döndürülür. Geçici hatalarda yeniden denenir, gerekirse
+    yedek modellere geçilir (bkz. services/ai_resilience.py). Yedek modelin
+    yanıtı cache'e yazılmaz; cache anahtarı birincil modelindir.
+    
+    Args:
+        prompt: Hazırlanmış prompt
+        use_cache: False ise cache atlanır (yeni bir öneri istenirse)
+    
+    Returns:
+        str: Temizlenmiş metin
+    
+    Raises:
+        AIServiceError: Gemini kullanılamıyorsa (503) veya süre dolduysa (504)
+        Exception: Diğer API hataları
+    """
+    model = await resolve_model()
+    if not model:
+        raise Exception("Gemini API yapılandırılmamış. GOOGLE_API_KEY environment variable'ını kontrol edin.")
+    
+    cache_key = None
+    if use_cache and settings.AI_CACHE_ENABLED:
+        cache_key = ai_cache.make_key(getattr(model, "model_name", ""), prompt)
+        cached_text = ai_cache.get(cache_key)
+        if cached_text is not None:
+            ai_requests.inc(("complete", "cache_hit"))
+            return cached_text
+    
+    ai_prompt_chars.observe(("complete",), len(prompt))
+    try:
+        # Gemini API'yi çağır (executor üzerinde, retry/fallback ile)
+        answered_by, response = await run_with_resilience(
+            candidate_models(model),
+            lambda candidate: answer_with(candidate, call_model(candidate, prompt)),
+            prompt_tokens=estimate_tokens(prompt)
+        )
+        
+        # Yanıtı işle
+        generated_text = response.text.strip()
+        await ai_rate_limiter.record_output(estimate_tokens(generated_text))
+        
+        # Post-processing
+        generated_text = post_process_text(generated_text)
+    
+    except AIServiceError:
+        ai_requests.inc(("complete", "error"))
+        raise
+    except Exception as e:
+        ai_requests.inc(("complete", "error"))
+        raise Exception(f"Gemini API hatası: {str(e)}")
+    
+    ai_requests.inc(("complete", "ok"))
+    ai_output_chars.observe(("complete",), len(generated_text))
+    
+    if cache_key and answered_by is model:
+        ai_cache.set(cache_key, generated_text)
+    
+    return generated_text
+
+
 async def generate_text(
     draft_content: str,
     section_title: str,
@@ -176,7 +420,8 @@ async def generate_text(
     style: str = "Akademik, bilimsel ve profesyonel",
     min_words: int = 0,
     max_words: int = 0,
-    additional_instructions: str = ""
+    additional_instructions: str = "",
+    use_cache: bool = True
 ) -> dict:
     """
     AI ile metin üretir
@@ -189,43 +434,30 @@ async def generate_text(
         min_words: Minimum kelime sayısı
         max_words: Maximum kelime sayısı
         additional_instructions: Ek talimatlar
-        
+        use_cache: Aynı prompt için cache'teki yanıt kullanılsın mı
+    
     Returns:
         dict: {"generated_content": str} veya hata
-        
+    
     Raises:
         Exception: API hatası durumunda
     """
-    if not model:
-        raise Exception("Gemini API yapılandırılmamış. GOOGLE_API_KEY environment variable'ını kontrol edin.")
+    # Prompt oluştur
+    prompt = build_generate_prompt(
+        draft_content=draft_content,
+        section_title=section_title,
+        project_title=project_title,
+        style=style,
+        min_words=min_words,
+        max_words=max_words,
+        additional_instructions=additional_instructions
+    )
     
-    try:
-        # Prompt oluştur
-        prompt = build_generate_prompt(
-            draft_content=draft_content,
-            section_title=section_title,
-            project_title=project_title,
-            style=style,
-            min_words=min_words,
-            max_words=max_words,
-            additional_instructions=additional_instructions
-        )
-        
-        # Gemini API'yi çağır
-        response = model.generate_content(prompt)
-        
-        # Yanıtı işle
-        generated_text = response.text.strip()
-        
-        # Post-processing
-        generated_text = post_process_text(generated_text)
-        
-        return {
-            "generated_content": generated_text
-        }
-        
-    except Exception as e:
-        raise Exception(f"Gemini API hatası: {str(e)}")
+    generated_text = await complete_prompt(prompt, use_cache=use_cache)
+    
+    return {
+        "generated_content": generated_text
+    }
 
 
 async def revise_text(
@@ -235,7 +467,8 @@ async def revise_text(
     project_title: str,
     style: str = "Akademik, bilimsel ve profesyonel",
     min_words: int = 0,
-    max_words: int = 0
+    max_words: int = 0,
+    use_cache: bool = True
 ) -> dict:
     """
     Mevcut AI önerisini kullanıcı talimatıyla revize eder
@@ -248,43 +481,169 @@ async def revise_text(
         style: Yazım stili
         min_words: Minimum kelime sayısı
         max_words: Maximum kelime sayısı
-        
+        use_cache: Aynı prompt için cache'teki yanıt kullanılsın mı
+    
     Returns:
         dict: {"generated_content": str} veya hata
-        
+    
     Raises:
         Exception: API hatası durumunda
     """
+    # Prompt oluştur
+    prompt = build_revise_prompt(
+        current_content=current_content,
+        revision_prompt=revision_prompt,
+        section_title=section_title,
+        project_title=project_title,
+        style=style,
+        min_words=min_words,
+        max_words=max_words
+    )
+    
+    generated_text = await complete_prompt(prompt, use_cache=use_cache)
+    
+    return {
+        "generated_content": generated_text
+    }
+
+
+async def stream_processed_text(prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+    """
+    Prompt'u streaming modda çalıştırır ve parçaları temizleyerek döndürür
+    
+    Cache'te yanıt varsa tek parça halinde döndürülür; stream tamamlanırsa
+    birleşik metin cache'e yazılır (yedek modelin yanıtı yazılmaz).
+    Retry/fallback ilk parça gelene kadar geçerlidir; süre sınırı da
+    yalnızca ilk parçaya kadar uygulanır.
+    
+    Args:
+        prompt: Hazırlanmış prompt
+        use_cache: False ise cache atlanır
+    
+    Yields:
+        str: post_process_text ile tutarlı şekilde temizlenmiş metin parçaları
+    
+    Raises:
+        AIServiceError: Gemini kullanılamıyorsa (503) veya süre dolduysa (504)
+        Exception: Diğer API hataları
+    """
+    model = await resolve_model()
     if not model:
         raise Exception("Gemini API yapılandırılmamış. GOOGLE_API_KEY environment variable'ını kontrol edin.")
     
+    cache_key = None
+    if use_cache and settings.AI_CACHE_ENABLED:
+        cache_key = ai_cache.make_key(getattr(model, "model_name", ""), prompt)
+        cached_text = ai_cache.get(cache_key)
+        if cached_text is not None:
+            ai_requests.inc(("stream", "cache_hit"))
+            if cached_text:
+                yield cached_text
+            return
+    
+    ai_prompt_chars.observe(("stream",), len(prompt))
     try:
-        # Prompt oluştur
-        prompt = build_revise_prompt(
-            current_content=current_content,
-            revision_prompt=revision_prompt,
-            section_title=section_title,
-            project_title=project_title,
-            style=style,
-            min_words=min_words,
-            max_words=max_words
+        answered_by, (first_chunk, stream) = await run_with_resilience(
+            candidate_models(model),
+            lambda candidate: answer_with(candidate, open_model_stream(candidate, prompt)),
+            prompt_tokens=estimate_tokens(prompt)
         )
-        
-        # Gemini API'yi çağır
-        response = model.generate_content(prompt)
-        
-        # Yanıtı işle
-        generated_text = response.text.strip()
-        
-        # Post-processing
-        generated_text = post_process_text(generated_text)
-        
-        return {
-            "generated_content": generated_text
-        }
-        
+    except AIServiceError:
+        ai_requests.inc(("stream", "error"))
+        raise
+    except Exception as e:
+        ai_requests.inc(("stream", "error"))
+        raise Exception(f"Gemini API hatası: {str(e)}")
+    
+    processor = StreamingPostProcessor()
+    parts = []
+    try:
+        if first_chunk is not None:
+            cleaned = processor.feed(first_chunk)
+            if cleaned:
+                parts.append(cleaned)
+                yield cleaned
+        async for chunk in stream:
+            cleaned = processor.feed(chunk)
+            if cleaned:
+                parts.append(cleaned)
+                yield cleaned
     except Exception as e:
+        ai_requests.inc(("stream", "error"))
         raise Exception(f"Gemini API hatası: {str(e)}")
+    finally:
+        await stream.aclose()
+    
+    tail = processor.flush()
+    if tail:
+        parts.append(tail)
+        yield tail
+    
+    generated_text = "".join(parts)
+    ai_requests.inc(("stream", "ok"))
+    ai_output_chars.observe(("stream",), len(generated_text))
+    await ai_rate_limiter.record_output(estimate_tokens(generated_text))
+    
+    if cache_key and answered_by is model:
+        ai_cache.set(cache_key, generated_text)
+
+
+async def stream_generate_text(
+    draft_content: str,
+    section_title: str,
+    project_title: str,
+    style: str = "Akademik, bilimsel ve profesyonel",
+    min_words: int = 0,
+    max_words: int = 0,
+    additional_instructions: str = "",
+    use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    generate_text'in streaming versiyonu
+    
+    Yields:
+        str: Üretilen metnin temizlenmiş parçaları
+    """
+    prompt = build_generate_prompt(
+        draft_content=draft_content,
+        section_title=section_title,
+        project_title=project_title,
+        style=style,
+        min_words=min_words,
+        max_words=max_words,
+        additional_instructions=additional_instructions
+    )
+    async for chunk in stream_processed_text(prompt, use_cache=use_cache):
+        yield chunk
+
+
+async def stream_revise_text(
+    current_content: str,
+    revision_prompt: str,
+    section_title: str,
+    project_title: str,
+    style: str = "Akademik, bilimsel ve profesyonel",
+    min_words: int = 0,
+    max_words: int = 0,
+    use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    revise_text'in streaming versiyonu
+    
+    Yields:
+        str: Revize edilen metnin temizlenmiş parçaları
+    """
+    prompt = build_revise_prompt(
+        current_content=current_content,
+        revision_prompt=revision_prompt,
+        section_title=section_title,
+        project_title=project_title,
+        style=style,
+        min_words=min_words,
+        max_words=max_words
+    )
+    async for chunk in stream_processed_text(prompt, use_cache=use_cache):
+        yield chunk
 
 
 def post_process_text(text: str) -> str:
@@ -293,7 +652,7 @@ def post_process_text(text: str) -> str:
     
     Args:
         text: İşlenecek metin
-        
+    
     Returns:
         str: Temizlenmiş metin
     """
@@ -309,13 +668,100 @@ def post_process_text(text: str) -> str:
     return text
 
 
+class StreamingPostProcessor:
+    """
+    post_process_text'in parça parça çalışan versiyonu
+    
+    Boşluk sadeleştirme, markdown işaretlerini (**, __, ##) kaldırma ve
+    strip adımlarını sırayla uygular. Chunk sınırına denk gelen işaret ve
+    boşluklar bir sonraki parçaya kadar bekletilir; böylece tüm parçaların
+    birleşimi, tam metne post_process_text uygulanmış haliyle aynıdır.
+    """
+    
+    MARKER_CHARS = ("*", "_", "#")
+    
+    def __init__(self):
+        self._has_word = False
+        self._pending_space = False
+        self._marker_carry = {char: "" for char in self.MARKER_CHARS}
+        self._strip_started = False
+        self._strip_pending = ""
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Yeni bir ham parça işler
+        
+        Args:
+            chunk: Modelden gelen ham metin parçası
+        
+        Returns:
+            str: Güvenle gönderilebilecek temizlenmiş metin (boş olabilir)
+        """
+        text = self._collapse_whitespace(chunk)
+        for char in self.MARKER_CHARS:
+            text = self._remove_marker_pairs(char, text, final=False)
+        return self._strip(text, final=False)
+    
+    def flush(self) -> str:
+        """
+        Bekletilen son karakterleri işler (stream bittiğinde çağrılır)
+        
+        Returns:
+            str: Kalan temizlenmiş metin
+        """
+        text = ""
+        for char in self.MARKER_CHARS:
+            text = self._remove_marker_pairs(char, text, final=True)
+        return self._strip(text, final=True)
+    
+    def _collapse_whitespace(self, chunk: str) -> str:
+        # " ".join(text.split()) adımı
+        if not chunk:
+            return ""
+        words = chunk.split()
+        if not words:
+            self._pending_space = True
+            return ""
+        
+        needs_space = self._has_word and (self._pending_space or chunk[0].isspace())
+        self._pending_space = chunk[-1].isspace()
+        self._has_word = True
+        return (" " if needs_space else "") + " ".join(words)
+    
+    def _remove_marker_pairs(self, char: str, text: str, final: bool) -> str:
+        # text.replace(char * 2, "") adımı; sondaki tek işaret bir sonraki parçayla eşleşebilir
+        text = self._marker_carry[char] + text
+        self._marker_carry[char] = ""
+        
+        if not final:
+            run_length = len(text) - len(text.rstrip(char))
+            if run_length % 2 == 1:
+                self._marker_carry[char] = char
+                text = text[:-1]
+        
+        return text.replace(char * 2, "")
+    
+    def _strip(self, text: str, final: bool) -> str:
+        # text.strip() adımı; sondaki boşluklar devamı gelene kadar bekletilir
+        if not self._strip_started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._strip_started = True
+        
+        text = self._strip_pending + text
+        stripped = text.rstrip()
+        self._strip_pending = "" if final else text[len(stripped):]
+        return stripped
+
+
 def count_words(text: str) -> int:
     """
     Metindeki kelime sayısını hesaplar
     
     Args:
         text: Sayılacak metin
-        
+    
     Returns:
         int: Kelime sayısı
     """
@@ -330,7 +776,7 @@ def check_word_limit(text: str, min_words: int, max_words: int) -> dict:
         text: Kontrol edilecek metin
         min_words: Minimum kelime sayısı
         max_words: Maximum kelime sayısı
-        
+    
     Returns:
         dict: {"valid": bool, "word_count": int, "message": str}
     """
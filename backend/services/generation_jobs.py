@@ -0,0 +1,185 @@
+"""
+Toplu AI üretim işleri
+Bir projenin tüm bölümleri için AI metin üretimini sınırlı eşzamanlılıkla arka planda yürütür
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Set
+from config.settings import settings
+from data.template_registry import get_section_limits
+from services.gemini import generate_text
+from services.ai_resilience import set_request_deadline
+
+# Bellekte tutulacak en fazla iş sayısı (eskiler atılır)
+MAX_STORED_JOBS = 1000
+
+_jobs: "OrderedDict[str, dict]" = OrderedDict()
+_running_tasks: Set[asyncio.Task] = set()
+
+
+def start_generate_all(
+    project: dict,
+    user_id: str,
+    style: str,
+    additional_instructions: str = "",
+    concurrency: Optional[int] = None,
+    use_cache: bool = True
+) -> dict:
+    """
+    Projenin tüm bölümleri için üretim işini başlatır ve hemen döner
+    
+    Taslağı boş olan bölümler atlanır (üretilecek içerik yok).
+    
+    Args:
+        project: Proje verisi
+        user_id: İşi başlatan kullanıcı
+        style: Yazım stili
+        additional_instructions: Tüm bölümlere eklenecek talimatlar
+        concurrency: Eşzamanlı Gemini çağrısı sayısı (ayardaki üst sınırı aşamaz)
+        use_cache: AI yanıt cache'i kullanılsın mı
+    
+    Returns:
+        dict: İş durumu (job_id ile)
+    """
+    limit = settings.AI_GENERATE_ALL_CONCURRENCY
+    if concurrency:
+        limit = min(concurrency, limit)
+    
+    now = datetime.utcnow().isoformat() + "Z"
+    job = {
+        "job_id": f"job-{uuid.uuid4()}",
+        "project_id": project["id"],
+        "user_id": user_id,
+        "status": "pending",
+        "concurrency": limit,
+        "created_at": now,
+        "finished_at": None,
+        "sections": [
+            {
+                "section_id": section["id"],
+                "title": section["title"],
+                "order": section["order"],
+                "status": "pending" if section.get("draft_content", "").strip() else "skipped",
+                "generated_content": None,
+                "error": None,
+            }
+            for section in project.get("sections", [])
+        ],
+    }
+    _store_job(job)
+    
+    task = asyncio.create_task(_run_job(
+        job,
+        drafts={section["id"]: section.get("draft_content", "") for section in project.get("sections", [])},
+        project_title=project["title"],
+        template_id=project["template_id"],
+        style=style,
+        additional_instructions=additional_instructions,
+        use_cache=use_cache
+    ))
+    _running_tasks.add(task)
+    task.add_done_callback(_running_tasks.discard)
+    
+    return job_status(job)
+
+
+def get_job(job_id: str, project_id: str, user_id: str) -> Optional[dict]:
+    """
+    İş durumunu ve o ana kadarki sonuçları döndürür
+    
+    Returns:
+        dict: İş durumu veya None if not found
+    """
+    job = _jobs.get(job_id)
+    if not job or job["project_id"] != project_id or job["user_id"] != user_id:
+        return None
+    return job_status(job)
+
+
+def job_status(job: dict) -> dict:
+    """İşin API'ye dönecek görünümü (ilerleme sayaçlarıyla)"""
+    counts = {"pending": 0, "running": 0, "completed": 0, "failed": 0, "skipped": 0}
+    for section in job["sections"]:
+        counts[section["status"]] += 1
+    
+    return {
+        "job_id": job["job_id"],
+        "project_id": job["project_id"],
+        "status": job["status"],
+        "concurrency": job["concurrency"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "progress": {"total": len(job["sections"]), **counts},
+        "sections": [dict(section) for section in job["sections"]],
+    }
+
+
+async def cancel_all_jobs():
+    """Uygulama kapanırken çalışan işleri iptal eder"""
+    for task in list(_running_tasks):
+        task.cancel()
+    if _running_tasks:
+        await asyncio.gather(*_running_tasks, return_exceptions=True)
+
+
+async def _run_job(
+    job: dict,
+    drafts: Dict[str, str],
+    project_title: str,
+    template_id: str,
+    style: str,
+    additional_instructions: str,
+    use_cache: bool
+):
+    semaphore = asyncio.Semaphore(job["concurrency"])
+    job["status"] = "running"
+    
+    async def generate_section(section: dict):
+        async with semaphore:
+            section["status"] = "running"
+            # İşi başlatan isteğin deadline'ı devralınmaz; her bölüm kendi süresini alır
+            set_request_deadline(settings.AI_REQUEST_TIMEOUT_SECONDS)
+            limits = get_section_limits(template_id, section["title"])
+            try:
+                result = await generate_text(
+                    draft_content=drafts[section["section_id"]],
+                    section_title=section["title"],
+                    project_title=project_title,
+                    style=style,
+                    min_words=limits["min"],
+                    max_words=limits["max"],
+                    additional_instructions=additional_instructions,
+                    use_cache=use_cache
+                )
+                section["generated_content"] = result["generated_content"]
+                section["status"] = "completed"
+            except Exception as e:
+                section["error"] = str(e)
+                section["status"] = "failed"
+    
+    try:
+        await asyncio.gather(*[
+            generate_section(section)
+            for section in job["sections"]
+            if section["status"] == "pending"
+        ])
+        job["status"] = "completed"
+    except asyncio.CancelledError:
+        job["status"] = "cancelled"
+        raise
+    finally:
+        job["finished_at"] = datetime.utcnow().isoformat() + "Z"
+
+
+def _store_job(job: dict):
+    _jobs[job["job_id"]] = job
+    while len(_jobs) > MAX_STORED_JOBS:
+        # En eski bitmiş işi at; hepsi çalışıyorsa en eskisini
+        oldest_id = next(
+            (job_id for job_id, stored in _jobs.items() if stored["finished_at"]),
+            next(iter(_jobs))
+        )
+        del _jobs[oldest_id]
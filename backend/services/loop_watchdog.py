@@ -0,0 +1,214 @@
+"""
+Event loop bekçisi
+Event loop'u bloklayan senkron kodu (async handler içinde Gemini/SDK
+çağrısı, büyük liste taramaları, DOCX render) yakalar ve route bazında raporlar
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from config.settings import settings
+from services.metrics import LATENCY_BUCKETS, metrics
+
+# Yakalanan yığında tutulan en fazla çerçeve (en içteki çerçeveler)
+MAX_STACK_FRAMES = 30
+
+# Route'a veya task'a bağlanamayan bloklamalar bu etiketle sayılır
+UNKNOWN_ROUTE = "unknown"
+
+loop_blocks = metrics.counter(
+    "akademikform_event_loop_blocks_total", "Eşiği aşan event loop bloklamaları", ("route",)
+)
+loop_block_duration = metrics.histogram(
+    "akademikform_event_loop_block_seconds", "Event loop'un bloklandığı süre", ("route",), LATENCY_BUCKETS
+)
+
+
+class LoopWatchdog:
+    """
+    Event loop gecikmesini sürekli ölçen bekçi
+    
+    Loop üzerinde çalışan heartbeat coroutine'i her `interval` saniyede
+    bir zaman damgası bırakır. Ayrı bir daemon thread damgayı izler;
+    heartbeat `threshold_ms`'den fazla gecikirse loop o anda bloklanmış
+    demektir ve thread, loop thread'inin yığınını (bloklayan kodun
+    kendisi) sys._current_frames() ile alır. Yığındaki ilk endpoint
+    fonksiyonu bloklamanın route'unu verir; endpoint yoksa çalışan task'ın
+    coroutine adı kullanılır (arka plan işleri).
+    
+    Loop geri döndüğünde heartbeat gerçek gecikmeyi ölçer ve olayı
+    kaydeder. Route bazındaki toplamlar ve son olaylar yalnızca loop
+    thread'inde güncellenir; bekçi thread'i yalnızca yakaladığı yığını bırakır.
+    
+    Attributes:
+        threshold_ms: Bu süreden uzun bloklamalar kaydedilir
+        interval: Heartbeat aralığı (saniye)
+    """
+    
+    def __init__(self, threshold_ms: float, max_events: int):
+        self.threshold_ms = threshold_ms
+        self.interval = min(threshold_ms / 2000, 0.05)
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._offenders: Dict[str, Dict[str, Any]] = {}
+        self._endpoints: Dict[Any, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._expected: float = 0.0
+        # Bekçi thread'inin bıraktığı yakalama: (beklenen heartbeat zamanı, route, yığın)
+        self._captured: Optional[Tuple[float, str, List[str]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+    
+    def start(self, routes: Iterable[Any] = ()):
+        """
+        Heartbeat'i ve bekçi thread'ini başlatır (uygulama açılışında)
+        
+        Args:
+            routes: Uygulamanın route'ları; endpoint fonksiyonları route şablonlarıyla eşlenir
+        """
+        if self._task is not None:
+            return
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                methods = ",".join(sorted(getattr(route, "methods", None) or ()))
+                self._endpoints[code] = f"{methods} {route.path}".strip()
+        
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._expected = time.monotonic() + self.interval
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+    
+    async def stop(self):
+        """Heartbeat'i ve bekçi thread'ini durdurur"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._stopped.set()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self._thread.join(timeout=1)
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Route bazında bloklama raporu
+        
+        Returns:
+            Dict: Route'lar toplam bloklama süresine göre sıralı, her biri son
+            yakalanan yığınla; ayrıca son olaylar (yeniden eskiye)
+        """
+        offenders = sorted(self._offenders.values(), key=lambda item: item["total_ms"], reverse=True)
+        return {
+            "enabled": self.running,
+            "threshold_ms": self.threshold_ms,
+            "offenders": [dict(item) for item in offenders],
+            "recent": list(reversed(self._events)),
+        }
+    
+    def reset(self):
+        """Toplanan raporu siler"""
+        self._events.clear()
+        self._offenders.clear()
+    
+    # --- Loop thread'i ---
+    
+    async def _heartbeat(self):
+        while True:
+            self._expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = (time.monotonic() - self._expected) * 1000
+            if lag_ms > self.threshold_ms:
+                self._record(lag_ms)
+    
+    def _record(self, lag_ms: float):
+        captured, self._captured = self._captured, None
+        if captured is not None and captured[0] == self._expected:
+            _, route, stack = captured
+        else:
+            # Bloklama bekçi thread'i uyanmadan bitti; yığın yok
+            route, stack = UNKNOWN_ROUTE, []
+        
+        event = {
+            "route": route,
+            "lag_ms": round(lag_ms, 1),
+            "timestamp": datetime.now().isoformat(),
+            "stack": stack,
+        }
+        self._events.append(event)
+        
+        offender = self._offenders.get(route)
+        if offender is None:
+            offender = self._offenders[route] = {"route": route, "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        offender["count"] += 1
+        offender["total_ms"] = round(offender["total_ms"] + lag_ms, 1)
+        offender["max_ms"] = max(offender["max_ms"], event["lag_ms"])
+        if stack:
+            offender["last_stack"] = stack
+        offender["last_seen"] = event["timestamp"]
+        
+        loop_blocks.inc((route,))
+        loop_block_duration.observe((route,), lag_ms / 1000)
+        location = stack[-1] if stack else "yığın yakalanamadı"
+        print(f"⚠️ Event loop {lag_ms:.0f} ms bloklandı ({route}): {location}")
+    
+    # --- Bekçi thread'i ---
+    
+    def _watch(self):
+        # Eşik aşıldıktan en geç çeyrek eşik sonra yığın alınır
+        poll = self.threshold_ms / 4000
+        threshold = self.threshold_ms / 1000
+        while not self._stopped.wait(poll):
+            expected = self._expected
+            if time.monotonic() - expected <= threshold:
+                continue
+            captured = self._captured
+            if captured is not None and captured[0] == expected:
+                continue  # Bu bloklamanın yığını zaten alındı
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._captured = (expected, *self._describe(frame))
+            del frame
+    
+    def _describe(self, frame) -> Tuple[str, List[str]]:
+        route = None
+        walker = frame
+        while walker is not None and route is None:
+            route = self._endpoints.get(walker.f_code)
+            walker = walker.f_back
+        if route is None:
+            route = self._task_name()
+        
+        summary = traceback.extract_stack(frame, limit=MAX_STACK_FRAMES)
+        stack = [f"{item.filename}:{item.lineno} {item.name}" for item in summary]
+        return route, stack
+    
+    def _task_name(self) -> str:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return UNKNOWN_ROUTE
+        coro = task.get_coro()
+        return f"task:{getattr(coro, '__qualname__', task.get_name())}"
+
+
+loop_watchdog = LoopWatchdog(
+    threshold_ms=settings.LOOP_WATCHDOG_THRESHOLD_MS,
+    max_events=settings.LOOP_WATCHDOG_MAX_EVENTS
+)
@@ -0,0 +1,261 @@
+"""
+Performans metrikleri
+İstek ve AI çağrısı sayaçlarını / histogramlarını tutar ve Prometheus
+metin formatında yazar (GET /api/v1/metrics)
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Süre (saniye), boyut (byte) ve karakter sayısı kovaları
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CHAR_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+# Eşleşmeyen yollar (404) tek etiketle sayılır; rastgele URL'ler seri sayısını şişirmez
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """Etiket değerleri -> değer eşlemesi tutan metrik ailesi"""
+    
+    kind = ""
+    
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+    
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Labels, float] = {}
+    
+    def inc(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+    
+    def set(self, value: float, labels: Labels = ()):
+        # Başka bir nesnenin tuttuğu toplamı aktarmak için (collector'larda)
+        self._values[labels] = value
+    
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer"""
+    
+    kind = "gauge"
+    
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(_Metric):
+    """
+    Kovaları önceden belirlenmiş histogram
+    
+    Her etiket kombinasyonu için kova sayaçları bir liste olarak tutulur;
+    gözlem bir bisect ve üç toplama işlemidir.
+    """
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+        # labels -> [kova sayaçları..., +Inf, toplam, adet]
+        self._series: Dict[Labels, List[float]] = {}
+    
+    def observe(self, labels: Labels, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+    
+    def count(self, labels: Labels) -> int:
+        series = self._series.get(labels)
+        return int(series[-1]) if series else 0
+    
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{label_text} {int(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrik kayıt defteri
+    
+    Sayaçlar kilitsizdir: istek ve AI metrikleri yalnızca event loop
+    thread'inde güncellenir, bu yüzden artırma işlemleri birbirini
+    bölmez. Başka thread'lerin tuttuğu değerler (ör. AI cache) kendi
+    nesnelerinde kalır; collector'lar onları yalnızca okuma sırasında
+    gauge'lara aktarır.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+    
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"'{metric.name}' metriği zaten kayıtlı")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+    
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+    
+    def histogram(
+        self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]
+    ) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+    
+    def add_collector(self, collector: Callable[[], None]):
+        """Okuma öncesinde çağrılacak fonksiyon ekler (gauge'ları günceller)"""
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """Tüm metrikleri Prometheus metin formatında (0.0.4) döndürür"""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"⚠️ Metrik toplanamadı: {e}")
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# --- HTTP ---
+
+http_requests = metrics.counter(
+    "akademikform_http_requests_total", "Tamamlanan HTTP istekleri", ("method", "route", "status")
+)
+http_request_duration = metrics.histogram(
+    "akademikform_http_request_duration_seconds",
+    "İsteğin sunucuda geçen süresi (stream yanıtlarda son parçaya kadar)",
+    ("method", "route"), LATENCY_BUCKETS
+)
+http_response_size = metrics.histogram(
+    "akademikform_http_response_size_bytes", "Yanıt gövdesinin boyutu", ("method", "route"), SIZE_BUCKETS
+)
+http_requests_in_flight = metrics.gauge(
+    "akademikform_http_requests_in_flight", "İşlenmekte olan HTTP istekleri"
+)
+
+# --- AI ---
+
+ai_requests = metrics.counter(
+    "akademikform_ai_requests_total",
+    "AI metin istekleri (result: ok, cache_hit, error)", ("mode", "result")
+)
+ai_prompt_chars = metrics.histogram(
+    "akademikform_ai_prompt_chars", "Gemini'ye gönderilen prompt uzunluğu (karakter)", ("mode",), CHAR_BUCKETS
+)
+ai_output_chars = metrics.histogram(
+    "akademikform_ai_output_chars", "Gemini'den dönen temizlenmiş metnin uzunluğu (karakter)", ("mode",), CHAR_BUCKETS
+)
+ai_upstream_latency = metrics.histogram(
+    "akademikform_ai_upstream_latency_seconds",
+    "Tek Gemini denemesinin süresi (stream'de ilk parçaya kadar)",
+    ("model", "outcome"), LATENCY_BUCKETS
+)
+ai_retries = metrics.counter(
+    "akademikform_ai_retries_total", "Geçici hata sonrası yeniden denemeler", ("model",)
+)
+ai_fallbacks = metrics.counter(
+    "akademikform_ai_fallbacks_total", "Başarısız olup bırakılan modeller (varsa sıradaki yedeğe geçilir)", ("model",)
+)
+
+
+class MetricsMiddleware:
+    """
+    İstek metriklerini kaydeden ASGI middleware
+    
+    BaseHTTPMiddleware yerine doğrudan ASGI olarak yazıldı: yanıt
+    yeniden sarılmaz, stream yanıtlar da olduğu gibi geçer. Route etiketi
+    eşleşen endpoint'in şablonudur (ör. /api/v1/projects/{project_id}).
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        # Yanıt başlamadan hata çıkarsa ServerErrorMiddleware 500 döner
+        status = 500
+        size = 0
+        
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+            http_requests.inc((*labels, str(status)))
+            http_request_duration.observe(labels, time.perf_counter() - start)
+            http_response_size.observe(labels, size)
+
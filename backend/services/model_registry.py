@@ -0,0 +1,250 @@
+"""
+Gemini Model Registry
+Model keşfini import sırasında değil ilk kullanımda yapar ve model listesini cache'ler
+"""
+
+import threading
+import time
+from typing import Optional, List, Dict, Any
+import google.generativeai as genai
+from config.settings import settings
+
+
+# Öncelik sırası (free tier için en uygun modeller):
+# 1. gemini-2.5-flash (stable, 1M token, 65K output) - EN İYİ
+# 2. gemini-2.0-flash-001 (stable, 1M token, 8K output)
+# 3. gemini-flash-latest (latest, 1M token, 65K output)
+# 4. gemini-2.0-flash (stable)
+PREFERRED_MODELS = [
+    'models/gemini-2.5-flash',           # En iyi: Stable, yüksek limit
+    'models/gemini-2.0-flash-001',      # İyi: Stable, orta limit
+    'models/gemini-flash-latest',        # İyi: Latest, yüksek limit
+    'models/gemini-2.0-flash',          # Alternatif
+    'models/gemini-2.5-flash-lite',     # Hafif versiyon
+]
+
+FALLBACK_MODEL = 'models/gemini-2.5-flash'
+
+# Model geçici bir hatayla çözümlenemezse tekrar denemeden önce beklenecek süre (saniye)
+RESOLVE_RETRY_SECONDS = 5.0
+
+
+class ModelRegistry:
+    """
+    Gemini modelini tembel (lazy) şekilde çözümler
+    
+    - `GEMINI_MODEL_NAME` ayarlıysa liste çekilmeden doğrudan o model kullanılır
+    - Aksi halde model listesi bir kez çekilir ve `GEMINI_MODEL_LIST_TTL_SECONDS`
+      boyunca cache'lenir
+    
+    Metodlar ağ çağrısı yapabildiği için event loop dışında (executor /
+    threadpool) çağrılmalıdır.
+    """
+    
+    def __init__(self, preferred_models: List[str], model_name: Optional[str], list_ttl_seconds: float):
+        self.preferred_models = preferred_models
+        self.seed_model_name = model_name
+        self.list_ttl_seconds = list_ttl_seconds
+        self._lock = threading.Lock()
+        # Çözümleme list_models'i çağırır (o da _lock alır); bu yüzden ayrı kilit
+        self._resolve_lock = threading.Lock()
+        self._configured = False
+        self._resolved = False
+        self._retry_at = 0.0
+        self._model = None
+        self._fallback_models: Optional[List[Any]] = None
+        self._models_cache: Optional[List[Dict[str, Any]]] = None
+        self._models_fetched_at = 0.0
+    
+    @property
+    def is_resolved(self) -> bool:
+        """Model çözümlendiyse True (sonraki get_model çağrıları ağa gitmez)"""
+        return self._resolved
+    
+    @property
+    def model_name(self) -> str:
+        """Çözümlenen modelin adı (henüz çözümlenmediyse boş)"""
+        return getattr(self._model, "model_name", "") if self._model else ""
+    
+    def get_model(self):
+        """
+        Kullanılacak modeli döndürür, ilk çağrıda çözümler
+        
+        Çözümleme geçici bir hatayla (ör. API yapılandırılamadı) None dönerse
+        sonuç saklanmaz; RESOLVE_RETRY_SECONDS sonra tekrar denenir. Yalnızca
+        API key yoksa None kalıcıdır.
+        
+        Returns:
+            GenerativeModel veya None (API key yoksa ya da çözümlenemediyse)
+        """
+        if self._resolved:
+            return self._model
+        if time.monotonic() < self._retry_at:
+            return None
+        
+        with self._resolve_lock:
+            if not self._resolved and time.monotonic() >= self._retry_at:
+                model = self._resolve_model()
+                with self._lock:
+                    # Çözümleme sürerken set_model ile atandıysa o model kalır
+                    if self._resolved:
+                        return self._model
+                    if model is not None or not settings.GOOGLE_API_KEY:
+                        self._model = model
+                        self._resolved = True
+                    else:
+                        self._retry_at = time.monotonic() + RESOLVE_RETRY_SECONDS
+        return self._model
+    
+    def get_fallback_models(self, limit: int) -> List[Any]:
+        """
+        Birincil model hata verdiğinde sırayla denenecek yedek modeller
+        
+        Tercih listesindeki diğer modellerden oluşur; model listesi daha önce
+        çekildiyse yalnızca mevcut olanlar alınır. Ağ çağrısı yapmaz.
+        
+        Args:
+            limit: En fazla kaç yedek model döneceği
+            
+        Returns:
+            List: Model nesneleri (birincil model hariç)
+        """
+        if self._fallback_models is not None:
+            return self._fallback_models[:limit]
+        if not self._model or not settings.GOOGLE_API_KEY:
+            return []
+        
+        available = None
+        if self._models_cache is not None:
+            available = {m["name"] for m in self._models_cache}
+        
+        with self._lock:
+            if self._fallback_models is None:
+                primary = self.model_name
+                self._fallback_models = [
+                    genai.GenerativeModel(name)
+                    for name in self.preferred_models
+                    if name != primary and (available is None or name in available)
+                ]
+        return self._fallback_models[:limit]
+    
+    def set_model(self, model, fallback_models: Optional[List[Any]] = None):
+        """Modeli (ve isteğe bağlı yedeklerini) elle atar (benchmark ve sahte model için)"""
+        with self._lock:
+            self._model = model
+            self._fallback_models = list(fallback_models or [])
+            self._resolved = True
+            self._retry_at = 0.0
+    
+    def reset(self):
+        """Çözümlenen modeli unutur; bir sonraki kullanımda yeniden seçilir"""
+        with self._lock:
+            self._model = None
+            self._fallback_models = None
+            self._resolved = False
+            self._retry_at = 0.0
+    
+    def list_models(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Mevcut Gemini modellerini döndürür (cache'li)
+        
+        Args:
+            force_refresh: True ise cache süresi dolmamış olsa da yeniden çeker
+            
+        Returns:
+            List[Dict]: Model bilgileri
+            
+        Raises:
+            Exception: Liste alınamazsa
+        """
+        with self._lock:
+            is_fresh = (
+                self._models_cache is not None
+                and time.monotonic() - self._models_fetched_at < self.list_ttl_seconds
+            )
+            if is_fresh and not force_refresh:
+                return self._models_cache
+        
+        self._configure()
+        model_list = []
+        for m in genai.list_models():
+            model_list.append({
+                "name": m.name,
+                "display_name": m.display_name,
+                "description": m.description,
+                "supported_generation_methods": list(m.supported_generation_methods),
+                "input_token_limit": m.input_token_limit if hasattr(m, 'input_token_limit') else None,
+                "output_token_limit": m.output_token_limit if hasattr(m, 'output_token_limit') else None,
+            })
+        
+        with self._lock:
+            self._models_cache = model_list
+            self._models_fetched_at = time.monotonic()
+        return model_list
+    
+    def status(self) -> Dict[str, Any]:
+        """Registry durumunu döndürür"""
+        cache_age = None
+        if self._models_cache is not None:
+            cache_age = round(time.monotonic() - self._models_fetched_at, 1)
+        return {
+            "resolved": self._resolved,
+            "active_model": self.model_name or None,
+            "seed_model": self.seed_model_name,
+            "models_cached": self._models_cache is not None,
+            "models_cache_age_seconds": cache_age,
+        }
+    
+    def _configure(self):
+        if not self._configured:
+            genai.configure(api_key=settings.GOOGLE_API_KEY)
+            self._configured = True
+    
+    def _resolve_model(self):
+        if not settings.GOOGLE_API_KEY:
+            print("⚠️ GOOGLE_API_KEY ayarlanmamış, Gemini modeli yüklenmedi")
+            return None
+        
+        try:
+            self._configure()
+            
+            # Ayarlardan verilen model varsa liste çekmeye gerek yok
+            if self.seed_model_name:
+                print(f"✅ Kullanılan model (ayarlardan): {self.seed_model_name}")
+                return genai.GenerativeModel(self.seed_model_name)
+            
+            try:
+                available_models = [
+                    m["name"] for m in self.list_models()
+                    if 'generateContent' in m["supported_generation_methods"]
+                ]
+                
+                for preferred in self.preferred_models:
+                    if preferred in available_models:
+                        print(f"✅ Kullanılan model: {preferred}")
+                        return genai.GenerativeModel(preferred)
+                
+                # Eğer hiçbiri bulunamazsa, ilk uygun modeli kullan
+                if available_models:
+                    model_name = available_models[0]
+                    print(f"✅ Kullanılan model (ilk bulunan): {model_name}")
+                    return genai.GenerativeModel(model_name)
+                
+            except Exception as list_error:
+                print(f"⚠️ Model listesi alınamadı: {list_error}")
+            
+            # Fallback: Direkt model adı ile dene (en stabil)
+            print(f"⚠️ Model listesi alınamadı, fallback model kullanılıyor: {FALLBACK_MODEL}")
+            return genai.GenerativeModel(FALLBACK_MODEL)
+            
+        except Exception as e:
+            print(f"⚠️ Gemini API yapılandırılamadı: {e}")
+            return None
+
+
+# Global registry instance
+model_registry = ModelRegistry(
+    preferred_models=PREFERRED_MODELS,
+    model_name=settings.GEMINI_MODEL_NAME,
+    list_ttl_seconds=settings.GEMINI_MODEL_LIST_TTL_SECONDS
+)
@@ -0,0 +1,226 @@
+"""
+Readiness durumu
+Bağımlılıkları arka planda periyodik olarak yoklar; /api/v1/ready son
+sonucu beklemeden döndürür
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config.settings import settings
+from data.mock_projects import ping_store
+from services.ai_resilience import get_circuit_breaker
+from services.export_jobs import export_pool_warming, get_export_pool
+from services.gemini import ai_executor
+from services.model_registry import model_registry
+
+# Event loop gecikmesinin ölçüldüğü aralık (saniye)
+LAG_SAMPLE_INTERVAL = 0.1
+
+
+class CheckFailed(Exception):
+    """Probe tamamlandı ama sonuç eşik dışında"""
+
+
+class ProbeStillRunning(Exception):
+    """Önceki probe hâlâ bitmedi (süre aşımı olarak raporlanır)"""
+
+
+class ReadinessMonitor:
+    """
+    Readiness probe'larını arka planda çalıştırır ve son sonucu tutar
+    
+    Her `interval` saniyede bir tüm kontroller eşzamanlı ve `timeout` ile
+    sınırlı çalışır. Kritik kontrollerden biri başarısızsa durum
+    not_ready olur (HTTP 503, load balancer trafiği başka instance'a
+    yönlendirir); yalnızca kritik olmayanlar başarısızsa degraded olur.
+    
+    Kritik: store, event loop gecikmesi, AI executor kuyruğu.
+    Kritik değil: Gemini erişimi, export process havuzu (tüm instance'lar
+    aynı upstream'i kullanır; trafiği kaydırmak düzeltmez).
+    
+    Attributes:
+        interval: Yenileme aralığı (saniye)
+        timeout: Kontrol başına süre sınırı (saniye)
+    """
+    
+    def __init__(self, interval: float, timeout: float, max_loop_lag_ms: float, max_ai_queue: int):
+        self.interval = interval
+        self.timeout = timeout
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_ai_queue = max_ai_queue
+        self._snapshot: Dict[str, Any] = {"status": "starting", "checks": {}}
+        self._refreshed_at: Optional[float] = None
+        self._max_lag_ms = 0.0
+        self._tasks: List[asyncio.Task] = []
+        # Bloklayan probe'lar (store, model listesi) kendi thread'lerinde: takılırsa
+        # yalnızca bu thread'ler bekler, istek thread havuzundan token tutmaz
+        self._probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="readiness")
+        self._probes: Dict[str, Future] = {}
+        self._checks: Dict[str, tuple] = {
+            "store": (self.check_store, True),
+            "event_loop": (self.check_event_loop, True),
+            "ai_executor": (self.check_ai_executor, True),
+            "ai_upstream": (self.check_ai_upstream, False),
+            "export_pool": (self.check_export_pool, False),
+        }
+    
+    def start(self):
+        """Arka plan görevlerini başlatır (uygulama açılışında)"""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._sample_lag()), loop.create_task(self._refresh_loop())]
+    
+    async def stop(self):
+        """Arka plan görevlerini durdurur"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Son readiness sonucu
+        
+        Sonuç yenileme aralığının üç katından eskiyse (yenileyici takıldı
+        veya event loop uzun süre bloklandı) not_ready döner.
+        """
+        snapshot = dict(self._snapshot)
+        if self._refreshed_at is not None:
+            age = time.monotonic() - self._refreshed_at
+            snapshot["age_seconds"] = round(age, 2)
+            if age > self.interval * 3:
+                snapshot["status"] = "not_ready"
+                snapshot["reason"] = "stale"
+        return snapshot
+    
+    async def refresh(self) -> Dict[str, Any]:
+        """Tüm kontrolleri çalıştırır ve sonucu saklar"""
+        names = list(self._checks)
+        results = await asyncio.gather(*[self._run_check(name) for name in names])
+        checks = dict(zip(names, results))
+        
+        failed = [name for name, result in checks.items() if result["status"] != "ok"]
+        if any(checks[name]["critical"] for name in failed):
+            status = "not_ready"
+        elif failed:
+            status = "degraded"
+        else:
+            status = "ready"
+        
+        self._snapshot = {
+            "status": status,
+            "checks": checks,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self._refreshed_at = time.monotonic()
+        return self._snapshot
+    
+    # --- Kontroller ---
+    
+    async def check_store(self) -> Dict[str, Any]:
+        await self._run_blocking("store", ping_store)
+        return {"backend": "sqlite" if (settings.DATABASE_URL or "").startswith("sqlite") else "memory"}
+    
+    async def check_event_loop(self) -> Dict[str, Any]:
+        # Son yenilemeden bu yana ölçülen en yüksek gecikme
+        lag_ms, self._max_lag_ms = self._max_lag_ms, 0.0
+        detail = {"max_lag_ms": round(lag_ms, 1), "threshold_ms": self.max_loop_lag_ms}
+        if lag_ms > self.max_loop_lag_ms:
+            raise CheckFailed(detail)
+        return detail
+    
+    async def check_ai_executor(self) -> Dict[str, Any]:
+        detail = {**ai_executor.stats(), "threshold": self.max_ai_queue}
+        if detail["queued"] > self.max_ai_queue:
+            raise CheckFailed(detail)
+        return detail
+    
+    async def check_ai_upstream(self) -> Dict[str, Any]:
+        if not settings.GOOGLE_API_KEY:
+            # Test/benchmark'ta dışarıdan verilen model varsa o kullanılır
+            if model_registry.is_resolved and model_registry.get_model() is not None:
+                return {"model": model_registry.model_name, "source": "injected"}
+            raise CheckFailed({"reason": "not_configured"})
+        
+        # Model listesi registry'de cache'lenir; TTL dolmadıysa ağa çıkılmaz
+        models = await self._run_blocking("ai_upstream", model_registry.list_models)
+        model_name = model_registry.model_name
+        breaker = get_circuit_breaker(model_name) if model_name else None
+        detail = {
+            "model": model_name or None,
+            "models_available": len(models),
+            "circuit": breaker.state if breaker else None,
+        }
+        if breaker is not None and breaker.state == "open":
+            raise CheckFailed(detail)
+        return detail
+    
+    async def check_export_pool(self) -> Dict[str, Any]:
+        pool = get_export_pool()
+        if pool is None:
+            return {"workers": 0, "mode": "thread"}
+        if export_pool_warming():
+            # Açılışta process'ler spawn edilirken kontrol atlanır
+            return {"workers": settings.EXPORT_PROCESS_WORKERS, "warming": True}
+        # Boş bir iş gönderip dönüşünü bekler (process'ler ayakta ve kuyruk akıyor mu)
+        pid = await asyncio.wrap_future(pool.submit(os.getpid))
+        return {"workers": settings.EXPORT_PROCESS_WORKERS, "responded_pid": pid}
+    
+    # --- Yardımcılar ---
+    
+    async def _run_check(self, name: str) -> Dict[str, Any]:
+        check, critical = self._checks[name]
+        start = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(check(), timeout=self.timeout)
+            result = {"status": "ok", **detail}
+        except asyncio.TimeoutError:
+            result = {"status": "timeout"}
+        except ProbeStillRunning:
+            result = {"status": "timeout", "reason": "previous_probe_running"}
+        except CheckFailed as e:
+            result = {"status": "fail", **e.args[0]}
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        result["critical"] = critical
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+    
+    async def _run_blocking(self, name: str, func):
+        # Süre aşımı yalnızca beklemeyi bırakır, thread'deki probe sürer;
+        # o bitmeden aynı probe yeniden başlatılmaz
+        running = self._probes.get(name)
+        if running is not None and not running.done():
+            raise ProbeStillRunning()
+        self._probes[name] = self._probe_executor.submit(func)
+        return await asyncio.wrap_future(self._probes[name])
+    
+    async def _sample_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag_ms = max(loop.time() - expected, 0.0) * 1000
+            if lag_ms > self._max_lag_ms:
+                self._max_lag_ms = lag_ms
+    
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ Readiness kontrolleri çalıştırılamadı: {e}")
+            await asyncio.sleep(self.interval)
+
+
+readiness_monitor = ReadinessMonitor(
+    interval=settings.READINESS_REFRESH_SECONDS,
+    timeout=settings.READINESS_CHECK_TIMEOUT_SECONDS,
+    max_loop_lag_ms=settings.READINESS_MAX_LOOP_LAG_MS,
+    max_ai_queue=settings.READINESS_MAX_AI_QUEUE
+)
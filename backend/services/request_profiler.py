@@ -0,0 +1,285 @@
+"""
+Yavaş istek profili
+İsteklerin örneklenen bir kısmını çalışırken profiller; gecikme bütçesini
+aşanların en çok zaman geçirdiği çerçeveleri ve flamegraph'a uygun
+collapsed yığınlarını sınırlı bir halkada saklar
+"""
+
+import asyncio
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from config.settings import settings
+
+# Aynı anda profillenen en fazla istek (örnekleme maliyetini sınırlar)
+MAX_ACTIVE_PROFILES = 4
+
+# Raporda listelenen en çok zaman alan çerçeve sayısı
+TOP_FRAMES = 15
+
+
+def _frame_label(code, lineno: int) -> str:
+    # collapsed formatında ';' ayraçtır; dosya yolunun son iki parçası yeterli
+    path = "/".join(code.co_filename.replace(os.sep, "/").rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({path}:{lineno})"
+
+
+class _ActiveProfile:
+    """Profillenmekte olan tek istek"""
+    
+    def __init__(self, task: asyncio.Task, anchor):
+        self.task = task
+        # Route handler'ının çerçevesi; yığınlar bunun içinden başlar
+        self.anchor = anchor
+        self.samples: Counter = Counter()
+
+
+class RequestProfiler:
+    """
+    İstek başına örnekleyen profiler
+    
+    Profillenen bir istek varken ayrı bir thread her `interval_ms`'de bir
+    örnek alır. İsteğin task'ı o anda çalışıyorsa loop thread'inin yığını
+    (CPU'da geçen süre), çalışmıyorsa task'ın await zinciri (Gemini,
+    thread havuzu veya store beklemesi) kaydedilir; böylece profil
+    isteğin tüm süresini kapsar. Yığınlar route handler'ından başlar.
+    
+    Bütçeyi aşmayan isteklerin örnekleri atılır. Aşanların profili en
+    fazla `max_profiles` kayıtlık halkada tutulur; en eskisi düşer.
+    
+    Attributes:
+        sample_rate: Profillenen istek oranı (0: kapalı)
+        budget_ms: Bu süreyi aşan istekler saklanır
+        interval_ms: Örnekleme aralığı
+    """
+    
+    def __init__(self, sample_rate: float, budget_ms: float, interval_ms: float, max_profiles: int):
+        self.sample_rate = sample_rate
+        self.budget_ms = budget_ms
+        self.interval_ms = interval_ms
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+        self._active: Dict[int, _ActiveProfile] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+    
+    def should_sample(self) -> bool:
+        """Bu istek profillenecek mi (oran ve eşzamanlı profil sınırı)"""
+        return self.sample_rate > 0 and len(self._active) < MAX_ACTIVE_PROFILES and random.random() < self.sample_rate
+    
+    def begin(self, anchor) -> Optional[_ActiveProfile]:
+        """
+        Çalışan task'ı profillemeye başlar
+        
+        Args:
+            anchor: Route handler'ının çerçevesi (sys._getframe())
+        
+        Returns:
+            _ActiveProfile veya task yoksa None
+        """
+        task = asyncio.current_task()
+        if task is None:
+            return None
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        active = _ActiveProfile(task, anchor)
+        with self._lock:
+            self._active[id(active)] = active
+        self._ensure_thread()
+        self._wakeup.set()
+        return active
+    
+    def end(self, active: _ActiveProfile, request: Request, route: str, status: int, duration_ms: float):
+        """
+        Profili kapatır; istek bütçeyi aştıysa kaydeder
+        
+        Args:
+            active: begin() sonucu
+            request: İstek
+            route: Route şablonu (ör. "GET /api/v1/projects/{project_id}")
+            status: Yanıt durum kodu
+            duration_ms: Handler'da geçen süre
+        """
+        with self._lock:
+            self._active.pop(id(active), None)
+            active.anchor = None
+            samples = Counter(active.samples)
+        if duration_ms <= self.budget_ms or not samples:
+            return
+        
+        leaves: Counter = Counter()
+        totals: Counter = Counter()
+        for stack, count in samples.items():
+            frames = stack.split(";")
+            leaves[frames[-1]] += count
+            for frame in set(frames):
+                totals[frame] += count
+        total = sum(samples.values())
+        
+        self._profiles.append({
+            "id": next(self._ids),
+            "route": route,
+            "path": request.url.path,
+            "status": status,
+            "duration_ms": round(duration_ms, 1),
+            "budget_ms": self.budget_ms,
+            "samples": total,
+            "interval_ms": self.interval_ms,
+            "timestamp": datetime.now().isoformat(),
+            "top_frames": [
+                {
+                    "frame": frame,
+                    "self_samples": count,
+                    "self_pct": round(count * 100 / total, 1),
+                    "total_samples": totals[frame],
+                }
+                for frame, count in leaves.most_common(TOP_FRAMES)
+            ],
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n",
+        })
+    
+    def profiles(self) -> List[Dict[str, Any]]:
+        """Saklanan profillerin özetleri (yeniden eskiye, collapsed yığınlar hariç)"""
+        return [
+            {key: value for key, value in profile.items() if key != "collapsed"}
+            for profile in reversed(self._profiles)
+        ]
+    
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        """Profili ID ile döndürür veya None if not found"""
+        for profile in self._profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+    
+    def clear(self):
+        """Saklanan profilleri siler"""
+        self._profiles.clear()
+    
+    # --- Örnekleme thread'i ---
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+            self._thread.start()
+    
+    def _sample_loop(self):
+        interval = self.interval_ms / 1000
+        while True:
+            if not self._active:
+                # Profillenen istek yokken thread uyur
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            time.sleep(interval)
+            try:
+                self._sample()
+            except Exception:
+                # Örnek alınırken task ilerlemiş olabilir; bu örnek atlanır
+                pass
+    
+    def _sample(self):
+        with self._lock:
+            active = list(self._active.values())
+        if not active:
+            return
+        running = asyncio.current_task(self._loop)
+        frame = sys._current_frames().get(self._loop_thread_id)
+        for profile in active:
+            anchor = profile.anchor
+            if anchor is None:
+                continue
+            if profile.task is running:
+                stack = self._running_stack(frame, anchor)
+            else:
+                stack = self._await_stack(profile.task, anchor)
+            if stack:
+                with self._lock:
+                    profile.samples[";".join(stack)] += 1
+        del frame
+    
+    @staticmethod
+    def _running_stack(frame, anchor) -> List[str]:
+        stack = []
+        while frame is not None and frame is not anchor:
+            stack.append(_frame_label(frame.f_code, frame.f_lineno))
+            frame = frame.f_back
+        if frame is None:
+            return []
+        stack.reverse()
+        return stack
+    
+    @staticmethod
+    def _await_stack(task: asyncio.Task, anchor) -> List[str]:
+        # Askıdaki coroutine zinciri: cr_await ile en içteki beklemeye kadar
+        stack = []
+        inside = False
+        awaitable = task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) \
+                or getattr(awaitable, "ag_frame", None)
+            if frame is None:
+                if inside:
+                    stack.append(f"[await {type(awaitable).__name__}]")
+                break
+            if inside:
+                stack.append(_frame_label(frame.f_code, frame.f_lineno))
+            elif frame is anchor:
+                inside = True
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) \
+                or getattr(awaitable, "ag_await", None)
+        return stack
+
+
+request_profiler = RequestProfiler(
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    budget_ms=settings.PROFILER_LATENCY_BUDGET_MS,
+    interval_ms=settings.PROFILER_INTERVAL_MS,
+    max_profiles=settings.PROFILER_MAX_PROFILES
+)
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Handler'ı örneklemeli profiller ile saran route sınıfı
+    
+    Router'a `route_class=ProfiledRoute` verilerek açılır. Örneklenmeyen
+    isteklerde maliyet tek bir rastgele sayıdır.
+    """
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = f"{','.join(sorted(self.methods))} {self.path}"
+        
+        async def profiled_handler(request: Request) -> Response:
+            if not request_profiler.should_sample():
+                return await handler(request)
+            active = request_profiler.begin(sys._getframe())
+            if active is None:
+                return await handler(request)
+            
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except Exception as e:
+                status = getattr(e, "status_code", 500)
+                raise
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                request_profiler.end(active, request, route, status, duration_ms)
+        
+        return profiled_handler
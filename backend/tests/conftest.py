@@ -0,0 +1,45 @@
+"""
+Test ayarları
+Uygulama modülleri import edilmeden önce ortamı test için hazırlar
+"""
+
+import copy
+import os
+
+import pytest
+
+# Bellek içi store, gerçek Gemini ve process havuzu olmadan
+os.environ["DATABASE_URL"] = "memory://"
+os.environ["GOOGLE_API_KEY"] = ""
+os.environ["GEMINI_MODEL_NAME"] = ""
+os.environ["GEMINI_WARMUP_ON_STARTUP"] = "false"
+os.environ["EXPORT_PROCESS_WORKERS"] = "0"
+
+# Ayarlar ortamdan okunduğu için uygulama modülleri bundan sonra import edilir
+from data.mock_projects import create_empty_project, get_mock_user_id
+from data.project_store import InMemoryProjectStore
+from data.sqlite_project_store import SQLiteProjectStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Aynı davranış testleri iki repository üzerinde de çalışır"""
+    if request.param == "memory":
+        yield InMemoryProjectStore({})
+    else:
+        sqlite_store = SQLiteProjectStore(str(tmp_path / "projects.db"))
+        yield sqlite_store
+        sqlite_store.close()
+
+
+@pytest.fixture
+def project(store):
+    """Store'a eklenmiş boş proje (store kendi kopyasını tutar)"""
+    new_project = create_empty_project("tubitak-2209a", "TÜBİTAK 2209-A", "Test Projesi")
+    store.add(copy.deepcopy(new_project))
+    return new_project
+
+
+@pytest.fixture
+def user_id():
+    return get_mock_user_id()
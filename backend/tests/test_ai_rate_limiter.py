@@ -0,0 +1,60 @@
+"""
+AI kota testleri
+Kullanıcı kullanım geçmişinin boşta kalan kullanıcılar için silinmesi
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import ai_rate_limiter as limiter_module
+from services.ai_rate_limiter import USAGE_WINDOW_SECONDS, AIRateLimiter, MemoryBucketStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Limiter'ın gördüğü monotonic saat (testte elle ilerletilir)"""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(limiter_module, "time", SimpleNamespace(monotonic=lambda: fake.now, time=time.time))
+    return fake
+
+
+@pytest.fixture
+def limiter(clock):
+    return AIRateLimiter(requests_per_minute=60, tokens_per_minute=100000, store=MemoryBucketStore())
+
+
+def acquire(limiter, user_id, tokens=10):
+    asyncio.run(limiter.acquire(tokens, user_id=user_id))
+
+
+def test_idle_users_are_evicted_after_window(limiter, clock):
+    acquire(limiter, "user-a")
+    acquire(limiter, "user-b")
+    assert set(limiter._usage) == {"user-a", "user-b"}
+    
+    clock.now += USAGE_WINDOW_SECONDS / 2
+    acquire(limiter, "user-b")
+    clock.now += USAGE_WINDOW_SECONDS / 2 + 1
+    acquire(limiter, "user-c")
+    
+    # user-a bir dakikadır istek atmadı; user-b'nin son isteği hâlâ pencerede
+    assert set(limiter._usage) == {"user-b", "user-c"}
+
+
+def test_evicted_user_reports_empty_usage(limiter, clock):
+    acquire(limiter, "user-a", tokens=40)
+    asyncio.run(limiter.record_output(20, user_id="user-a"))
+    status = asyncio.run(limiter.status(user_id="user-a"))
+    assert status["user"]["requests_last_minute"] == 1
+    assert status["user"]["tokens_last_minute"] == 60
+    
+    clock.now += USAGE_WINDOW_SECONDS + 1
+    acquire(limiter, "user-b")
+    
+    assert "user-a" not in limiter._usage
+    status = asyncio.run(limiter.status(user_id="user-a"))
+    assert status["user"]["requests_last_minute"] == 0
+    assert status["user"]["tokens_last_minute"] == 0
@@ -0,0 +1,175 @@
+"""
+Otomatik kayıt birleştirici testleri
+Taslakların tek yazmada birleşmesi, flush ve yazılamayan taslağın bildirilmesi
+"""
+
+import asyncio
+
+import pytest
+
+from data.mock_projects import create_project, delete_project, get_section_by_id, update_section_draft
+from data.project_repository import VersionConflict
+from services import autosave
+from services.autosave import DraftCoalescer, DraftNotSaved
+
+USER_ID = "user-autosave"
+
+
+@pytest.fixture
+def section():
+    project = create_project("tubitak-2209a", "TÜBİTAK 2209-A", "Autosave Projesi", USER_ID)
+    yield project["sections"][0]
+    delete_project(project["id"], USER_ID)
+
+
+@pytest.fixture
+def coalescer():
+    return DraftCoalescer(debounce=0.05, max_delay=0.2)
+
+
+def stored(section_id):
+    return get_section_by_id(section_id, USER_ID)[1]
+
+
+@pytest.fixture
+def failing_store(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk dolu")
+    monkeypatch.setattr(autosave, "update_section_draft", fail)
+    return monkeypatch
+
+
+def test_submits_are_coalesced_into_one_write(coalescer, section):
+    async def scenario():
+        results = [
+            await coalescer.submit(section["id"], USER_ID, content=text)
+            for text in ("a", "ab", "abc")
+        ]
+        assert stored(section["id"])["draft_content"] == ""
+        await coalescer.flush_project(section["project_id"])
+        return results
+    
+    results = asyncio.run(scenario())
+    
+    assert [r["version"] for r in results] == [2, 2, 2]
+    assert results[-1]["draft_content"] == "abc"
+    assert stored(section["id"])["draft_content"] == "abc"
+    assert stored(section["id"])["version"] == 2
+    assert coalescer.stats()["written"] == 1
+    assert coalescer.stats()["submitted"] == 3
+
+
+def test_pending_draft_is_written_after_debounce(coalescer, section):
+    async def scenario():
+        await coalescer.submit(section["id"], USER_ID, content="bekleyen")
+        await asyncio.sleep(0.15)
+    
+    asyncio.run(scenario())
+    
+    assert stored(section["id"])["draft_content"] == "bekleyen"
+    assert coalescer.stats()["pending"] == 0
+
+
+def test_edits_apply_to_pending_draft(coalescer, section):
+    async def scenario():
+        await coalescer.submit(section["id"], USER_ID, content="merhaba dünya")
+        result = await coalescer.submit(
+            section["id"], USER_ID, edits=[{"start": 8, "end": 13, "text": "proje"}]
+        )
+        with pytest.raises(ValueError):
+            await coalescer.submit(section["id"], USER_ID, edits=[{"start": 0, "end": 99, "text": ""}])
+        await coalescer.flush_section(section["id"])
+        return result
+    
+    assert asyncio.run(scenario())["draft_content"] == "merhaba proje"
+    assert stored(section["id"])["draft_content"] == "merhaba proje"
+
+
+def test_if_match_is_checked_against_pending_version(coalescer, section):
+    async def scenario():
+        first = await coalescer.submit(section["id"], USER_ID, content="bir", expected_version=1)
+        with pytest.raises(VersionConflict) as conflict:
+            await coalescer.submit(section["id"], USER_ID, content="iki", expected_version=1)
+        assert conflict.value.current_version == 2
+        await coalescer.flush_section(section["id"])
+        second = await coalescer.submit(section["id"], USER_ID, content="üç", expected_version=2)
+        await coalescer.flush_section(section["id"])
+        return first, second
+    
+    first, second = asyncio.run(scenario())
+    
+    assert (first["version"], second["version"]) == (2, 3)
+    assert stored(section["id"])["draft_content"] == "üç"
+
+
+def test_other_users_write_is_ignored(coalescer, section):
+    async def scenario():
+        return await coalescer.submit(section["id"], "baska-kullanici", content="x")
+    
+    assert asyncio.run(scenario()) is None
+
+
+def test_failed_write_is_raised_on_next_submit(coalescer, section, failing_store):
+    async def scenario():
+        await coalescer.submit(section["id"], USER_ID, content="kaybolacak")
+        await coalescer.flush_section(section["id"])
+        failing_store.undo()
+        with pytest.raises(DraftNotSaved, match="disk dolu"):
+            await coalescer.submit(section["id"], USER_ID, content="tekrar")
+        # Hata bir kez bildirilir; istemci taslağı yeniden gönderir
+        await coalescer.submit(section["id"], USER_ID, content="tekrar")
+        await coalescer.flush_section(section["id"])
+    
+    asyncio.run(scenario())
+    
+    assert coalescer.stats()["failed"] == 1
+    assert stored(section["id"])["draft_content"] == "tekrar"
+
+
+def test_conflicting_write_is_raised_as_version_conflict(coalescer, section):
+    async def scenario():
+        await coalescer.submit(section["id"], USER_ID, content="birleştirilen")
+        # Başka bir worker araya yazar
+        update_section_draft(section["id"], "diğer worker", USER_ID)
+        await coalescer.flush_section(section["id"])
+        with pytest.raises(VersionConflict) as conflict:
+            await coalescer.submit(section["id"], USER_ID, content="sonraki")
+        return conflict.value
+    
+    conflict = asyncio.run(scenario())
+    
+    assert conflict.current_version == 2
+    assert coalescer.stats()["conflicts"] == 1
+    assert stored(section["id"])["draft_content"] == "diğer worker"
+
+
+def test_failed_write_is_reported_once_on_read(coalescer, section, failing_store):
+    async def scenario():
+        await coalescer.submit(section["id"], USER_ID, content="kaybolacak")
+        await coalescer.flush_project(section["project_id"])
+    
+    asyncio.run(scenario())
+    failing_store.undo()
+    
+    assert coalescer.take_failures(section["project_id"], "baska-kullanici") == []
+    assert coalescer.take_failures(section["project_id"], USER_ID) == [section["id"]]
+    assert coalescer.take_failures(section["project_id"], USER_ID) == []
+    
+    # Okumada bildirilen hata sonraki yazmada tekrar fırlatılmaz
+    async def rewrite():
+        await coalescer.submit(section["id"], USER_ID, content="yeni")
+        await coalescer.flush_section(section["id"])
+    
+    asyncio.run(rewrite())
+    assert stored(section["id"])["draft_content"] == "yeni"
+
+
+def test_zero_debounce_writes_through(section):
+    coalescer = DraftCoalescer(debounce=0, max_delay=0)
+    
+    result = asyncio.run(coalescer.submit(section["id"], USER_ID, content="doğrudan", expected_version=1))
+    
+    assert result["version"] == 2
+    assert stored(section["id"])["draft_content"] == "doğrudan"
+    with pytest.raises(VersionConflict):
+        asyncio.run(coalescer.submit(section["id"], USER_ID, content="eski", expected_version=1))
@@ -0,0 +1,112 @@
+"""
+ETag / koşullu istek testleri
+GET'te If-None-Match ile 304, PATCH'te If-Match ile 412 davranışı
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.etag import etag_matches, parse_if_match
+
+PROJECTS = "/api/v1/projects"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def created(client):
+    response = client.post(f"{PROJECTS}/", json={"template_id": "tubitak-2209a", "title": "ETag Projesi"})
+    assert response.status_code == 201
+    project = response.json()
+    yield project
+    client.delete(f"{PROJECTS}/{project['id']}")
+
+
+def test_get_returns_304_for_current_etag(client, created):
+    first = client.get(f"{PROJECTS}/{created['id']}")
+    etag = first.headers["ETag"]
+    
+    cached = client.get(f"{PROJECTS}/{created['id']}", headers={"If-None-Match": etag})
+    
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    assert client.get(f"{PROJECTS}/{created['id']}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+
+def test_field_selection_has_its_own_etag(client, created):
+    full_etag = client.get(f"{PROJECTS}/{created['id']}").headers["ETag"]
+    
+    partial = client.get(f"{PROJECTS}/{created['id']}", params={"fields": "title"}, headers={"If-None-Match": full_etag})
+    
+    assert partial.status_code == 200
+    assert partial.headers["ETag"] != full_etag
+
+
+def test_patch_etag_matches_next_get(client, created):
+    etag = client.get(f"{PROJECTS}/{created['id']}").headers["ETag"]
+    
+    patched = client.patch(f"{PROJECTS}/{created['id']}", json={"title": "Yeni"}, headers={"If-Match": etag})
+    
+    assert patched.status_code == 200
+    assert patched.headers["ETag"] != etag
+    cached = client.get(f"{PROJECTS}/{created['id']}", headers={"If-None-Match": patched.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_stale_if_match_returns_412_with_current_etag(client, created):
+    stale = client.get(f"{PROJECTS}/{created['id']}").headers["ETag"]
+    current = client.patch(f"{PROJECTS}/{created['id']}", json={"title": "Birinci"}, headers={"If-Match": stale})
+    
+    rejected = client.patch(f"{PROJECTS}/{created['id']}", json={"title": "İkinci"}, headers={"If-Match": stale})
+    
+    assert rejected.status_code == 412
+    assert rejected.json()["detail"]["error"] == "version_conflict"
+    assert rejected.headers["ETag"] == current.headers["ETag"]
+    assert client.get(f"{PROJECTS}/{created['id']}").json()["title"] == "Birinci"
+
+
+@pytest.mark.parametrize("if_match", ['W/"1.0"', '"1.0", "2.0"', '"abc"'])
+def test_invalid_if_match_returns_412(client, created, if_match):
+    response = client.patch(f"{PROJECTS}/{created['id']}", json={"title": "X"}, headers={"If-Match": if_match})
+    
+    assert response.status_code == 412
+    assert response.json()["detail"]["error"] == "precondition_failed"
+
+
+def test_stale_section_if_match_returns_412(client, created):
+    section_id = created["sections"][0]["id"]
+    url = f"/api/v1/sections/{section_id}"
+    saved = client.patch(url, json={"draft_content": "birinci"}, headers={"If-Match": '"1"'})
+    assert saved.status_code == 200
+    assert saved.headers["ETag"] == '"2"'
+    
+    rejected = client.patch(url, json={"draft_content": "ikinci"}, headers={"If-Match": '"1"'})
+    
+    assert rejected.status_code == 412
+    assert rejected.headers["ETag"] == '"2"'
+
+
+def test_parse_if_match():
+    assert parse_if_match(None) is None
+    assert parse_if_match("*") is None
+    assert parse_if_match('"3"') == 3
+    assert parse_if_match('"3.12"') == 3
+    assert parse_if_match('"3.12-1a2b3c4d"') == 3
+    with pytest.raises(HTTPException) as error:
+        parse_if_match('W/"3"')
+    assert error.value.status_code == 412
+
+
+def test_etag_matches():
+    assert etag_matches('"1.5"', '"1.5"')
+    assert etag_matches('"0.1", W/"1.5"', '"1.5"')
+    assert etag_matches("*", '"1.5"')
+    assert not etag_matches(None, '"1.5"')
+    assert not etag_matches('"1.6"', '"1.5"')
@@ -0,0 +1,94 @@
+"""
+AI yanıt cache'i testleri
+Cache anahtarı birincil modelindir; yedek modelin yanıtı cache'e yazılmaz
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from config.settings import settings
+from services import gemini
+from services.ai_cache import ai_cache
+from services.model_registry import model_registry
+
+
+class FakeModel:
+    """generate_content'i sayan sahte Gemini modeli"""
+    
+    def __init__(self, model_name, text="yanıt", failing=False):
+        self.model_name = model_name
+        self.text = text
+        self.failing = failing
+        self.calls = 0
+    
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if self.failing:
+            raise google_exceptions.ServiceUnavailable("model çökük")
+        if stream:
+            return iter([SimpleNamespace(text=self.text)])
+        return SimpleNamespace(text=self.text)
+
+
+@pytest.fixture
+def models(monkeypatch, request):
+    """Birincil ve yedek model; her test kendi model adlarıyla (circuit'ler ayrı) çalışır"""
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(gemini, "ai_executor", executor)
+    monkeypatch.setattr(settings, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_RETRY_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(settings, "AI_FALLBACK_MODELS_MAX", 1)
+    
+    primary = FakeModel(f"models/{request.node.name}-primary", text="birincil yanıt")
+    fallback = FakeModel(f"models/{request.node.name}-fallback", text="yedek yanıt")
+    model_registry.set_model(primary, fallback_models=[fallback])
+    ai_cache.clear()
+    yield primary, fallback
+    ai_cache.clear()
+    model_registry.reset()
+    executor.shutdown(wait=False)
+
+
+async def collect_stream(prompt):
+    return "".join([chunk async for chunk in gemini.stream_processed_text(prompt)])
+
+
+def test_primary_answer_is_cached(models):
+    primary, _ = models
+    
+    first = asyncio.run(gemini.complete_prompt("aynı prompt"))
+    second = asyncio.run(gemini.complete_prompt("aynı prompt"))
+    
+    assert first == second == "birincil yanıt"
+    assert primary.calls == 1
+
+
+def test_fallback_answer_is_not_cached_under_primary_key(models):
+    primary, fallback = models
+    primary.failing = True
+    
+    assert asyncio.run(gemini.complete_prompt("aynı prompt")) == "yedek yanıt"
+    assert ai_cache.stats()["entries"] == 0
+    
+    # Birincil model toparlanınca kendi yanıtı döner ve cache'lenir
+    primary.failing = False
+    assert asyncio.run(gemini.complete_prompt("aynı prompt")) == "birincil yanıt"
+    assert asyncio.run(gemini.complete_prompt("aynı prompt")) == "birincil yanıt"
+    assert (primary.calls, fallback.calls) == (2, 1)
+
+
+def test_fallback_stream_is_not_cached_under_primary_key(models):
+    primary, fallback = models
+    primary.failing = True
+    
+    assert asyncio.run(collect_stream("stream prompt")) == "yedek yanıt"
+    assert ai_cache.stats()["entries"] == 0
+    
+    primary.failing = False
+    assert asyncio.run(collect_stream("stream prompt")) == "birincil yanıt"
+    assert asyncio.run(collect_stream("stream prompt")) == "birincil yanıt"
+    assert (primary.calls, fallback.calls) == (2, 1)
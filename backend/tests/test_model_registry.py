@@ -0,0 +1,144 @@
+"""
+Model registry testleri
+Gerçek SDK yerine sahte bir `genai` modülüyle model çözümlemeyi dener
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from config.settings import settings
+from services import model_registry as registry_module
+from services.model_registry import ModelRegistry
+
+
+class FakeGenAI:
+    """google.generativeai yerine geçen sahte modül"""
+    
+    def __init__(self, model_names=(), list_error=None, configure_error=None):
+        self.model_names = list(model_names)
+        self.list_error = list_error
+        self.configure_error = configure_error
+        self.list_calls = 0
+        self.configure_calls = 0
+    
+    def configure(self, api_key):
+        self.configure_calls += 1
+        if self.configure_error is not None:
+            raise self.configure_error
+    
+    def list_models(self):
+        self.list_calls += 1
+        if self.list_error is not None:
+            raise self.list_error
+        return [
+            SimpleNamespace(
+                name=name,
+                display_name=name,
+                description="",
+                supported_generation_methods=["generateContent"],
+            )
+            for name in self.model_names
+        ]
+    
+    def GenerativeModel(self, name):
+        return SimpleNamespace(model_name=name)
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    def install(**kwargs):
+        fake = FakeGenAI(**kwargs)
+        monkeypatch.setattr(registry_module, "genai", fake)
+        return fake
+    
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "test-key")
+    return install
+
+
+def resolve_in_thread(registry, timeout=2.0):
+    """get_model'i ayrı thread'de çağırır; kilitlenirse test takılmadan başarısız olur"""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("model", registry.get_model()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "get_model kilitlendi"
+    return result["model"]
+
+
+def test_resolves_preferred_model_from_list(fake_genai):
+    fake = fake_genai(model_names=["models/other", "models/preferred-b", "models/preferred-a"])
+    registry = ModelRegistry(["models/preferred-a", "models/preferred-b"], None, list_ttl_seconds=60)
+    
+    model = resolve_in_thread(registry)
+    
+    assert model.model_name == "models/preferred-a"
+    assert registry.is_resolved
+    assert fake.list_calls == 1
+    # Sonraki çağrılar ve liste cache'ten gelir
+    assert registry.get_model() is model
+    assert registry.list_models() == registry.list_models()
+    assert fake.list_calls == 1
+
+
+def test_seed_model_skips_model_list(fake_genai):
+    fake = fake_genai(model_names=["models/preferred"])
+    registry = ModelRegistry(["models/preferred"], "models/seed", list_ttl_seconds=60)
+    
+    assert resolve_in_thread(registry).model_name == "models/seed"
+    assert fake.list_calls == 0
+
+
+def test_list_failure_falls_back_to_default_model(fake_genai):
+    fake_genai(list_error=ConnectionError("ağ yok"))
+    registry = ModelRegistry(["models/preferred"], None, list_ttl_seconds=60)
+    
+    assert resolve_in_thread(registry).model_name == registry_module.FALLBACK_MODEL
+
+
+def test_transient_failure_is_retried_after_backoff(fake_genai, monkeypatch):
+    fake = fake_genai(model_names=["models/preferred"], configure_error=RuntimeError("geçici"))
+    monkeypatch.setattr(registry_module, "RESOLVE_RETRY_SECONDS", 0.0)
+    registry = ModelRegistry(["models/preferred"], None, list_ttl_seconds=60)
+    
+    assert resolve_in_thread(registry) is None
+    assert not registry.is_resolved
+    
+    fake.configure_error = None
+    assert resolve_in_thread(registry).model_name == "models/preferred"
+    assert registry.is_resolved
+
+
+def test_backoff_skips_resolution(fake_genai, monkeypatch):
+    fake = fake_genai(configure_error=RuntimeError("geçici"))
+    monkeypatch.setattr(registry_module, "RESOLVE_RETRY_SECONDS", 60.0)
+    registry = ModelRegistry(["models/preferred"], None, list_ttl_seconds=60)
+    
+    assert resolve_in_thread(registry) is None
+    assert resolve_in_thread(registry) is None
+    assert fake.configure_calls == 1
+
+
+def test_missing_api_key_is_final(fake_genai, monkeypatch):
+    fake = fake_genai(model_names=["models/preferred"])
+    monkeypatch.setattr(settings, "GOOGLE_API_KEY", "")
+    registry = ModelRegistry(["models/preferred"], None, list_ttl_seconds=60)
+    
+    assert resolve_in_thread(registry) is None
+    assert registry.is_resolved
+    assert fake.configure_calls == 0
+
+
+def test_set_model_and_reset():
+    registry = ModelRegistry([], None, list_ttl_seconds=60)
+    primary = SimpleNamespace(model_name="models/injected")
+    fallback = SimpleNamespace(model_name="models/backup")
+    
+    registry.set_model(primary, fallback_models=[fallback])
+    assert registry.get_model() is primary
+    assert registry.get_fallback_models(2) == [fallback]
+    
+    registry.reset()
+    assert not registry.is_resolved
+    assert registry.model_name == ""
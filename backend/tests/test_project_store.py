@@ -0,0 +1,92 @@
+"""
+Project store testleri
+Bellek ve SQLite repository'lerinin okuma, güncelleme ve sürüm çakışması davranışı
+"""
+
+import pytest
+
+from data.project_repository import VersionConflict
+
+
+def test_get_returns_added_project(store, project):
+    stored = store.get(project["id"])
+    
+    assert stored["title"] == "Test Projesi"
+    assert stored["user_id"] == project["user_id"]
+    assert [s["id"] for s in stored["sections"]] == [s["id"] for s in project["sections"]]
+    assert stored["wide_impact"] == project["wide_impact"]
+    assert stored["project_management"] == project["project_management"]
+    assert store.get("project-yok") is None
+
+
+def test_update_project_increments_version(store, project, user_id):
+    sections_version = sum(s["version"] for s in project["sections"])
+    
+    result = store.update_project(project["id"], user_id, {"title": "Yeni Başlık"}, expected_version=1)
+    
+    assert result == {"version": 2, "sections_version": sections_version}
+    stored = store.get(project["id"])
+    assert stored["title"] == "Yeni Başlık"
+    assert stored["version"] == 2
+
+
+def test_update_project_rejects_stale_version(store, project, user_id):
+    store.update_project(project["id"], user_id, {"title": "Birinci"}, expected_version=1)
+    
+    with pytest.raises(VersionConflict) as conflict:
+        store.update_project(project["id"], user_id, {"title": "İkinci"}, expected_version=1)
+    
+    assert conflict.value.current_version == 2
+    assert conflict.value.sections_version == sum(s["version"] for s in project["sections"])
+    assert store.get(project["id"])["title"] == "Birinci"
+
+
+def test_update_project_ignores_other_users(store, project):
+    assert store.update_project(project["id"], "baska-kullanici", {"title": "X"}) is None
+    assert store.get(project["id"])["title"] == "Test Projesi"
+
+
+def test_update_section_increments_version(store, project, user_id):
+    section_id = project["sections"][0]["id"]
+    
+    section = store.update_section(section_id, user_id, {"draft_content": "taslak"}, expected_version=1)
+    
+    assert section["version"] == 2
+    assert section["draft_content"] == "taslak"
+    _, stored = store.find_section(section_id)
+    assert stored["draft_content"] == "taslak"
+    assert stored["version"] == 2
+
+
+def test_update_section_rejects_stale_version(store, project, user_id):
+    section_id = project["sections"][0]["id"]
+    store.update_section(section_id, user_id, {"draft_content": "birinci"}, expected_version=1)
+    
+    with pytest.raises(VersionConflict) as conflict:
+        store.update_section(section_id, user_id, {"draft_content": "ikinci"}, expected_version=1)
+    
+    assert conflict.value.current_version == 2
+    assert store.find_section(section_id)[1]["draft_content"] == "birinci"
+
+
+def test_section_update_changes_project_sections_version(store, project, user_id):
+    section_id = project["sections"][0]["id"]
+    before = sum(s["version"] for s in project["sections"])
+    store.update_section(section_id, user_id, {"draft_content": "taslak"})
+    
+    result = store.update_project(project["id"], user_id, {"keywords": "a, b"}, expected_version=1)
+    
+    assert result["sections_version"] == before + 1
+
+
+def test_find_section_and_delete(store, project, user_id):
+    section_id = project["sections"][0]["id"]
+    found_project, section = store.find_section(section_id)
+    assert found_project["id"] == project["id"]
+    assert section["title"] == project["sections"][0]["title"]
+    
+    assert not store.delete(project["id"], "baska-kullanici")
+    assert store.delete(project["id"], user_id)
+    assert store.get(project["id"]) is None
+    assert store.find_section(section_id) == (None, None)
+    assert store.count_user_projects(user_id) == 0
@@ -0,0 +1,122 @@
+"""
+Revision store testleri
+Delta kodlamasının ve snapshot + delta zincirinin içeriği aynen geri vermesi
+"""
+
+import random
+
+import pytest
+
+from data.revision_store import DELTA, SNAPSHOT, InMemoryRevisionStore, apply_delta, encode_delta
+from data.sqlite_revision_store import SQLiteRevisionStore
+
+BASE_TEXT = (
+    "Bu proje, yapay zekâ destekli başvuru yazımının öğrencilere etkisini inceler. "
+    "Çalışmada nitel ve nicel yöntemler birlikte kullanılacaktır.\n\n"
+    "Amaç, başvuru sürecini kısaltmak ve metin kalitesini artırmaktır. "
+) * 4
+
+
+@pytest.mark.parametrize("old, new", [
+    ("", ""),
+    ("", "yeni metin"),
+    ("eski metin", ""),
+    ("aynı", "aynı"),
+    ("kelime   boşluk\n\nsatır", "kelime boşluk\nsatır  "),
+    ("başta değişiklik", "Başta değişiklik"),
+    ("sonda değişiklik", "sonda değişiklik!"),
+    ("aaaa", "aa"),
+    (BASE_TEXT, BASE_TEXT.replace("nitel", "karma", 1)),
+    (BASE_TEXT, "tamamen farklı bir metin"),
+])
+def test_delta_round_trip(old, new):
+    assert apply_delta(old, encode_delta(old, new)) == new
+
+
+def test_delta_round_trip_random_edits():
+    rng = random.Random(2209)
+    words = ["proje", "yöntem", "ğüşıöç", " ", "\n", "amaç.", "", "analiz"]
+    text = BASE_TEXT
+    for _ in range(200):
+        start = rng.randrange(len(text) + 1)
+        end = min(len(text), start + rng.randrange(30))
+        new = text[:start] + "".join(rng.choice(words) for _ in range(rng.randrange(4))) + text[end:]
+        assert apply_delta(text, encode_delta(text, new)) == new
+        text = new
+
+
+def test_delta_is_smaller_than_content_for_small_edits():
+    new = BASE_TEXT.replace("kısaltmak", "hızlandırmak", 1)
+    ops = encode_delta(BASE_TEXT, new)
+    
+    assert sum(len(op) for op in ops if isinstance(op, str)) < 20
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def revisions(request, tmp_path):
+    if request.param == "memory":
+        revision_store = InMemoryRevisionStore(snapshot_interval=4)
+    else:
+        revision_store = SQLiteRevisionStore(str(tmp_path / "revisions.db"), snapshot_interval=4)
+    yield revision_store
+    revision_store.close()
+
+
+def edited_versions(count):
+    versions = []
+    text = BASE_TEXT
+    for index in range(count):
+        if index == 6:
+            # Metnin çoğu değişir (ör. yeni AI önerisi) ve tam kopya yazılır
+            text = f"Yeni öneri {index}. " + BASE_TEXT[::-1]
+        else:
+            text = text.replace("ve", f"ve ({index})", 1)
+        versions.append(text)
+    return versions
+
+
+def test_store_round_trips_every_revision(revisions):
+    versions = edited_versions(11)
+    for content in versions:
+        revisions.append("section-1", "project-1", content)
+    
+    assert revisions.count("section-1") == len(versions)
+    for number, content in enumerate(versions, start=1):
+        revision = revisions.get("section-1", number)
+        assert revision["revision_number"] == number
+        assert revision["content"] == content
+    assert revisions.get("section-1", 0) is None
+    assert revisions.get("section-1", len(versions) + 1) is None
+    
+    kinds = [record["kind"] for record in revisions._records("section-1", 1, len(versions))]
+    assert kinds[0] == SNAPSHOT
+    assert DELTA in kinds
+    # Zincir snapshot_interval'den uzun olmaz
+    assert all(SNAPSHOT in kinds[i:i + 4] for i in range(len(kinds) - 3))
+
+
+def test_store_lists_pages_with_content(revisions):
+    versions = edited_versions(9)
+    for content in versions:
+        revisions.append("section-1", "project-1", content)
+    
+    page = revisions.list("section-1", offset=2, limit=4)
+    assert [r["revision_number"] for r in page] == [3, 4, 5, 6]
+    assert [r["content"] for r in page] == versions[2:6]
+    
+    newest = revisions.list("section-1", offset=0, limit=3, descending=True)
+    assert [r["content"] for r in newest] == versions[:-4:-1]
+    
+    metadata = revisions.list("section-1", limit=2, include_content=False)
+    assert [r["revision_number"] for r in metadata] == [1, 2]
+    assert "content" not in metadata[0]
+
+
+def test_store_delete_project_removes_revisions(revisions):
+    revisions.append("section-1", "project-1", "birinci")
+    revisions.append("section-2", "project-2", "ikinci")
+    
+    revisions.delete_project("project-1")
+    
+    assert revisions.count("section-1") == 0
+    assert revisions.get("section-2", 1)["content"] == "ikinci"
@@ -0,0 +1,112 @@
+"""
+Tablo patch testleri
+TablePatchOperation doğrulaması, apply_table_patch ve store.patch_tables
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from data.project_repository import VersionConflict
+from data.table_patch import TablePatchConflict, apply_table_patch, get_table
+from models.project import TablePatchOperation
+
+
+def to_operations(*raw_operations):
+    return [TablePatchOperation.model_validate(raw).to_operation() for raw in raw_operations]
+
+
+@pytest.fixture
+def tables():
+    return {
+        "risk_management": [
+            {"id": "rm-1", "risk": "A", "countermeasure": "a"},
+            {"id": "rm-2", "risk": "B", "countermeasure": "b"},
+        ]
+    }
+
+
+def test_add_generates_id_and_fills_defaults():
+    [operation] = to_operations({"op": "add", "path": "/risk_management/-", "value": {"risk": "C"}})
+    
+    assert operation["table"] == "risk_management"
+    assert operation["before"] == "-"
+    assert operation["value"]["id"].startswith("rm-")
+    assert operation["value"]["countermeasure"] == ""
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"op": "add", "path": "/risk_management/-", "value": "metin"}, "Satır değeri nesne olmalı"),
+    ({"op": "remove", "path": "/risk_management/-"}, "'-' ile kullanılamaz"),
+    ({"op": "remove", "path": "/risk_management/rm-1/risk"}, "satır adresi bekler"),
+    ({"op": "replace", "path": "/risk_management/rm-1/risk", "value": 5}, "metin olmalı"),
+    ({"op": "replace", "path": "/risk_management/rm-1/yok", "value": "x"}, "alanı yok"),
+    ({"op": "replace", "path": "/bilinmeyen/rm-1", "value": {}}, "Bilinmeyen tablo"),
+    ({"op": "move", "path": "/risk_management/-"}, "'from' bekler"),
+    ({"op": "move", "path": "/risk_management/-", "from": "/work_schedule/ws-1"}, "aynı tablodaki"),
+    ({"op": "add", "path": "/wide_impact/-", "value": {"outputs": "x"}}, "category"),
+])
+def test_invalid_operations_are_rejected(raw, message):
+    with pytest.raises(ValidationError, match=message):
+        TablePatchOperation.model_validate(raw)
+
+
+def test_apply_runs_operations_in_order_without_mutating_input(tables):
+    original = [dict(row) for row in tables["risk_management"]]
+    operations = to_operations(
+        {"op": "test", "path": "/risk_management/rm-1/risk", "value": "A"},
+        {"op": "replace", "path": "/risk_management/rm-1/risk", "value": "A2"},
+        {"op": "add", "path": "/risk_management/rm-1", "value": {"id": "rm-0", "risk": "Z"}},
+        {"op": "move", "path": "/risk_management/-", "from": "/risk_management/rm-1"},
+        {"op": "remove", "path": "/risk_management/rm-2"},
+    )
+    
+    result = apply_table_patch(tables, operations)
+    
+    assert [row["id"] for row in result["risk_management"]] == ["rm-0", "rm-1"]
+    assert result["risk_management"][1]["risk"] == "A2"
+    assert tables["risk_management"] == original
+
+
+@pytest.mark.parametrize("raw", [
+    {"op": "test", "path": "/risk_management/rm-1/risk", "value": "farklı"},
+    {"op": "remove", "path": "/risk_management/rm-9"},
+    {"op": "add", "path": "/risk_management/-", "value": {"id": "rm-2"}},
+    {"op": "move", "path": "/risk_management/rm-1", "from": "/risk_management/rm-1"},
+])
+def test_conflicting_operation_rejects_whole_patch(tables, raw):
+    original = [dict(row) for row in tables["risk_management"]]
+    operations = to_operations({"op": "replace", "path": "/risk_management/rm-2/risk", "value": "B2"}, raw)
+    
+    with pytest.raises(TablePatchConflict):
+        apply_table_patch(tables, operations)
+    assert tables["risk_management"] == original
+
+
+def test_store_patch_tables_persists_rows(store, project, user_id):
+    row_id = project["wide_impact"][0]["id"]
+    operations = to_operations(
+        {"op": "replace", "path": f"/wide_impact/{row_id}/outputs", "value": "Makale"},
+        {"op": "add", "path": "/risk_management/-", "value": {"id": "rm-yeni", "risk": "Gecikme"}},
+    )
+    
+    result = store.patch_tables(project["id"], user_id, operations, "2026-01-01T00:00:00", expected_version=1)
+    
+    assert result["version"] == 2
+    assert set(result["tables"]) == {"wide_impact", "risk_management"}
+    stored = store.get(project["id"])
+    assert stored["version"] == 2
+    assert get_table(stored, "wide_impact")[0]["outputs"] == "Makale"
+    assert get_table(stored, "risk_management")[-1] == {"id": "rm-yeni", "risk": "Gecikme", "countermeasure": ""}
+
+
+def test_store_patch_tables_rejects_stale_version_and_conflicts(store, project, user_id):
+    operations = to_operations({"op": "remove", "path": "/risk_management/rm-yok"})
+    
+    with pytest.raises(VersionConflict):
+        store.patch_tables(project["id"], user_id, operations, "2026-01-01T00:00:00", expected_version=5)
+    with pytest.raises(TablePatchConflict):
+        store.patch_tables(project["id"], user_id, operations, "2026-01-01T00:00:00", expected_version=1)
+    
+    stored = store.get(project["id"])
+    assert stored["version"] == 1
+    assert get_table(stored, "risk_management") == get_table(project, "risk_management")
@@ -0,0 +1,131 @@
+"""
+ETag / koşullu istek yardımcıları
+Proje ve bölüm sürümlerinden ETag üretir, If-Match / If-None-Match başlıklarını çözer
+"""
+
+import re
+import zlib
+from typing import List, Optional
+from fastapi import HTTPException
+from data.project_repository import VersionConflict
+
+# Bu API'nin ürettiği ETag'ler: "3" (bölüm), "3.12" (proje), "3.12-1a2b3c4d" (kısmi gösterim)
+_VERSION_TAG = re.compile(r'^"(\d+)(?:\.\d+)?(?:-[0-9a-f]{8})?"$')
+
+
+def project_version_etag(version: int, sections_version: int, variant: Optional[str] = None) -> str:
+    """
+    Projenin ETag'i: "<proje sürümü>.<bölüm sürümleri toplamı>"
+    
+    İki sayı da yalnızca artar; proje alanlarında veya herhangi bir
+    bölümde yapılan her değişiklik ETag'i değiştirir. GET ve PATCH
+    /projects/{id} aynı biçimi kullanır; PATCH yanıtındaki ETag sonraki
+    GET'te If-None-Match olarak gönderilebilir.
+    
+    Args:
+        version: Proje sürümü
+        sections_version: Bölüm sürümleri toplamı
+        variant: Aynı projenin farklı gösterimi (ör. seçili alanlar); verilirse
+            ETag'e özeti eklenir, gösterimler birbirinin 304'ünü almaz
+    """
+    suffix = f"-{zlib.crc32(variant.encode('utf-8')):08x}" if variant else ""
+    return f'"{version}.{sections_version}{suffix}"'
+
+
+def project_etag(project: dict, variant: Optional[str] = None) -> str:
+    """Proje verisinin ETag'i (bkz. project_version_etag)"""
+    sections_version = sum(section.get("version", 1) for section in project.get("sections", []))
+    return project_version_etag(project.get("version", 1), sections_version, variant)
+
+
+def version_etag(version: int) -> str:
+    """Tek sürüm numarasının ETag'i (bölüm yazımı)"""
+    return f'"{version}"'
+
+
+def _entity_tags(header: str) -> List[str]:
+    # Zayıf karşılaştırma: W/ öneki ve tırnaklar atılır
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag:
+            tags.append(tag)
+    return tags
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match başlığı ETag'i içeriyor mu (içeriyorsa 304 dönülür)
+    
+    Args:
+        if_none_match: Başlık değeri (virgülle ayrılmış liste veya "*")
+        etag: Kaynağın güncel ETag'i
+    """
+    if not if_none_match:
+        return False
+    tags = _entity_tags(if_none_match)
+    return "*" in tags or etag.strip('"') in tags
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """
+    If-Match başlığından beklenen sürümü çıkarır
+    
+    Proje ETag'inde ("3.12") yalnızca ilk sayı (proje sürümü) kullanılır;
+    başka sekmede bir bölümün düzenlenmesi proje alanlarının yazımını
+    engellemez. If-Match güçlü karşılaştırma ister (RFC 9110); zayıf
+    (W/) ETag'ler kabul edilmez.
+    
+    Args:
+        if_match: Başlık değeri
+    
+    Returns:
+        int: Beklenen sürüm veya None (başlık yoksa veya "*" ise koşulsuz yazılır)
+    
+    Raises:
+        HTTPException 412: Başlık tek bir ETag içermiyorsa, ETag zayıfsa veya
+            bu API'nin ürettiği bir sürüm ETag'i değilse
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    
+    tags = [tag.strip() for tag in if_match.split(",") if tag.strip()]
+    if len(tags) != 1:
+        raise _precondition_failed("If-Match başlığı tek bir ETag içermelidir.")
+    if tags[0].startswith("W/"):
+        raise _precondition_failed("If-Match zayıf (W/) ETag kabul etmez; GET yanıtındaki ETag'i gönderin.")
+    
+    match = _VERSION_TAG.match(tags[0])
+    if match is None:
+        raise _precondition_failed("If-Match değeri bu kaydın ETag'i değil; güncel ETag'i GET ile alın.")
+    return int(match.group(1))
+
+
+def _precondition_failed(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=412,
+        detail={
+            "error": "precondition_failed",
+            "message": message
+        }
+    )
+
+
+def version_conflict_error(error: VersionConflict) -> HTTPException:
+    """Sürüm uyuşmazlığının 412 yanıtı (istemci güncel sürümü alıp yeniden dener)"""
+    if error.sections_version is not None:
+        etag = project_version_etag(error.current_version, error.sections_version)
+    else:
+        etag = version_etag(error.current_version)
+    return HTTPException(
+        status_code=412,
+        headers={"ETag": etag},
+        detail={
+            "error": "version_conflict",
+            "message": "Kayıt başka bir istekte değiştirildi; güncel sürümü alıp tekrar deneyin.",
+            "current_version": error.current_version
+        }
+    )
@@ -0,0 +1,35 @@
+"""
+Hızlı JSON yanıtları
+Store'dan gelen (zaten doğrulanmış) kayıtları response_model doğrulaması
+olmadan, orjson varsa onunla serileştirir
+"""
+
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel; yoksa standart json kullanılır
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """İçeriği UTF-8 JSON'a çevirir (orjson yoksa json.dumps)"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Doğrulamasız JSON yanıtı
+    
+    Endpoint Response döndürdüğünde FastAPI response_model doğrulamasını
+    ve jsonable_encoder geçişini atlar. Yalnızca kendi store'umuzdan gelen,
+    modelle aynı yapıdaki veriler için kullanılmalı; response_model
+    OpenAPI dokümantasyonu için yine tanımlı kalır.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,79 @@
+"""
+Server-Sent Events yardımcıları
+AI streaming endpoint'leri için ortak response formatı
+"""
+
+import json
+from typing import AsyncIterator, Optional
+from fastapi.responses import StreamingResponse
+
+
+def format_sse_event(data: dict, event: Optional[str] = None) -> str:
+    """
+    Tek bir SSE mesajı oluşturur
+    
+    Args:
+        data: JSON olarak gönderilecek veri
+        event: Opsiyonel event adı (chunk, done, error)
+        
+    Returns:
+        str: SSE formatında mesaj
+    """
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    message += f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    return message
+
+
+async def stream_text_events(chunks: AsyncIterator[str], error_code: str) -> AsyncIterator[str]:
+    """
+    Metin parçalarını SSE event'lerine dönüştürür
+    
+    Her parça `chunk` event'i olarak gönderilir. Stream bitince `done`,
+    hata olursa `error` event'i gönderilir (HTTP status stream başladığı
+    için değiştirilemez).
+    
+    Args:
+        chunks: Temizlenmiş metin parçaları
+        error_code: Hata durumunda gönderilecek hata kodu
+        
+    Yields:
+        str: SSE mesajları
+    """
+    parts = []
+    try:
+        async for delta in chunks:
+            parts.append(delta)
+            yield format_sse_event({"delta": delta}, event="chunk")
+    except Exception as e:
+        yield format_sse_event({
+            "error": error_code,
+            "message": str(e),
+            "status": getattr(e, "status_code", 500)  # 503/504: tekrar denenebilir
+        }, event="error")
+        return
+    
+    word_count = len("".join(parts).split())
+    yield format_sse_event({"word_count": word_count}, event="done")
+
+
+def sse_response(chunks: AsyncIterator[str], error_code: str) -> StreamingResponse:
+    """
+    Metin parçalarından SSE StreamingResponse oluşturur
+    
+    Args:
+        chunks: Temizlenmiş metin parçaları
+        error_code: Hata durumunda gönderilecek hata kodu
+        
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+    return StreamingResponse(
+        stream_text_events(chunks, error_code),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Nginx proxy buffering'i kapat
+        }
+    )